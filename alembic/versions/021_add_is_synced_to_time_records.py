@@ -0,0 +1,21 @@
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = '021'
+down_revision = '020'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('time_records', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('is_synced', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    time_records = sa.table('time_records', sa.column('is_synced', sa.Boolean()))
+    op.execute(time_records.update().values(is_synced=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('time_records', schema=None) as batch_op:
+        batch_op.drop_column('is_synced')
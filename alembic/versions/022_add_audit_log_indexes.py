@@ -0,0 +1,24 @@
+from alembic import op
+
+revision = '022'
+down_revision = '021'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_audit_logs_timestamp_id', ['timestamp', 'id']),
+    ('ix_audit_logs_action_timestamp_id', ['action', 'timestamp', 'id']),
+    ('ix_audit_logs_actor_timestamp_id', ['actor_id', 'timestamp', 'id']),
+    ('ix_audit_logs_target_user_timestamp_id', ['target_user_id', 'timestamp', 'id']),
+    ('ix_audit_logs_entity_timestamp_id', ['entity', 'entity_id', 'timestamp', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, 'audit_logs', columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='audit_logs')
@@ -0,0 +1,52 @@
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = '023'
+down_revision = '022'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_audit_logs_archive_timestamp_id', ['timestamp', 'id']),
+    ('ix_audit_logs_archive_action_timestamp_id', ['action', 'timestamp', 'id']),
+    ('ix_audit_logs_archive_actor_timestamp_id', ['actor_id', 'timestamp', 'id']),
+    ('ix_audit_logs_archive_target_user_timestamp_id', ['target_user_id', 'timestamp', 'id']),
+    ('ix_audit_logs_archive_entity_timestamp_id', ['entity', 'entity_id', 'timestamp', 'id']),
+]
+
+
+def upgrade() -> None:
+    op.create_table('audit_logs_archive',
+                    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+                    sa.Column('period', sa.String(length=7), nullable=False),
+                    sa.Column('user_id', sa.Integer(), nullable=True),
+                    sa.Column('action', sa.String(), nullable=False),
+                    sa.Column('entity', sa.String(), nullable=False),
+                    sa.Column('entity_id', sa.Integer(), nullable=True),
+                    sa.Column('details', sa.String(), nullable=True),
+                    sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+                    sa.Column('actor_name', sa.String(), nullable=True),
+                    sa.Column('target_user_id', sa.Integer(), nullable=True),
+                    sa.Column('target_user_name', sa.String(), nullable=True),
+                    sa.Column('justification', sa.String(), nullable=True),
+                    sa.Column('reason', sa.String(), nullable=True),
+                    sa.Column('record_time', sa.DateTime(timezone=True), nullable=True),
+                    sa.Column('record_type', sa.String(), nullable=True),
+                    sa.Column('actor_id', sa.Integer(), nullable=True),
+                    sa.Column('payload', sa.LargeBinary(), nullable=True),
+                    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+                    sa.ForeignKeyConstraint(['target_user_id'], ['users.id'], ),
+                    sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.create_index(op.f('ix_audit_logs_archive_period'), 'audit_logs_archive', ['period'], unique=False)
+    for name, columns in INDEXES:
+        op.create_index(name, 'audit_logs_archive', columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='audit_logs_archive')
+    op.drop_index(op.f('ix_audit_logs_archive_period'), table_name='audit_logs_archive')
+    op.drop_table('audit_logs_archive')
@@ -0,0 +1,32 @@
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = '024'
+down_revision = '023'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('anomalies',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('user_id', sa.Integer(), nullable=False),
+                    sa.Column('date', sa.Date(), nullable=False),
+                    sa.Column('type', sa.String(), nullable=False),
+                    sa.Column('description', sa.String(), nullable=False),
+                    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.create_index(op.f('ix_anomalies_id'), 'anomalies', ['id'], unique=False)
+    op.create_index('ix_anomalies_date_user', 'anomalies', ['date', 'user_id'], unique=False)
+    op.create_index('ix_anomalies_user_date', 'anomalies', ['user_id', 'date'], unique=False)
+    op.create_index('ix_time_records_user_datetime', 'time_records', ['user_id', 'record_datetime'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_time_records_user_datetime', table_name='time_records')
+    op.drop_index('ix_anomalies_user_date', table_name='anomalies')
+    op.drop_index('ix_anomalies_date_user', table_name='anomalies')
+    op.drop_index(op.f('ix_anomalies_id'), table_name='anomalies')
+    op.drop_table('anomalies')
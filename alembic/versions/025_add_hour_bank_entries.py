@@ -0,0 +1,29 @@
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = '025'
+down_revision = '024'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('hour_bank_entries',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('user_id', sa.Integer(), nullable=False),
+                    sa.Column('date', sa.Date(), nullable=False),
+                    sa.Column('worked_seconds', sa.Float(), server_default='0', nullable=False),
+                    sa.Column('credit_seconds', sa.Float(), server_default='0', nullable=False),
+                    sa.Column('running_worked_seconds', sa.Float(), server_default='0', nullable=False),
+                    sa.Column('running_credit_seconds', sa.Float(), server_default='0', nullable=False),
+                    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+                    sa.PrimaryKeyConstraint('id'),
+                    sa.UniqueConstraint('user_id', 'date', name='uq_hour_bank_user_date')
+                    )
+    op.create_index(op.f('ix_hour_bank_entries_id'), 'hour_bank_entries', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_hour_bank_entries_id'), table_name='hour_bank_entries')
+    op.drop_table('hour_bank_entries')
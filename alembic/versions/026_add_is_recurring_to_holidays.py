@@ -0,0 +1,18 @@
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = '026'
+down_revision = '025'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('holidays', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('is_recurring', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('holidays', schema=None) as batch_op:
+        batch_op.drop_column('is_recurring')
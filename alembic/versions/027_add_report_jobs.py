@@ -0,0 +1,38 @@
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = '027'
+down_revision = '026'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('report_jobs',
+                    sa.Column('id', sa.String(length=32), nullable=False),
+                    sa.Column('job_type', sa.Enum('MONTHLY_SUMMARY', 'EXCEL', 'TELEGRAM_REPORT',
+                                                  name='reportjobtype'), nullable=False),
+                    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'SUCCESS', 'FAILED',
+                                                name='reportjobstatus'), nullable=False),
+                    sa.Column('params', sa.Text(), nullable=False),
+                    sa.Column('dedup_key', sa.String(), nullable=False),
+                    sa.Column('requested_by', sa.Integer(), nullable=False),
+                    sa.Column('created_at', sa.DateTime(), nullable=False),
+                    sa.Column('started_at', sa.DateTime(), nullable=True),
+                    sa.Column('finished_at', sa.DateTime(), nullable=True),
+                    sa.Column('result_path', sa.String(), nullable=True),
+                    sa.Column('result_filename', sa.String(), nullable=True),
+                    sa.Column('result_media_type', sa.String(), nullable=True),
+                    sa.Column('error', sa.String(), nullable=True),
+                    sa.ForeignKeyConstraint(['requested_by'], ['users.id'], ),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.create_index(op.f('ix_report_jobs_status'), 'report_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_report_jobs_dedup_key'), 'report_jobs', ['dedup_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_report_jobs_dedup_key'), table_name='report_jobs')
+    op.drop_index(op.f('ix_report_jobs_status'), table_name='report_jobs')
+    op.drop_table('report_jobs')
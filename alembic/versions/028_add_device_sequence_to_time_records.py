@@ -0,0 +1,24 @@
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = '028'
+down_revision = '027'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('time_records', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('device_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('device_sequence', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_time_records_device_id', 'device_credentials', ['device_id'], ['id'])
+        batch_op.create_unique_constraint('uq_time_records_device_sequence', ['device_id', 'device_sequence'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('time_records', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_time_records_device_sequence', type_='unique')
+        batch_op.drop_constraint('fk_time_records_device_id', type_='foreignkey')
+        batch_op.drop_column('device_sequence')
+        batch_op.drop_column('device_id')
@@ -1,13 +1,14 @@
-from typing import Generator
+from typing import Generator, Optional
 
 import jwt
-from fastapi import Depends, HTTPException, status, Security
+from fastapi import Depends, HTTPException, status, Security, Header
 from fastapi.security import OAuth2PasswordBearer, APIKeyHeader
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.security import get_api_key_hash
+from app.core.security import get_api_key_hash, ACCESS_TOKEN_TYPE
+from app.core.token_revocation import token_revocation
 from app.database.session import SessionLocal
 from app.domain.models.device import DeviceCredential
 from app.domain.models.enums import UserRole, DeviceKeyType
@@ -30,10 +31,28 @@ def get_db() -> Generator:
         db.close()
 
 
-def get_current_user(
-        db: Session = Depends(get_db),
-        token: str = Depends(reusable_oauth2)
-) -> User:
+class TokenUser:
+    def __init__(self, db: Session, user_id: int, role: UserRole, is_active: bool):
+        self.id = user_id
+        self.role = role
+        self.is_active = is_active
+        self._db = db
+        self._user: Optional[User] = None
+
+    def load(self) -> User:
+        if self._user is None:
+            self._user = self._db.query(User).filter(User.id == self.id).first()
+            if not self._user:
+                raise HTTPException(status_code=404, detail="User not found")
+        return self._user
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+
+def decode_token(token: str, token_type: str) -> TokenPayload:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -47,8 +66,24 @@ def get_current_user(
 
     if not token_data.sub:
         raise HTTPException(status_code=403, detail="Invalid token subject")
+    if token_data.type not in (None, token_type):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Could not validate credentials")
+    return token_data
+
+
+def get_current_user(
+        db: Session = Depends(get_db),
+        token: str = Depends(reusable_oauth2)
+) -> User:
+    token_data = decode_token(token, ACCESS_TOKEN_TYPE)
+    user_id = int(str(token_data.sub))
 
-    user = db.query(User).filter(User.id == int(str(token_data.sub))).first()
+    if token_data.role is not None and token_data.active is not None:
+        if token_revocation.is_revoked(user_id, token_data.iat):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Could not validate credentials")
+        return TokenUser(db, user_id, token_data.role, token_data.active)
+
+    user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -62,6 +97,14 @@ def get_current_active_user(
     return current_user
 
 
+def get_current_active_db_user(
+        current_user: User = Depends(get_current_active_user),
+) -> User:
+    if isinstance(current_user, TokenUser):
+        return current_user.load()
+    return current_user
+
+
 def get_current_manager(
         current_user: User = Depends(get_current_active_user),
 ) -> User:
@@ -84,6 +127,14 @@ def get_current_maintainer(
     return current_user
 
 
+def get_idempotency_key(
+        idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+) -> Optional[str]:
+    if idempotency_key is not None and not 1 <= len(idempotency_key) <= 255:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Idempotency-Key")
+    return idempotency_key
+
+
 async def verify_device_api_key(
         api_key: str = Security(api_key_header),
         db: Session = Depends(get_db)
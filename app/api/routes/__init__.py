@@ -9,6 +9,7 @@ from app.api.routes import (
     holidays,
     adjustments,
     anomalies,
+    events,
     reports,
     payroll,
     device,
@@ -38,6 +39,7 @@ api_router.include_router(work_hours.router, prefix="/work-hours", tags=["Work H
 api_router.include_router(holidays.router, prefix="/holidays", tags=["Holidays"])
 api_router.include_router(adjustments.router, prefix="/adjustments", tags=["Adjustments"])
 api_router.include_router(anomalies.router, prefix="/anomalies", tags=["Anomalies"])
+api_router.include_router(events.router, prefix="/events", tags=["Events"])
 api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
 api_router.include_router(payroll.router, prefix="/payroll", tags=["Payroll"])
 api_router.include_router(device.router, prefix="/device", tags=["Device"])
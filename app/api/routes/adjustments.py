@@ -1,5 +1,5 @@
 import os
-from typing import Any, List
+from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, Body, UploadFile, File, HTTPException
 from fastapi.responses import FileResponse
@@ -13,6 +13,7 @@ from app.repositories.adjustment_repository import adjustment_repository
 from app.schemas.adjustment import AdjustmentRequestCreate, AdjustmentRequestUpdate, AdjustmentRequestResponse, \
     AdjustmentAttachmentResponse, AdjustmentWaiverCreate
 from app.services.adjustment_service import adjustment_service
+from app.services.idempotency_store import idempotency_store
 
 router = APIRouter()
 
@@ -21,18 +22,32 @@ router = APIRouter()
 def create_adjustment_request(
         request_in: AdjustmentRequestCreate,
         db: Session = Depends(deps.get_db),
-        current_user: User = Depends(deps.get_current_active_user)
+        current_user: User = Depends(deps.get_current_active_user),
+        idempotency_key: Optional[str] = Depends(deps.get_idempotency_key)
 ) -> Any:
-    return adjustment_service.create_adjustment_request(db, current_user.id, request_in)
+    return idempotency_store.run(
+        f"user:{current_user.id}:adjustment-create", idempotency_key,
+        lambda: AdjustmentRequestResponse.model_validate(
+            adjustment_service.create_adjustment_request(db, current_user.id, request_in)
+        ),
+        fingerprint=request_in.model_dump_json()
+    )
 
 
 @router.post("/admin/waive", response_model=AdjustmentRequestResponse)
 def waive_absence_admin(
         waiver_in: AdjustmentWaiverCreate,
         db: Session = Depends(deps.get_db),
-        current_user: User = Depends(deps.get_current_manager)
+        current_user: User = Depends(deps.get_current_manager),
+        idempotency_key: Optional[str] = Depends(deps.get_idempotency_key)
 ) -> Any:
-    return adjustment_service.create_manager_waiver(db, waiver_in, current_user.id)
+    return idempotency_store.run(
+        f"user:{current_user.id}:adjustment-waive", idempotency_key,
+        lambda: AdjustmentRequestResponse.model_validate(
+            adjustment_service.create_manager_waiver(db, waiver_in, current_user.id)
+        ),
+        fingerprint=waiver_in.model_dump_json()
+    )
 
 
 @router.post("/{id}/attachments", response_model=AdjustmentAttachmentResponse)
@@ -109,9 +124,13 @@ def approve_adjustment(
         id: int,
         comment: str = Body(None, embed=True),
         db: Session = Depends(deps.get_db),
-        current_user: User = Depends(deps.get_current_manager)
+        current_user: User = Depends(deps.get_current_manager),
+        idempotency_key: Optional[str] = Depends(deps.get_idempotency_key)
 ) -> Any:
-    return adjustment_service.approve_adjustment(db, id, current_user.id)
+    return idempotency_store.run(
+        f"user:{current_user.id}:adjustment-approve:{id}", idempotency_key,
+        lambda: AdjustmentRequestResponse.model_validate(adjustment_service.approve_adjustment(db, id, current_user.id))
+    )
 
 
 @router.put("/{id}/reject", response_model=AdjustmentRequestResponse)
@@ -119,9 +138,16 @@ def reject_adjustment(
         id: int,
         comment: str = Body(..., embed=True),
         db: Session = Depends(deps.get_db),
-        current_user: User = Depends(deps.get_current_manager)
+        current_user: User = Depends(deps.get_current_manager),
+        idempotency_key: Optional[str] = Depends(deps.get_idempotency_key)
 ) -> Any:
-    return adjustment_service.reject_adjustment(db, id, current_user.id, comment)
+    return idempotency_store.run(
+        f"user:{current_user.id}:adjustment-reject:{id}", idempotency_key,
+        lambda: AdjustmentRequestResponse.model_validate(
+            adjustment_service.reject_adjustment(db, id, current_user.id, comment)
+        ),
+        fingerprint=comment
+    )
 
 
 @router.put("/{id}/edit", response_model=AdjustmentRequestResponse)
@@ -129,16 +155,27 @@ def edit_adjustment_request(
         id: int,
         request_in: AdjustmentRequestUpdate,
         db: Session = Depends(deps.get_db),
-        current_user: User = Depends(deps.get_current_manager)
+        current_user: User = Depends(deps.get_current_manager),
+        idempotency_key: Optional[str] = Depends(deps.get_idempotency_key)
 ) -> Any:
-    return adjustment_service.update_adjustment(db, id, request_in, current_user.id)
+    return idempotency_store.run(
+        f"user:{current_user.id}:adjustment-edit:{id}", idempotency_key,
+        lambda: AdjustmentRequestResponse.model_validate(
+            adjustment_service.update_adjustment(db, id, request_in, current_user.id)
+        ),
+        fingerprint=request_in.model_dump_json()
+    )
 
 
 @router.delete("/{id}")
 def delete_adjustment(
         id: int,
         db: Session = Depends(deps.get_db),
-        current_user: User = Depends(deps.get_current_manager)
+        current_user: User = Depends(deps.get_current_manager),
+        idempotency_key: Optional[str] = Depends(deps.get_idempotency_key)
 ) -> Any:
-    adjustment_service.delete_adjustment(db, id, current_user.id)
-    return {"status": "success"}
+    def delete_request():
+        adjustment_service.delete_adjustment(db, id, current_user.id)
+        return {"status": "success"}
+
+    return idempotency_store.run(f"user:{current_user.id}:adjustment-delete:{id}", idempotency_key, delete_request)
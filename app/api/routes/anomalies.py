@@ -42,12 +42,9 @@ def get_my_anomalies(
     if start_date > end_date:
         return []
 
-    all_anomalies = anomaly_service.get_anomalies(db, start_date, end_date, user_id=current_user.id)
-
     employee_types = ["MISSING_ENTRY", "DOUBLE_ENTRY", "DOUBLE_EXIT", "MISSING_EXIT"]
 
-    filtered = [a for a in all_anomalies if a.type in employee_types]
-    return filtered
+    return anomaly_service.get_anomalies(db, start_date, end_date, user_id=current_user.id, types=employee_types)
 
 
 @router.get("/recent", response_model=List[AnomalyResponse])
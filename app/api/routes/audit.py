@@ -1,10 +1,11 @@
 from datetime import date
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core.pagination import encode_cursor, decode_cursor
 from app.domain.models.user import User
 from app.repositories.audit_repository import audit_repository
 from app.schemas.audit import AuditLogResponse
@@ -12,34 +13,63 @@ from app.schemas.audit import AuditLogResponse
 router = APIRouter()
 
 
+def _parse_cursor(cursor: Optional[str]):
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _set_next_cursor(response: Response, logs: list, limit: int):
+    if logs and len(logs) == limit:
+        last = logs[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.timestamp, last.id)
+
+
 @router.get("/", response_model=List[AuditLogResponse])
 def read_audit_logs(
+        response: Response,
         action: Optional[str] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        actor_id: Optional[int] = None,
+        target_user_id: Optional[int] = None,
+        entity: Optional[str] = None,
+        entity_id: Optional[int] = None,
         order_by: str = Query("desc", pattern="^(asc|desc)$"),
+        cursor: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100,
+        limit: int = Query(100, ge=1, le=1000),
         db: Session = Depends(deps.get_db),
         current_user: User = Depends(deps.get_current_manager)
 ):
-    return audit_repository.get_logs(
+    logs = audit_repository.get_logs(
         db, action=action, start_date=start_date, end_date=end_date,
-        order_by=order_by, skip=skip, limit=limit
+        actor_id=actor_id, target_user_id=target_user_id, entity=entity, entity_id=entity_id,
+        order_by=order_by, skip=skip, limit=limit, after=_parse_cursor(cursor)
     )
+    _set_next_cursor(response, logs, limit)
+    return logs
 
 
 @router.get("/manual-changes", response_model=List[AuditLogResponse])
 def read_manual_changes(
+        response: Response,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        actor_id: Optional[int] = None,
+        target_user_id: Optional[int] = None,
         order_by: str = Query("desc", pattern="^(asc|desc)$"),
+        cursor: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100,
+        limit: int = Query(100, ge=1, le=1000),
         db: Session = Depends(deps.get_db),
         current_user: User = Depends(deps.get_current_manager)
 ):
-    return audit_repository.get_manual_changes(
+    logs = audit_repository.get_manual_changes(
         db, start_date=start_date, end_date=end_date,
-        order_by=order_by, skip=skip, limit=limit
+        actor_id=actor_id, target_user_id=target_user_id,
+        order_by=order_by, skip=skip, limit=limit, after=_parse_cursor(cursor)
     )
+    _set_next_cursor(response, logs, limit)
+    return logs
@@ -3,23 +3,37 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.api import deps
 from app.core import security
 from app.core.config import settings
+from app.core.password_hasher import password_hasher
 from app.domain.models.enums import UserRole
 from app.domain.models.user import User
 from app.repositories.user_repository import user_repository
-from app.schemas.token import Token
+from app.schemas.token import Token, RefreshTokenRequest
 from app.schemas.user import UserResponse
 
 router = APIRouter()
 
 
+def issue_tokens(user: User) -> dict:
+    access_token = security.create_access_token(
+        subject=user.id, claims={"role": UserRole(user.role).value, "active": user.is_active}
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": security.create_refresh_token(subject=user.id)
+    }
+
+
 @router.post("/login", response_model=Token)
-def login_access_token(db: Session = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()) -> Any:
+async def login_access_token(db: Session = Depends(deps.get_db),
+                             form_data: OAuth2PasswordRequestForm = Depends()) -> Any:
     username = form_data.username.lower()
-    user = user_repository.get_by_username(db, username=username)
+    user = await run_in_threadpool(user_repository.get_by_username, db, username)
 
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
@@ -28,16 +42,34 @@ def login_access_token(db: Session = Depends(deps.get_db), form_data: OAuth2Pass
     allow_bypass = is_dev and user.role == UserRole.EMPLOYEE
 
     if not allow_bypass:
-        if not security.verify_password(form_data.password, user.password_hash):
+        if not await password_hasher.verify(form_data.password, user.password_hash):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
 
+        if user.is_active and security.password_needs_rehash(user.password_hash):
+            new_hash = await password_hasher.hash(form_data.password)
+            await run_in_threadpool(user_repository.update, db, user, {"password_hash": new_hash})
+
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
+
+    return issue_tokens(user)
+
+
+@router.post("/refresh", response_model=Token)
+def refresh_access_token(payload: RefreshTokenRequest, db: Session = Depends(deps.get_db)) -> Any:
+    token_data = deps.decode_token(payload.refresh_token, security.REFRESH_TOKEN_TYPE)
+    if token_data.type != security.REFRESH_TOKEN_TYPE:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Could not validate credentials")
+
+    user = user_repository.get(db, int(token_data.sub))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
 
-    access_token = security.create_access_token(subject=user.id)
-    return {"access_token": access_token, "token_type": "bearer"}
+    return issue_tokens(user)
 
 
 @router.get("/me", response_model=UserResponse)
-def read_users_me(current_user: User = Depends(deps.get_current_active_user)) -> Any:
+def read_users_me(current_user: User = Depends(deps.get_current_active_db_user)) -> Any:
     return current_user
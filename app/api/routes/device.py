@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, Request
@@ -7,14 +7,15 @@ from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.core.config import settings
+from app.core.metrics import DEVICE_PUNCHES
 from app.core.security import get_client_ip
 from app.domain.models.device import DeviceCredential
-from app.domain.models.enums import RecordType
 from app.schemas.device import (
     DevicePunchRequest, FeedbackPayload, DeviceActions, EnrollResultPayload,
-    BiometricSyncData, BiometricSyncAck, TimeResponsePayload
+    BiometricSyncData, BiometricSyncAck, TimeResponsePayload, DevicePunchBatchRequest, DevicePunchBatchResponse
 )
 from app.services.biometric_service import biometric_service
+from app.services.idempotency_store import idempotency_store
 from app.services.punch_service import punch_service
 
 router = APIRouter()
@@ -25,35 +26,21 @@ def register_device_punch(
         payload: DevicePunchRequest,
         request: Request,
         db: Session = Depends(deps.get_db),
-        device: DeviceCredential = Depends(deps.verify_device_api_key)
+        device: DeviceCredential = Depends(deps.verify_device_api_key),
+        idempotency_key: Optional[str] = Depends(deps.get_idempotency_key)
 ):
     try:
         ip_address = get_client_ip(request)
-        success, message, record = punch_service.process_biometric_punch(db, payload.sensor_index, ip_address)
-
-        if success and record:
-            user_first_name = record.user.name.split()[0] if record.user.name else "Usuario"
-            time_formatted = record.record_datetime.strftime('%H:%M')
-            type_label = "Entrada" if record.record_type == RecordType.ENTRY else "Saida"
-
-            return FeedbackPayload(
-                line1=f"Ola, {user_first_name[:11]}",
-                line2=f"{type_label} {time_formatted}",
-                led="green",
-                actions=DeviceActions(
-                    buzzer_pattern=1, buzzer_duration_ms=500
-                )
-            )
-        else:
-            return FeedbackPayload(
-                line1="Erro",
-                line2=message[:16],
-                led="red",
-                actions=DeviceActions(
-                    buzzer_pattern=2, buzzer_duration_ms=1000
-                )
-            )
+        feedback = idempotency_store.run(
+            f"device:{device.id}:punch", idempotency_key,
+            lambda: punch_service.register_device_punch(db, payload.sensor_index, ip_address),
+            fingerprint=str(payload.sensor_index),
+            should_store=lambda result: result.led == "green"
+        )
+        DEVICE_PUNCHES.labels(device.name, "accepted" if feedback.led == "green" else "rejected").inc()
+        return feedback
     except Exception:
+        DEVICE_PUNCHES.labels(device.name, "error").inc()
         return FeedbackPayload(
             line1="Erro Interno",
             line2="Contate Admin",
@@ -64,6 +51,21 @@ def register_device_punch(
         )
 
 
+@router.post("/punch/batch", response_model=DevicePunchBatchResponse)
+def register_device_punch_batch(
+        payload: DevicePunchBatchRequest,
+        request: Request,
+        db: Session = Depends(deps.get_db),
+        device: DeviceCredential = Depends(deps.verify_device_api_key)
+):
+    ip_address = get_client_ip(request)
+    result = punch_service.register_punch_batch(db, device.id, payload.punches, ip_address)
+    DEVICE_PUNCHES.labels(device.name, "accepted").inc(result.accepted)
+    DEVICE_PUNCHES.labels(device.name, "duplicate").inc(len(result.duplicates))
+    DEVICE_PUNCHES.labels(device.name, "rejected").inc(len(result.rejected))
+    return result
+
+
 @router.post("/enroll", response_model=FeedbackPayload)
 def enroll_device_biometric(
         payload: EnrollResultPayload,
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.database.unit_of_work import unit_of_work
 from app.domain.models.user import User
 from app.repositories.device_credential_repository import device_credential_repository
 from app.schemas.device import DeviceCredentialCreate, DeviceCredentialUpdate, DeviceCredentialResponse
@@ -18,13 +19,14 @@ def create_credential(
         db: Session = Depends(deps.get_db),
         current_user: User = Depends(deps.get_current_maintainer)
 ):
-    device = device_credential_repository.create(db, credential_in)
-
-    audit_service.log(
-        db, actor_id=current_user.id, action="CREATE", entity="DEVICE_CREDENTIAL",
-        entity_id=device.id,
-        new_data={"name": device.name, "key_type": device.key_type.value}
-    )
+    with unit_of_work(db):
+        device = device_credential_repository.create(db, credential_in)
+
+        audit_service.log(
+            db, actor_id=current_user.id, action="CREATE", entity="DEVICE_CREDENTIAL",
+            entity_id=device.id,
+            new_data={"name": device.name, "key_type": device.key_type.value}
+        )
     return device
 
 
@@ -49,13 +51,14 @@ def update_credential(
 
     old_data = {"name": device.name, "is_active": device.is_active}
 
-    updated_device = device_credential_repository.update(db, device, credential_in)
+    with unit_of_work(db):
+        updated_device = device_credential_repository.update(db, device, credential_in)
 
-    audit_service.log(
-        db, actor_id=current_user.id, action="UPDATE", entity="DEVICE_CREDENTIAL",
-        entity_id=updated_device.id, old_data=old_data,
-        new_data={"name": updated_device.name, "is_active": updated_device.is_active}
-    )
+        audit_service.log(
+            db, actor_id=current_user.id, action="UPDATE", entity="DEVICE_CREDENTIAL",
+            entity_id=updated_device.id, old_data=old_data,
+            new_data={"name": updated_device.name, "is_active": updated_device.is_active}
+        )
     return updated_device
 
 
@@ -71,10 +74,11 @@ def delete_credential(
 
     old_data = {"name": device.name}
 
-    device_credential_repository.delete(db, id)
+    with unit_of_work(db):
+        device_credential_repository.delete(db, id)
 
-    audit_service.log(
-        db, actor_id=current_user.id, action="DELETE", entity="DEVICE_CREDENTIAL",
-        entity_id=id, old_data=old_data
-    )
+        audit_service.log(
+            db, actor_id=current_user.id, action="DELETE", entity="DEVICE_CREDENTIAL",
+            entity_id=id, old_data=old_data
+        )
     return {"status": "success"}
\ No newline at end of file
@@ -0,0 +1,67 @@
+import json
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api import deps
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.domain.models.user import User
+from app.services.dashboard_service import dashboard_service
+from app.services.event_bus import event_bus
+
+router = APIRouter()
+
+
+def format_event(event: str, payload: str) -> str:
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def get_stream_manager(
+        db: Session = Depends(deps.get_db),
+        current_user: User = Depends(deps.get_current_manager)
+) -> User:
+    db.close()
+    return current_user
+
+
+def load_snapshot():
+    db = SessionLocal()
+    try:
+        return dashboard_service.get_metrics(db)
+    finally:
+        db.close()
+
+
+@router.get("/stream")
+async def stream_events(current_user: User = Depends(get_stream_manager)) -> Any:
+    subscription = event_bus.subscribe()
+    if subscription is None:
+        raise HTTPException(status_code=503, detail="Too many event stream connections")
+
+    try:
+        metrics = await run_in_threadpool(load_snapshot)
+    except Exception:
+        event_bus.unsubscribe(subscription)
+        raise
+
+    async def event_generator():
+        try:
+            yield format_event("dashboard", json.dumps(metrics.model_dump(mode="json")))
+            while True:
+                item = await subscription.get(settings.EVENT_STREAM_HEARTBEAT_SECONDS)
+                if item is None:
+                    yield ": ping\n\n"
+                    continue
+                yield format_event(*item)
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
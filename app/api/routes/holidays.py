@@ -1,28 +1,46 @@
-from typing import Any
+from datetime import date
+from typing import Any, Callable
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.database.unit_of_work import unit_of_work
 from app.domain.models.user import User
 from app.repositories.holiday_repository import holiday_repository
 from app.schemas.holiday import HolidayCreate, HolidayResponse
 from app.services.audit_service import audit_service
+from app.services.holiday_calendar import holiday_calendar
+from app.services.hour_bank_service import hour_bank_service
 
 router = APIRouter()
 
 
+def _matches_holiday(holiday_date: date, is_recurring: bool) -> Callable[[date], bool]:
+    if is_recurring:
+        return lambda day: (day.month, day.day) == (holiday_date.month, holiday_date.day) and day >= holiday_date
+    return lambda day: day == holiday_date
+
+
+def _refresh_hour_bank(db: Session, holiday_date: date, is_recurring: bool):
+    holiday_calendar.invalidate()
+    with unit_of_work(db):
+        hour_bank_service.refresh_schedule_credits(db, matches=_matches_holiday(holiday_date, is_recurring))
+
+
 @router.post("/", response_model=HolidayResponse)
 def create_holiday(
         holiday_in: HolidayCreate,
         db: Session = Depends(deps.get_db),
         current_user: User = Depends(deps.get_current_manager)
 ) -> Any:
-    holiday = holiday_repository.create(db, holiday_in)
-    audit_service.log(
-        db, actor_id=current_user.id, action="CREATE", entity="HOLIDAY", entity_id=holiday.id,
-        new_data={"date": str(holiday.date), "name": holiday.name}
-    )
+    with unit_of_work(db):
+        holiday = holiday_repository.create(db, holiday_in)
+        audit_service.log(
+            db, actor_id=current_user.id, action="CREATE", entity="HOLIDAY", entity_id=holiday.id,
+            new_data={"date": str(holiday.date), "name": holiday.name, "is_recurring": holiday.is_recurring}
+        )
+    _refresh_hour_bank(db, holiday.date, holiday.is_recurring)
     return holiday
 
 
@@ -42,10 +60,13 @@ def delete_holiday(
 ) -> Any:
     holiday = holiday_repository.get_by_id(db, id)
     if holiday:
-        old_data = {"date": str(holiday.date), "name": holiday.name}
-        holiday_repository.delete(db, id)
-        audit_service.log(
-            db, actor_id=current_user.id, action="DELETE", entity="HOLIDAY", entity_id=id,
-            old_data=old_data
-        )
+        holiday_date, is_recurring = holiday.date, holiday.is_recurring
+        old_data = {"date": str(holiday.date), "name": holiday.name, "is_recurring": holiday.is_recurring}
+        with unit_of_work(db):
+            holiday_repository.delete(db, id)
+            audit_service.log(
+                db, actor_id=current_user.id, action="DELETE", entity="HOLIDAY", entity_id=id,
+                old_data=old_data
+            )
+        _refresh_hour_bank(db, holiday_date, is_recurring)
     return {"status": "success"}
@@ -2,17 +2,20 @@ from datetime import datetime
 from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, Query, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.domain.models.enums import UserRole
+from app.domain.models.enums import ReportJobType, ReportJobStatus, UserRole
 from app.domain.models.user import User
 from app.schemas.report import (
     MonthlyReportResponse,
     AdvancedUserReportResponse,
-    DashboardMetricsResponse
+    DashboardMetricsResponse,
+    ReportJobCreate,
+    ReportJobResponse
 )
+from app.services.report_job_service import report_job_service
 from app.services.report_service import report_service
 
 router = APIRouter()
@@ -123,3 +126,46 @@ def get_user_detailed_report(
         raise HTTPException(status_code=404, detail="User not found or data missing")
 
     return report
+
+
+@router.post("/jobs", response_model=ReportJobResponse, status_code=202)
+def create_report_job(
+        job_in: ReportJobCreate,
+        db: Session = Depends(deps.get_db),
+        current_user: User = Depends(deps.get_current_active_user)
+) -> Any:
+    check_report_permission(current_user)
+    if job_in.job_type not in [ReportJobType.MONTHLY_SUMMARY, ReportJobType.EXCEL]:
+        raise HTTPException(status_code=400, detail="Unsupported report job type")
+
+    now = datetime.now()
+    params = {
+        "month": job_in.month or now.month,
+        "year": job_in.year or now.year,
+        "employee_ids": job_in.employee_ids
+    }
+    return report_job_service.submit(db, job_in.job_type, params, current_user)
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJobResponse)
+def get_report_job(
+        job_id: str,
+        db: Session = Depends(deps.get_db),
+        current_user: User = Depends(deps.get_current_active_user)
+) -> Any:
+    check_report_permission(current_user)
+    return report_job_service.get_job(db, job_id, current_user)
+
+
+@router.get("/jobs/{job_id}/download")
+def download_report_job(
+        job_id: str,
+        db: Session = Depends(deps.get_db),
+        current_user: User = Depends(deps.get_current_active_user)
+):
+    check_report_permission(current_user)
+    job = report_job_service.get_job(db, job_id, current_user)
+    if job.status != ReportJobStatus.SUCCESS or not job.result_path:
+        raise HTTPException(status_code=409, detail="Report job has no result available")
+
+    return FileResponse(job.result_path, media_type=job.result_media_type, filename=job.result_filename)
@@ -1,9 +1,12 @@
 from datetime import date
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_maintainer
+from app.api.deps import get_current_maintainer, get_db
+from app.domain.models.enums import ReportJobType
 from app.domain.models.user import User
+from app.services.report_job_service import report_job_service
 from app.services.telegram_service import telegram_service
 
 router = APIRouter()
@@ -20,9 +23,9 @@ def trigger_manual_backup(
 
 @router.post("/manual-report")
 def trigger_manual_report(
-        background_tasks: BackgroundTasks,
         start_date: date = Query(..., description="Data inicial do período (YYYY-MM-DD)"),
         end_date: date = Query(..., description="Data final do período (YYYY-MM-DD)"),
+        db: Session = Depends(get_db),
         current_user: User = Depends(get_current_maintainer)
 ):
     if start_date > end_date:
@@ -38,7 +41,12 @@ def trigger_manual_report(
             detail="Período excedido. O relatório gerencial no Telegram é limitado a no máximo 7 dias. Utilize a plataforma web para consultar períodos mais extensos."
         )
 
-    background_tasks.add_task(telegram_service.send_manual_report, start_date, end_date)
+    job = report_job_service.submit(
+        db, ReportJobType.TELEGRAM_REPORT,
+        {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()},
+        current_user
+    )
     return {
-        "message": f"Relatório do período {start_date} até {end_date} enviado para processamento em background."
+        "message": f"Relatório do período {start_date} até {end_date} enviado para processamento em background.",
+        "job_id": job.id
     }
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, List
+from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
@@ -9,6 +9,7 @@ from app.core.security import get_client_ip, get_client_device_name
 from app.domain.models.user import User
 from app.repositories.time_record_repository import time_record_repository
 from app.schemas.time_record import TimeRecordResponse, TimeRecordCreateAdmin, TimeRecordUpdate, TimeRecordDeleteAdmin
+from app.services.idempotency_store import idempotency_store
 from app.services.time_record_service import time_record_service
 
 router = APIRouter()
@@ -18,18 +19,26 @@ router = APIRouter()
 def register_entry(
         request: Request,
         db: Session = Depends(deps.get_db),
-        current_user: User = Depends(deps.get_current_active_user)
+        current_user: User = Depends(deps.get_current_active_user),
+        idempotency_key: Optional[str] = Depends(deps.get_idempotency_key)
 ) -> Any:
-    return time_record_service.register_entry(db, current_user.id, request)
+    return idempotency_store.run(
+        f"user:{current_user.id}:entry", idempotency_key,
+        lambda: TimeRecordResponse.model_validate(time_record_service.register_entry(db, current_user.id, request))
+    )
 
 
 @router.post("/exit", response_model=TimeRecordResponse)
 def register_exit(
         request: Request,
         db: Session = Depends(deps.get_db),
-        current_user: User = Depends(deps.get_current_active_user)
+        current_user: User = Depends(deps.get_current_active_user),
+        idempotency_key: Optional[str] = Depends(deps.get_idempotency_key)
 ) -> Any:
-    return time_record_service.register_exit(db, current_user.id, request)
+    return idempotency_store.run(
+        f"user:{current_user.id}:exit", idempotency_key,
+        lambda: TimeRecordResponse.model_validate(time_record_service.register_exit(db, current_user.id, request))
+    )
 
 
 @router.put("/{id}/toggle", response_model=TimeRecordResponse)
@@ -68,11 +77,31 @@ def create_time_record_admin(
         record_in: TimeRecordCreateAdmin,
         request: Request,
         db: Session = Depends(deps.get_db),
+        current_user: User = Depends(deps.get_current_manager),
+        idempotency_key: Optional[str] = Depends(deps.get_idempotency_key)
+) -> Any:
+    ip_address = get_client_ip(request)
+    device_name = get_client_device_name(ip_address, request)
+    return idempotency_store.run(
+        f"user:{current_user.id}:admin-create", idempotency_key,
+        lambda: TimeRecordResponse.model_validate(
+            time_record_service.create_admin_record(db, record_in, current_user.id, ip_address, device_name)
+        ),
+        fingerprint=record_in.model_dump_json()
+    )
+
+
+@router.post("/admin/import")
+def import_time_records_admin(
+        records_in: List[TimeRecordCreateAdmin],
+        request: Request,
+        db: Session = Depends(deps.get_db),
         current_user: User = Depends(deps.get_current_manager)
 ) -> Any:
     ip_address = get_client_ip(request)
     device_name = get_client_device_name(ip_address, request)
-    return time_record_service.create_admin_record(db, record_in, current_user.id, ip_address, device_name)
+    imported = time_record_service.import_admin_records(db, records_in, current_user.id, ip_address, device_name)
+    return {"status": "success", "imported": imported}
 
 
 @router.put("/admin/{record_id}", response_model=TimeRecordResponse)
@@ -80,9 +109,16 @@ def update_time_record_admin(
         record_id: int,
         record_in: TimeRecordUpdate,
         db: Session = Depends(deps.get_db),
-        current_user: User = Depends(deps.get_current_manager)
+        current_user: User = Depends(deps.get_current_manager),
+        idempotency_key: Optional[str] = Depends(deps.get_idempotency_key)
 ) -> Any:
-    return time_record_service.update_admin_record(db, record_id, record_in, current_user.id)
+    return idempotency_store.run(
+        f"user:{current_user.id}:admin-update:{record_id}", idempotency_key,
+        lambda: TimeRecordResponse.model_validate(
+            time_record_service.update_admin_record(db, record_id, record_in, current_user.id)
+        ),
+        fingerprint=record_in.model_dump_json()
+    )
 
 
 @router.delete("/admin/{record_id}")
@@ -90,7 +126,14 @@ def delete_time_record_admin(
         record_id: int,
         request_body: TimeRecordDeleteAdmin,
         db: Session = Depends(deps.get_db),
-        current_user: User = Depends(deps.get_current_manager)
+        current_user: User = Depends(deps.get_current_manager),
+        idempotency_key: Optional[str] = Depends(deps.get_idempotency_key)
 ) -> Any:
-    time_record_service.delete_admin_record(db, record_id, request_body, current_user.id)
-    return {"status": "success", "message": "Record deleted"}
\ No newline at end of file
+    def delete_record():
+        time_record_service.delete_admin_record(db, record_id, request_body, current_user.id)
+        return {"status": "success", "message": "Record deleted"}
+
+    return idempotency_store.run(
+        f"user:{current_user.id}:admin-delete:{record_id}", idempotency_key, delete_record,
+        fingerprint=request_body.model_dump_json()
+    )
\ No newline at end of file
@@ -6,10 +6,15 @@ from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.core.security import get_password_hash
+from app.core.token_revocation import token_revocation
+from app.database.unit_of_work import unit_of_work
 from app.domain.models.enums import UserRole
 from app.domain.models.user import User
 from app.repositories.user_repository import user_repository
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
+from app.services.biometric_routing import biometric_routing
+from app.services.dashboard_service import dashboard_service
+from app.services.hour_bank_service import hour_bank_service
 from app.services.user_service import user_service
 
 router = APIRouter()
@@ -67,7 +72,7 @@ def update_user_me(
         db: Session = Depends(deps.get_db),
         password: str = Body(None),
         name: str = Body(None),
-        current_user: User = Depends(deps.get_current_active_user),
+        current_user: User = Depends(deps.get_current_active_db_user),
 ) -> Any:
     current_user_data = jsonable_encoder(current_user)
     user_in = UserUpdate(**current_user_data)
@@ -79,6 +84,7 @@ def update_user_me(
 
     try:
         user = user_repository.update(db, db_obj=current_user, obj_in=user_in)
+        biometric_routing.invalidate()
         return user
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -87,7 +93,7 @@ def update_user_me(
 @router.get("/me", response_model=UserResponse)
 def read_user_me(
         db: Session = Depends(deps.get_db),
-        current_user: User = Depends(deps.get_current_active_user),
+        current_user: User = Depends(deps.get_current_active_db_user),
 ) -> Any:
     can_punch_desktop = False
     can_punch_mobile = False
@@ -137,8 +143,16 @@ def update_user(
     if current_user.role == UserRole.MANAGER and user.role == UserRole.MAINTAINER:
         raise HTTPException(status_code=403, detail="Privilégios insuficientes para alterar este usuário")
 
+    previous_access = (user.role, user.is_active)
     try:
         user = user_repository.update(db, db_obj=user, obj_in=user_in)
+        if user_in.schedules is not None:
+            with unit_of_work(db):
+                hour_bank_service.refresh_schedule_credits(db, [user.id])
+        dashboard_service.on_users_changed()
+        biometric_routing.invalidate()
+        if (user.role, user.is_active) != previous_access:
+            token_revocation.revoke_user(user.id)
         return user
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
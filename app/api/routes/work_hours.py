@@ -7,7 +7,8 @@ from sqlalchemy.orm import Session
 from app.api import deps
 from app.domain.models.user import User
 from app.repositories.user_repository import user_repository
-from app.schemas.work_hour import WorkHourBalanceResponse
+from app.schemas.work_hour import WorkHourBalanceResponse, HourBankBalanceResponse, HourBankMonthResponse
+from app.services.hour_bank_service import hour_bank_service
 from app.services.work_hour_service import work_hour_service
 
 router = APIRouter()
@@ -28,6 +29,14 @@ def _get_default_dates(start_date: date | None, end_date: date | None):
     return start_date, end_date
 
 
+def _get_bank_dates(db: Session, user_id: int, start_date: date | None, end_date: date | None):
+    if not start_date:
+        start_date = hour_bank_service.get_ledger_start(db, user_id) or _get_default_dates(None, None)[0]
+    if not end_date:
+        end_date = datetime.now().date()
+    return start_date, end_date
+
+
 @router.get("/my", response_model=WorkHourBalanceResponse)
 def get_my_work_hours(
         start_date: date = Query(None),
@@ -58,14 +67,62 @@ def get_user_work_hours(
 def get_all_work_hours(
         start_date: date = Query(None),
         end_date: date = Query(None),
+        skip: int = Query(0, ge=0),
+        limit: int = Query(1000, ge=1, le=1000),
         db: Session = Depends(deps.get_db),
         current_user: User = Depends(deps.get_current_manager)
 ) -> Any:
     start_date, end_date = _get_default_dates(start_date, end_date)
-    users = user_repository.get_multi(db, limit=1000)
+    users = user_repository.get_multi(db, skip=skip, limit=limit)
+
+    return work_hour_service.calculate_balances(db, users, start_date, end_date)
+
+
+@router.get("/bank/my", response_model=HourBankBalanceResponse)
+def get_my_hour_bank(
+        start_date: date = Query(None),
+        end_date: date = Query(None),
+        db: Session = Depends(deps.get_db),
+        current_user: User = Depends(deps.get_current_active_user)
+) -> Any:
+    start_date, end_date = _get_bank_dates(db, current_user.id, start_date, end_date)
+    return hour_bank_service.get_balance(db, current_user, start_date, end_date)
+
+
+@router.get("/bank/my/monthly", response_model=list[HourBankMonthResponse])
+def get_my_hour_bank_monthly(
+        year: int,
+        db: Session = Depends(deps.get_db),
+        current_user: User = Depends(deps.get_current_active_user)
+) -> Any:
+    return hour_bank_service.get_monthly(db, current_user, year)
+
 
-    results = []
-    for user in users:
-        results.append(work_hour_service.calculate_balance(db, user.id, start_date, end_date))
+@router.get("/bank/user/{user_id}", response_model=HourBankBalanceResponse)
+def get_user_hour_bank(
+        user_id: int,
+        start_date: date = Query(None),
+        end_date: date = Query(None),
+        db: Session = Depends(deps.get_db),
+        current_user: User = Depends(deps.get_current_manager)
+) -> Any:
+    user = user_repository.get(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    start_date, end_date = _get_bank_dates(db, user_id, start_date, end_date)
+    return hour_bank_service.get_balance(db, user, start_date, end_date)
+
+
+@router.get("/bank/user/{user_id}/monthly", response_model=list[HourBankMonthResponse])
+def get_user_hour_bank_monthly(
+        user_id: int,
+        year: int,
+        db: Session = Depends(deps.get_db),
+        current_user: User = Depends(deps.get_current_manager)
+) -> Any:
+    user = user_repository.get(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
 
-    return results
+    return hour_bank_service.get_monthly(db, user, year)
@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
     FIRST_SUPERUSER: str
     FIRST_SUPERUSER_PASSWORD: str
     BACKEND_CORS_ORIGINS: List[str] = ["*"]
@@ -30,6 +34,33 @@ class Settings(BaseSettings):
     TELEGRAM_BOT_TOKEN: Optional[str] = None
     TELEGRAM_CHAT_ID: Optional[str] = None
 
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_BATCH_SIZE: int = 256
+
+    METRICS_TOKEN: Optional[str] = None
+    METRICS_ALLOWED_IPS: List[str] = []
+
+    AUDIT_BATCHED_ACTIONS: List[str] = ["ENROLL"]
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 2.0
+    AUDIT_RETENTION_DAYS: int = 180
+    AUDIT_ARCHIVE_BATCH_SIZE: int = 1000
+
+    EVENT_STREAM_MAX_CONNECTIONS: int = 100
+    EVENT_STREAM_QUEUE_SIZE: int = 256
+    EVENT_STREAM_HEARTBEAT_SECONDS: float = 15.0
+
+    REPORT_JOBS_DIR: str = "reports"
+    REPORT_JOB_WORKERS: int = 2
+    REPORT_JOB_MAX_ACTIVE: int = 20
+    REPORT_JOB_RETENTION_DAYS: int = 7
+    REPORT_PARALLEL_WORKERS: int = 0
+    REPORT_PARALLEL_MIN_USERS: int = 50
+
+    PUNCH_DEDUP_WINDOW_SECONDS: float = 30.0
+    IDEMPOTENCY_TTL_SECONDS: float = 86400.0
+    IDEMPOTENCY_MAX_KEYS: int = 10000
+
     OPERATION_MODE: str = "STANDALONE"
     CONSUMER_SERVER_URL: Optional[str] = None
 
@@ -47,3 +78,8 @@ if not os.path.isabs(settings.UPLOAD_DIR):
     settings.UPLOAD_DIR = os.path.join(ROOT_DIR, settings.UPLOAD_DIR)
 
 os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+
+if not os.path.isabs(settings.REPORT_JOBS_DIR):
+    settings.REPORT_JOBS_DIR = os.path.join(ROOT_DIR, settings.REPORT_JOBS_DIR)
+
+os.makedirs(settings.REPORT_JOBS_DIR, exist_ok=True)
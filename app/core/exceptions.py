@@ -89,7 +89,8 @@ def setup_exception_handlers(app: FastAPI):
                 "status": exc.status_code,
                 "detail": detail_msg,
                 "instance": request.url.path
-            }
+            },
+            headers=getattr(exc, "headers", None)
         )
 
     @app.exception_handler(RequestValidationError)
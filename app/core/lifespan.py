@@ -6,7 +6,15 @@ from apscheduler.triggers.cron import CronTrigger
 from fastapi import FastAPI
 
 from app.core.config import settings
+from app.core.metrics import timed_job
+from app.core.password_hasher import password_hasher
+from app.services.anomaly_service import anomaly_service
+from app.services.audit_service import audit_service
 from app.services.backup_service import backup_service
+from app.services.dashboard_service import dashboard_service
+from app.services.hour_bank_service import hour_bank_service
+from app.services.report_job_service import report_job_service
+from app.services.report_service import report_service
 from app.services.sync_service import sync_service
 from app.services.telegram_service import telegram_service
 
@@ -28,6 +36,16 @@ async def lifespan(app: FastAPI):
 
     scheduler.add_job(backup_service.clean_old_logs, trigger=trigger_aligned, id="cleanup_routine_logs",
                       max_instances=1, coalesce=True)
+    scheduler.add_job(anomaly_service.reconcile_anomalies, trigger=trigger_aligned, id="reconcile_anomalies",
+                      max_instances=1, coalesce=True)
+    scheduler.add_job(hour_bank_service.reconcile_ledger, trigger=trigger_aligned, id="reconcile_hour_bank",
+                      max_instances=1, coalesce=True)
+    scheduler.add_job(audit_service.archive_old_logs, trigger=trigger_aligned, id="archive_audit_logs",
+                      max_instances=1, coalesce=True)
+    scheduler.add_job(dashboard_service.reconcile, trigger=trigger_aligned, id="reconcile_dashboard",
+                      max_instances=1, coalesce=True)
+    scheduler.add_job(report_job_service.clean_old_results, trigger=trigger_aligned, id="cleanup_report_jobs",
+                      max_instances=1, coalesce=True)
 
     if settings.OPERATION_MODE == "EXPORTADOR":
         scheduler.add_job(sync_service.send_database_to_consumer, trigger=trigger_aligned, id="hourly_sync_db",
@@ -35,6 +53,15 @@ async def lifespan(app: FastAPI):
         scheduler.add_job(sync_service.check_and_sync_all, trigger=trigger_aligned, id="sync_time_records",
                           max_instances=1, coalesce=True)
 
+    for job in scheduler.get_jobs():
+        job.modify(func=timed_job(job.id, job.func))
+
+    report_job_service.recover()
+
     scheduler.start()
     yield
     scheduler.shutdown()
+    report_job_service.shutdown()
+    report_service.shutdown()
+    audit_service.shutdown()
+    password_hasher.shutdown()
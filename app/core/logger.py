@@ -1,17 +1,23 @@
+import atexit
 import logging
 import logging.config
 import os
+import queue
+import threading
 import time
 from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 from zoneinfo import ZoneInfo
 
 from app.core.config import settings
 
 
 class DailyRotatingFileHandler(logging.FileHandler):
-    def __init__(self, log_dir, backup_count=30, **kwargs):
+    def __init__(self, log_dir, backup_count=30, buffered=False, **kwargs):
         self.log_dir = log_dir
         self.backup_count = backup_count
+        self.buffered = buffered
         self.tz = ZoneInfo(settings.TIMEZONE)
         os.makedirs(self.log_dir, exist_ok=True)
         self.baseFilename = self.get_current_filename()
@@ -32,6 +38,13 @@ class DailyRotatingFileHandler(logging.FileHandler):
             self.do_rollover()
         super().emit(record)
 
+    def flush(self):
+        if not self.buffered:
+            super().flush()
+
+    def flush_batch(self):
+        super().flush()
+
     def do_rollover(self):
         self.close()
         self.baseFilename = self.get_current_filename()
@@ -55,6 +68,113 @@ class DailyRotatingFileHandler(logging.FileHandler):
                     continue
 
 
+class BoundedQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.max_depth = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+
+class BatchingQueueListener(QueueListener):
+    def __init__(self, log_queue: queue.Queue, *handlers, batch_size: int = 256):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.written = 0
+        self.batches = 0
+
+    def _monitor(self):
+        log_queue = self.queue
+        running = True
+        while running:
+            batch = [log_queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for record in batch:
+                if record is self._sentinel:
+                    running = False
+                    continue
+                try:
+                    self.handle(record)
+                    self.written += 1
+                except Exception:
+                    pass
+            for handler in self.handlers:
+                if isinstance(handler, DailyRotatingFileHandler):
+                    handler.flush_batch()
+                else:
+                    handler.flush()
+            self.batches += 1
+
+            for _ in batch:
+                log_queue.task_done()
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel, timeout=5)
+
+
+class LogPipeline:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queue: Optional[queue.Queue] = None
+        self.handler: Optional[BoundedQueueHandler] = None
+        self.listener: Optional[BatchingQueueListener] = None
+
+    def create_handler(self, log_dir: str, backup_count: int, encoding: str) -> BoundedQueueHandler:
+        with self._lock:
+            self._stop_listener()
+            self.queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+            file_handler = DailyRotatingFileHandler(log_dir, backup_count=backup_count, buffered=True,
+                                                    encoding=encoding, delay=True)
+            file_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+            self.handler = BoundedQueueHandler(self.queue)
+            self.listener = BatchingQueueListener(self.queue, file_handler, batch_size=settings.LOG_BATCH_SIZE)
+            self.listener.start()
+            return self.handler
+
+    def _stop_listener(self):
+        if self.listener and self.listener._thread:
+            try:
+                self.listener.stop()
+            except queue.Full:
+                pass
+            for handler in self.listener.handlers:
+                handler.close()
+
+    def stop(self):
+        with self._lock:
+            self._stop_listener()
+
+    def stats(self) -> dict:
+        if not self.handler:
+            return {}
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "max_depth": self.handler.max_depth,
+            "dropped": self.handler.dropped,
+            "written": self.listener.written,
+            "batches": self.listener.batches
+        }
+
+
+log_pipeline = LogPipeline()
+atexit.register(log_pipeline.stop)
+
+
 def setup_logging() -> None:
     log_dir = "logs"
     os.makedirs(log_dir, exist_ok=True)
@@ -62,36 +182,29 @@ def setup_logging() -> None:
     logging_config = {
         "version": 1,
         "disable_existing_loggers": True,
-        "formatters": {
-            "default": {
-                "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-            }
-        },
         "handlers": {
-            "file_handler": {
-                "()": "app.core.logger.DailyRotatingFileHandler",
+            "queue_handler": {
+                "()": log_pipeline.create_handler,
                 "log_dir": log_dir,
                 "backup_count": 30,
-                "encoding": "utf-8",
-                "formatter": "default",
-                "delay": True
+                "encoding": "utf-8"
             }
         },
         "loggers": {
             "apscheduler": {
-                "handlers": ["file_handler"],
+                "handlers": ["queue_handler"],
                 "level": "WARNING",
                 "propagate": False
             },
             "app": {
-                "handlers": ["file_handler"],
+                "handlers": ["queue_handler"],
                 "level": "INFO",
                 "propagate": False
             }
         },
         "root": {
             "level": "INFO",
-            "handlers": ["file_handler"]
+            "handlers": ["queue_handler"]
         }
     }
 
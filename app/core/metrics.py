@@ -0,0 +1,75 @@
+import functools
+import time
+from typing import Callable
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, disable_created_metrics
+
+disable_created_metrics()
+registry = CollectorRegistry(auto_describe=True)
+
+REQUEST_LATENCY = Histogram(
+    "spe_http_request_duration_seconds", "Tempo de resposta das requisições HTTP.",
+    ["method", "route", "status"], registry=registry,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+REQUEST_DB_TIME = Histogram(
+    "spe_http_request_db_seconds", "Tempo gasto em comandos SQL por requisição HTTP.",
+    ["route"], registry=registry,
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+DEVICE_PUNCHES = Counter(
+    "spe_device_punches", "Batidas recebidas dos leitores biométricos.",
+    ["device", "result"], registry=registry
+)
+JOB_DURATION = Histogram(
+    "spe_scheduler_job_duration_seconds", "Duração das execuções das rotinas agendadas.",
+    ["job"], registry=registry,
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+)
+JOB_RUNS = Counter(
+    "spe_scheduler_job_runs", "Execuções das rotinas agendadas.",
+    ["job", "outcome"], registry=registry
+)
+ROUTINE_RESULTS = Counter(
+    "spe_routine_results", "Resultados registrados em routine_logs.",
+    ["routine", "status"], registry=registry
+)
+BACKUP_DURATION = Histogram(
+    "spe_backup_duration_seconds", "Duração da geração de cópias do banco de dados.",
+    ["kind"], registry=registry,
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+)
+BACKUP_SIZE = Gauge(
+    "spe_backup_size_bytes", "Tamanho da última cópia do banco de dados.",
+    ["kind"], registry=registry
+)
+SYNC_DURATION = Histogram(
+    "spe_sync_duration_seconds", "Duração das operações de sincronização.",
+    ["operation"], registry=registry,
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+)
+SYNC_SIZE = Gauge(
+    "spe_sync_size_bytes", "Tamanho do último banco de dados sincronizado.",
+    ["operation"], registry=registry
+)
+SYNC_RECORDS = Counter(
+    "spe_sync_records", "Registros de ponto enviados ao consumidor.",
+    ["result"], registry=registry
+)
+
+
+def timed_job(job_id: str, func: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "success"
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            JOB_DURATION.labels(job_id).observe(time.perf_counter() - started)
+            JOB_RUNS.labels(job_id, outcome).inc()
+
+    return wrapper
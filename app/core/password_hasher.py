@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.security import verify_password, get_password_hash
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._hash_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS,
+                                                        thread_name_prefix="password-hash")
+        return self._executor
+
+    def _timed(self, func: Callable, submitted_at: float, *args):
+        started_at = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            finished_at = time.perf_counter()
+            with self._lock:
+                self._completed += 1
+                self._wait_seconds += started_at - submitted_at
+                self._hash_seconds += finished_at - started_at
+
+    async def _run(self, func: Callable, *args):
+        with self._lock:
+            if self._pending >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE:
+                self._rejected += 1
+                logger.warning(f"Fila de verificação de senhas cheia ({self._pending} pendentes)")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service busy. Try again shortly.",
+                    headers={"Retry-After": "1"}
+                )
+            self._pending += 1
+
+        try:
+            future = self._get_executor().submit(self._timed, func, time.perf_counter(), *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future: Future):
+        with self._lock:
+            self._pending -= 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": settings.PASSWORD_HASH_WORKERS,
+                "pending": self._pending,
+                "queued": max(self._pending - settings.PASSWORD_HASH_WORKERS, 0),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_seconds": self._wait_seconds,
+                "hash_seconds": self._hash_seconds
+            }
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,61 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestStats:
+    __slots__ = ("request_id", "db_seconds", "db_statements", "external_seconds")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.db_seconds = 0.0
+        self.db_statements = 0
+        self.external_seconds: Dict[str, float] = {}
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def start_request(stats: RequestStats) -> Token:
+    return _current_stats.set(stats)
+
+
+def end_request(token: Token):
+    _current_stats.reset(token)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_external(kind: str):
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.external_seconds[kind] = stats.external_seconds.get(kind, 0.0) + time.perf_counter() - started
+
+
+def instrument_engine(engine: Engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_stats.get() is not None:
+            conn.info["query_started_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_stats.get()
+        started = conn.info.pop("query_started_at", None)
+        if stats is not None and started is not None:
+            stats.db_seconds += time.perf_counter() - started
+            stats.db_statements += 1
@@ -1,5 +1,7 @@
 import hashlib
 import socket
+import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Any, Union, Optional
 
@@ -8,20 +10,36 @@ import jwt
 from fastapi import Request
 
 from app.core.config import settings
+from app.core.request_context import track_external
 
 ALGORITHM = settings.ALGORITHM
 
 
-def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+
+def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None,
+                        claims: Optional[dict] = None) -> str:
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode = {"exp": expire, "sub": str(subject)}
+        expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode = {**(claims or {}), "exp": expire, "iat": time.time(), "sub": str(subject),
+                 "type": ACCESS_TOKEN_TYPE}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def create_refresh_token(subject: Union[str, Any]) -> str:
+    now = datetime.utcnow()
+    expire = now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode = {"exp": expire, "iat": now, "sub": str(subject), "type": REFRESH_TOKEN_TYPE,
+                 "jti": uuid.uuid4().hex}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
         return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
@@ -30,11 +48,18 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def get_password_hash(password: str) -> str:
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
 def get_api_key_hash(api_key: str) -> str:
     return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
 
@@ -63,7 +88,8 @@ def get_client_device_name(ip: str, request: Optional[Request] = None) -> str:
         else:
             try:
                 socket.setdefaulttimeout(1.5)
-                host_info = socket.gethostbyaddr(ip)
+                with track_external("dns"):
+                    host_info = socket.gethostbyaddr(ip)
                 if host_info and host_info[0]:
                     device_name = host_info[0].split('.')[0]
             except Exception:
@@ -0,0 +1,31 @@
+import threading
+import time
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+
+class TokenRevocationList:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revoked: Dict[int, float] = {}
+
+    def _prune(self, now: float):
+        cutoff = now - settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        for user_id in [uid for uid, revoked_at in self._revoked.items() if revoked_at < cutoff]:
+            del self._revoked[user_id]
+
+    def revoke_user(self, user_id: int):
+        with self._lock:
+            now = time.time()
+            self._prune(now)
+            self._revoked[user_id] = now
+
+    def is_revoked(self, user_id: int, issued_at: Optional[float]) -> bool:
+        revoked_at = self._revoked.get(user_id)
+        if revoked_at is None:
+            return False
+        return issued_at is None or issued_at <= revoked_at
+
+
+token_revocation = TokenRevocationList()
@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from sqlalchemy.orm import Session
+
+UOW_DEPTH_KEY = "uow_depth"
+UOW_AFTER_COMMIT_KEY = "uow_after_commit"
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    depth = db.info.get(UOW_DEPTH_KEY, 0)
+    db.info[UOW_DEPTH_KEY] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            db.commit()
+    except BaseException:
+        if depth == 0:
+            db.info.pop(UOW_AFTER_COMMIT_KEY, None)
+            db.rollback()
+        raise
+    finally:
+        db.info[UOW_DEPTH_KEY] = depth
+
+    if depth == 0:
+        for callback in db.info.pop(UOW_AFTER_COMMIT_KEY, []):
+            callback()
+
+
+def in_unit_of_work(db: Session) -> bool:
+    return db.info.get(UOW_DEPTH_KEY, 0) > 0
+
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    if in_unit_of_work(db):
+        db.info.setdefault(UOW_AFTER_COMMIT_KEY, []).append(callback)
+        return
+
+    callback()
+
+
+def commit_or_flush(db: Session, *refresh: Any) -> None:
+    if in_unit_of_work(db):
+        db.flush()
+        return
+
+    db.commit()
+    for obj in refresh:
+        db.refresh(obj)
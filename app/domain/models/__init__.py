@@ -1,9 +1,12 @@
 from .adjustment import AdjustmentRequest, AdjustmentAttachment
-from .audit import AuditLog
+from .anomaly import Anomaly
+from .audit import AuditLog, AuditLogArchive
 from .biometric import UserBiometric
 from .device import DeviceCredential
 from .holiday import Holiday
+from .hour_bank import HourBankEntry
 from .payroll import PayrollClosure
+from .report_job import ReportJob
 from .routine_log import RoutineLog
 from .time_record import TimeRecord, ManualAdjustment
 from .user import User, WorkSchedule
@@ -11,11 +14,15 @@ from .user import User, WorkSchedule
 __all__ = [
     "AdjustmentRequest",
     "AdjustmentAttachment",
+    "Anomaly",
     "AuditLog",
+    "AuditLogArchive",
     "UserBiometric",
     "DeviceCredential",
     "Holiday",
+    "HourBankEntry",
     "PayrollClosure",
+    "ReportJob",
     "RoutineLog",
     "TimeRecord",
     "ManualAdjustment",
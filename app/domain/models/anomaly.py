@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index
+from sqlalchemy.orm import relationship
+
+from app.database.base import Base
+
+
+class Anomaly(Base):
+    __tablename__ = "anomalies"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    type = Column(String, nullable=False)
+    description = Column(String, nullable=False)
+
+    user = relationship("User")
+
+    __table_args__ = (
+        Index('ix_anomalies_date_user', 'date', 'user_id'),
+        Index('ix_anomalies_user_date', 'user_id', 'date'),
+    )
@@ -1,7 +1,9 @@
+import json
+import zlib
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index, LargeBinary
 from sqlalchemy.orm import relationship
 
 from app.core.config import settings
@@ -37,3 +39,66 @@ class AuditLog(Base):
 
     actor = relationship("User", foreign_keys=[actor_id])
     target_user = relationship("User", foreign_keys=[target_user_id])
+
+    __table_args__ = (
+        Index('ix_audit_logs_timestamp_id', 'timestamp', 'id'),
+        Index('ix_audit_logs_action_timestamp_id', 'action', 'timestamp', 'id'),
+        Index('ix_audit_logs_actor_timestamp_id', 'actor_id', 'timestamp', 'id'),
+        Index('ix_audit_logs_target_user_timestamp_id', 'target_user_id', 'timestamp', 'id'),
+        Index('ix_audit_logs_entity_timestamp_id', 'entity', 'entity_id', 'timestamp', 'id'),
+    )
+
+
+class AuditLogArchive(Base):
+    __tablename__ = "audit_logs_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    period = Column(String(7), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    action = Column(String, nullable=False)
+    entity = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=True)
+    details = Column(String, nullable=True)
+    timestamp = Column(DateTime(timezone=True), nullable=False)
+
+    actor_name = Column(String, nullable=True)
+    target_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    target_user_name = Column(String, nullable=True)
+    justification = Column(String, nullable=True)
+    reason = Column(String, nullable=True)
+    record_time = Column(DateTime(timezone=True), nullable=True)
+    record_type = Column(String, nullable=True)
+
+    actor_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    payload = Column(LargeBinary, nullable=True)
+
+    actor = relationship("User", foreign_keys=[actor_id])
+    target_user = relationship("User", foreign_keys=[target_user_id])
+
+    __table_args__ = (
+        Index('ix_audit_logs_archive_timestamp_id', 'timestamp', 'id'),
+        Index('ix_audit_logs_archive_action_timestamp_id', 'action', 'timestamp', 'id'),
+        Index('ix_audit_logs_archive_actor_timestamp_id', 'actor_id', 'timestamp', 'id'),
+        Index('ix_audit_logs_archive_target_user_timestamp_id', 'target_user_id', 'timestamp', 'id'),
+        Index('ix_audit_logs_archive_entity_timestamp_id', 'entity', 'entity_id', 'timestamp', 'id'),
+    )
+
+    @staticmethod
+    def pack_payload(old_data, new_data) -> bytes | None:
+        if old_data is None and new_data is None:
+            return None
+        raw = json.dumps({"old_data": old_data, "new_data": new_data}, default=str, separators=(",", ":"))
+        return zlib.compress(raw.encode(), 9)
+
+    def _unpacked(self) -> dict:
+        if not self.payload:
+            return {}
+        return json.loads(zlib.decompress(self.payload))
+
+    @property
+    def old_data(self):
+        return self._unpacked().get("old_data")
+
+    @property
+    def new_data(self):
+        return self._unpacked().get("new_data")
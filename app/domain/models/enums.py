@@ -41,3 +41,21 @@ class EditJustification(str, enum.Enum):
 class DeviceKeyType(str, enum.Enum):
     DEVICE = "DEVICE"
     CONSUMER = "CONSUMER"
+
+
+class AuditDurability(str, enum.Enum):
+    SYNC = "SYNC"
+    BATCHED = "BATCHED"
+
+
+class ReportJobType(str, enum.Enum):
+    MONTHLY_SUMMARY = "MONTHLY_SUMMARY"
+    EXCEL = "EXCEL"
+    TELEGRAM_REPORT = "TELEGRAM_REPORT"
+
+
+class ReportJobStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCESS = "SUCCESS"
+    FAILED = "FAILED"
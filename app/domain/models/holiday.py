@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date
+from sqlalchemy import Column, Integer, String, Date, Boolean
 
 from app.database.base import Base
 
@@ -9,3 +9,4 @@ class Holiday(Base):
     id = Column(Integer, primary_key=True, index=True)
     date = Column(Date, unique=True, nullable=False)
     name = Column(String, nullable=False)
+    is_recurring = Column(Boolean, default=False, nullable=False)
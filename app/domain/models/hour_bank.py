@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Date, Float, ForeignKey, UniqueConstraint
+
+from app.database.base import Base
+
+
+class HourBankEntry(Base):
+    __tablename__ = "hour_bank_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    date = Column(Date, nullable=False)
+
+    worked_seconds = Column(Float, default=0.0, nullable=False)
+    credit_seconds = Column(Float, default=0.0, nullable=False)
+
+    running_worked_seconds = Column(Float, default=0.0, nullable=False)
+    running_credit_seconds = Column(Float, default=0.0, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'date', name='uq_hour_bank_user_date'),
+    )
@@ -0,0 +1,33 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Text
+
+from app.core.config import settings
+from app.database.base import Base
+from app.domain.models.enums import ReportJobType, ReportJobStatus
+
+
+def get_local_time():
+    tz = ZoneInfo(settings.TIMEZONE)
+    return datetime.now(tz).replace(tzinfo=None)
+
+
+class ReportJob(Base):
+    __tablename__ = "report_jobs"
+
+    id = Column(String(32), primary_key=True)
+    job_type = Column(Enum(ReportJobType), nullable=False)
+    status = Column(Enum(ReportJobStatus), default=ReportJobStatus.PENDING, nullable=False, index=True)
+    params = Column(Text, nullable=False)
+    dedup_key = Column(String, nullable=False, index=True)
+    requested_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    created_at = Column(DateTime, default=get_local_time, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    result_path = Column(String, nullable=True)
+    result_filename = Column(String, nullable=True)
+    result_media_type = Column(String, nullable=True)
+    error = Column(String, nullable=True)
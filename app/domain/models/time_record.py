@@ -1,7 +1,7 @@
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Boolean, Enum
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Boolean, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.core.config import settings
@@ -33,6 +33,11 @@ class TimeRecord(Base):
     edit_justification = Column(Enum(EditJustification), nullable=True)
     edit_reason = Column(String, nullable=True)
 
+    is_synced = Column(Boolean, default=False, nullable=False)
+
+    device_id = Column(Integer, ForeignKey("device_credentials.id"), nullable=True)
+    device_sequence = Column(Integer, nullable=True)
+
     created_at = Column(DateTime(timezone=True), default=get_local_time)
     updated_at = Column(DateTime(timezone=True), default=get_local_time, onupdate=get_local_time)
 
@@ -40,6 +45,11 @@ class TimeRecord(Base):
     editor = relationship("User", foreign_keys=[edited_by])
     biometric = relationship("UserBiometric", back_populates="time_records")
 
+    __table_args__ = (
+        Index('ix_time_records_user_datetime', 'user_id', 'record_datetime'),
+        UniqueConstraint('device_id', 'device_sequence', name='uq_time_records_device_sequence'),
+    )
+
 
 class ManualAdjustment(Base):
     __tablename__ = "manual_adjustments"
@@ -1,18 +1,30 @@
+import hmac
+import json
 import logging
 import time
+import uuid
+from typing import Optional
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from prometheus_client import CONTENT_TYPE_LATEST
 
 from app.api.routes import api_router
 from app.core.config import settings
 from app.core.exceptions import setup_exception_handlers
 from app.core.lifespan import lifespan
 from app.core.logger import setup_logging
+from app.core.metrics import REQUEST_LATENCY, REQUEST_DB_TIME
+from app.core.request_context import RequestStats, start_request, end_request, instrument_engine
+from app.database.session import engine
+from app.services.metrics_service import metrics_service
 
 setup_logging()
+instrument_engine(engine)
+metrics_service.install()
 logger = logging.getLogger(__name__)
+access_logger = logging.getLogger("app.access")
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -35,21 +47,84 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 setup_exception_handlers(app)
 
 
+def log_access(request: Request, stats: RequestStats, status_code: int, elapsed: float,
+               response_bytes: Optional[int]):
+    route = getattr(request.scope.get("route"), "path", None)
+    REQUEST_LATENCY.labels(request.method, route or "unmatched", str(status_code)).observe(elapsed)
+    REQUEST_DB_TIME.labels(route or "unmatched").observe(stats.db_seconds)
+    access_logger.info(json.dumps({
+        "request_id": stats.request_id,
+        "client": request.client.host if request.client else "127.0.0.1",
+        "method": request.method,
+        "route": route,
+        "path": request.url.path,
+        "status": status_code,
+        "duration_ms": round(elapsed * 1000, 2),
+        "db_ms": round(stats.db_seconds * 1000, 2),
+        "db_statements": stats.db_statements,
+        "external_ms": {kind: round(seconds * 1000, 2) for kind, seconds in stats.external_seconds.items()},
+        "response_bytes": response_bytes
+    }))
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    host = request.client.host if request.client else "127.0.0.1"
-    logger.info(f"{host} - \"{request.method} {request.url.path}\" {response.status_code} {process_time:.4f}s")
+    stats = RequestStats(request.headers.get("X-Request-ID", "")[:64] or uuid.uuid4().hex)
+    token = start_request(stats)
+    start_time = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        log_access(request, stats, 500, time.perf_counter() - start_time, None)
+        raise
+    finally:
+        end_request(token)
+
+    response.headers["X-Request-ID"] = stats.request_id
+    content_length = response.headers.get("content-length")
+    if content_length is not None:
+        log_access(request, stats, response.status_code, time.perf_counter() - start_time, int(content_length))
+        return response
+
+    body_iterator = response.body_iterator
+
+    async def counted_body():
+        sent = 0
+        try:
+            async for chunk in body_iterator:
+                sent += len(chunk)
+                yield chunk
+        finally:
+            log_access(request, stats, response.status_code, time.perf_counter() - start_time, sent)
+
+    response.body_iterator = counted_body()
     return response
 
 
+def metrics_authorized(request: Request) -> bool:
+    if request.client and request.client.host in settings.METRICS_ALLOWED_IPS:
+        return True
+    if not settings.METRICS_TOKEN:
+        return False
+    authorization = request.headers.get("Authorization", "")
+    return hmac.compare_digest(authorization.encode(), f"Bearer {settings.METRICS_TOKEN}".encode())
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    if not settings.METRICS_TOKEN and not settings.METRICS_ALLOWED_IPS:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not metrics_authorized(request):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return Response(metrics_service.render(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/", include_in_schema=False)
 def root():
     return {
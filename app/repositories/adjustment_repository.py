@@ -1,10 +1,11 @@
 from datetime import date
 
-from sqlalchemy import desc, and_
+from sqlalchemy import desc, and_, or_
 from sqlalchemy.orm import Session
 
+from app.database.unit_of_work import commit_or_flush
 from app.domain.models.adjustment import AdjustmentRequest, AdjustmentAttachment
-from app.domain.models.enums import AdjustmentStatus
+from app.domain.models.enums import AdjustmentStatus, AdjustmentType
 from app.schemas.adjustment import AdjustmentRequestCreate, AdjustmentRequestUpdate
 
 
@@ -20,8 +21,7 @@ class AdjustmentRepository:
             amount_hours=obj_in.amount_hours
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db, db_obj)
         return db_obj
 
     def get(self, db: Session, id: int) -> AdjustmentRequest | None:
@@ -56,6 +56,28 @@ class AdjustmentRepository:
             )
         ).all()
 
+    def get_approved_by_users_and_range(self, db: Session, user_ids: list[int], start_date: date,
+                                        end_date: date) -> list[AdjustmentRequest]:
+        return db.query(AdjustmentRequest).filter(
+            and_(
+                AdjustmentRequest.user_id.in_(user_ids),
+                AdjustmentRequest.status == AdjustmentStatus.APPROVED,
+                AdjustmentRequest.target_date >= start_date,
+                AdjustmentRequest.target_date <= end_date
+            )
+        ).order_by(AdjustmentRequest.id).all()
+
+    def get_approved_schedule_credits(self, db: Session, user_ids: list[int] | None = None) -> list[
+        AdjustmentRequest]:
+        query = db.query(AdjustmentRequest).filter(
+            AdjustmentRequest.status == AdjustmentStatus.APPROVED,
+            AdjustmentRequest.adjustment_type.in_([AdjustmentType.CERTIFICATE, AdjustmentType.WAIVER]),
+            or_(AdjustmentRequest.amount_hours.is_(None), AdjustmentRequest.amount_hours <= 0)
+        )
+        if user_ids is not None:
+            query = query.filter(AdjustmentRequest.user_id.in_(user_ids))
+        return query.all()
+
     def update(self, db: Session, db_obj: AdjustmentRequest,
                obj_in: AdjustmentRequestUpdate | dict) -> AdjustmentRequest:
         if isinstance(obj_in, dict):
@@ -67,8 +89,7 @@ class AdjustmentRepository:
             setattr(db_obj, field, value)
 
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db, db_obj)
         return db_obj
 
     def update_status(self, db: Session, db_obj: AdjustmentRequest, status: AdjustmentStatus, manager_id: int,
@@ -77,8 +98,7 @@ class AdjustmentRepository:
         db_obj.manager_id = manager_id
         db_obj.manager_comment = comment
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db, db_obj)
         return db_obj
 
     def create_attachment(self, db: Session, request_id: int, file_path: str, file_type: str) -> AdjustmentAttachment:
@@ -88,13 +108,12 @@ class AdjustmentRepository:
             file_type=file_type
         )
         db.add(db_attachment)
-        db.commit()
-        db.refresh(db_attachment)
+        commit_or_flush(db, db_attachment)
         return db_attachment
 
     def delete(self, db: Session, id: int):
         db.query(AdjustmentRequest).filter(AdjustmentRequest.id == id).delete()
-        db.commit()
+        commit_or_flush(db)
 
 
 adjustment_repository = AdjustmentRepository()
@@ -0,0 +1,74 @@
+from datetime import date
+from typing import Dict, List, Optional, Iterable, Tuple
+
+from sqlalchemy import desc, insert
+from sqlalchemy.orm import Session
+
+from app.database.unit_of_work import commit_or_flush
+from app.domain.models.anomaly import Anomaly
+from app.domain.models.enums import UserRole
+from app.domain.models.user import User
+
+
+DAYS_PER_QUERY = 500
+
+
+class AnomalyRepository:
+    def _user_days_filters(self, user_days: Iterable[Tuple[int, date]]):
+        days_by_user: Dict[int, set] = {}
+        for uid, day in user_days:
+            days_by_user.setdefault(uid, set()).add(day)
+
+        for uid, days in days_by_user.items():
+            days = sorted(days)
+            for i in range(0, len(days), DAYS_PER_QUERY):
+                yield Anomaly.user_id == uid, Anomaly.date.in_(days[i:i + DAYS_PER_QUERY])
+
+    def get_for_user_days(self, db: Session, user_days: Iterable[Tuple[int, date]]) -> List[Anomaly]:
+        anomalies = []
+        for filters in self._user_days_filters(user_days):
+            anomalies.extend(db.query(Anomaly).filter(*filters).all())
+        return anomalies
+
+    def replace_for_user_days(self, db: Session, user_days: Iterable[Tuple[int, date]], rows: List[dict]):
+        user_days = list(user_days)
+        if not user_days:
+            return
+
+        for filters in self._user_days_filters(user_days):
+            db.query(Anomaly).filter(*filters).delete(synchronize_session=False)
+
+        if rows:
+            db.execute(insert(Anomaly), rows)
+        commit_or_flush(db)
+
+    def replace_range(self, db: Session, start_date: date, end_date: date, rows: List[dict]):
+        db.query(Anomaly).filter(
+            Anomaly.date >= start_date, Anomaly.date <= end_date
+        ).delete(synchronize_session=False)
+
+        if rows:
+            db.execute(insert(Anomaly), rows)
+        commit_or_flush(db)
+
+    def get_by_range(self, db: Session, start_date: date, end_date: date, user_id: Optional[int] = None,
+                     types: Optional[List[str]] = None) -> List[Tuple[Anomaly, str]]:
+        query = (
+            db.query(Anomaly, User.name)
+            .join(User, Anomaly.user_id == User.id)
+            .filter(
+                Anomaly.date >= start_date,
+                Anomaly.date <= end_date,
+                User.is_active.is_(True),
+                User.role == UserRole.EMPLOYEE
+            )
+        )
+        if user_id:
+            query = query.filter(Anomaly.user_id == user_id)
+        if types:
+            query = query.filter(Anomaly.type.in_(types))
+
+        return query.order_by(desc(Anomaly.date), Anomaly.user_id, Anomaly.id).all()
+
+
+anomaly_repository = AnomalyRepository()
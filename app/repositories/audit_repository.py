@@ -1,72 +1,136 @@
 from datetime import date, datetime, time
-from typing import Optional
+from typing import List, Optional, Tuple
 
-from sqlalchemy import desc, asc
+from sqlalchemy import desc, asc, insert, tuple_, func
 from sqlalchemy.orm import Session
 
-from app.domain.models.audit import AuditLog
+from app.database.unit_of_work import commit_or_flush
+from app.domain.models.audit import AuditLog, AuditLogArchive
 from app.schemas.audit import AuditLogCreate
 
+ARCHIVE_COLUMNS = (
+    "id", "user_id", "action", "entity", "entity_id", "details", "timestamp", "actor_name",
+    "target_user_id", "target_user_name", "justification", "reason", "record_time", "record_type", "actor_id",
+)
+
 
 class AuditRepository:
-    def create(self, db: Session, obj_in: AuditLogCreate) -> AuditLog:
-        db_obj = AuditLog(
-            actor_id=obj_in.actor_id,
-            target_user_id=obj_in.target_user_id,
-            action=obj_in.action,
-            entity=obj_in.entity,
-            entity_id=obj_in.entity_id,
-            old_data=obj_in.old_data,
-            new_data=obj_in.new_data,
-            user_id=obj_in.user_id if obj_in.user_id else obj_in.actor_id,
-            details=obj_in.details,
-            actor_name=obj_in.actor_name,
-            target_user_name=obj_in.target_user_name,
-            justification=obj_in.justification,
-            reason=obj_in.reason,
-            record_time=obj_in.record_time,
-            record_type=obj_in.record_type
-        )
+    def _to_row(self, obj_in: AuditLogCreate | dict) -> dict:
+        row = obj_in if isinstance(obj_in, dict) else obj_in.model_dump()
+        if not row.get("user_id"):
+            row = {**row, "user_id": row.get("actor_id")}
+        return row
+
+    def create(self, db: Session, obj_in: AuditLogCreate | dict) -> AuditLog:
+        db_obj = AuditLog(**self._to_row(obj_in))
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db)
         return db_obj
 
-    def get_logs(self, db: Session, action: Optional[str] = None,
-                 start_date: Optional[date] = None, end_date: Optional[date] = None,
-                 order_by: str = "desc", skip: int = 0, limit: int = 100):
-        query = db.query(AuditLog)
+    def bulk_create(self, db: Session, objs_in: List[AuditLogCreate | dict]) -> int:
+        if not objs_in:
+            return 0
+
+        db.execute(insert(AuditLog), [self._to_row(obj_in) for obj_in in objs_in])
+        commit_or_flush(db)
+        return len(objs_in)
+
+    def _apply_filters(self, query, model, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                       action: Optional[str] = None, actor_id: Optional[int] = None,
+                       target_user_id: Optional[int] = None, entity: Optional[str] = None,
+                       entity_id: Optional[int] = None):
         if action:
-            query = query.filter(AuditLog.action == action)
+            query = query.filter(model.action == action)
+        if actor_id is not None:
+            query = query.filter(model.actor_id == actor_id)
+        if target_user_id is not None:
+            query = query.filter(model.target_user_id == target_user_id)
+        if entity:
+            query = query.filter(model.entity == entity)
+        if entity_id is not None:
+            query = query.filter(model.entity_id == entity_id)
         if start_date:
             dt_start = datetime.combine(start_date, time.min)
-            query = query.filter(AuditLog.timestamp >= dt_start)
+            query = query.filter(model.timestamp >= dt_start)
         if end_date:
             dt_end = datetime.combine(end_date, time.max)
-            query = query.filter(AuditLog.timestamp <= dt_end)
+            query = query.filter(model.timestamp <= dt_end)
+        return query
+
+    def _paginate(self, query, model, order_by: str, limit: int,
+                  after: Optional[Tuple[datetime, int]]) -> list:
+        key = tuple_(model.timestamp, model.id)
+        is_asc = order_by.lower() == "asc"
+
+        if after:
+            query = query.filter(key > tuple_(*after) if is_asc else key < tuple_(*after))
 
-        if order_by.lower() == "asc":
-            query = query.order_by(asc(AuditLog.timestamp))
+        if is_asc:
+            query = query.order_by(asc(model.timestamp), asc(model.id))
         else:
-            query = query.order_by(desc(AuditLog.timestamp))
-        return query.offset(skip).limit(limit).all()
+            query = query.order_by(desc(model.timestamp), desc(model.id))
+        return query.limit(limit).all()
+
+    def _query_hot_and_archive(self, db: Session, order_by: str, skip: int, limit: int,
+                               after: Optional[Tuple[datetime, int]], **filters) -> list:
+        window = limit if after else skip + limit
+        rows = []
+        for model in (AuditLog, AuditLogArchive):
+            query = self._apply_filters(db.query(model), model, **filters)
+            rows.extend(self._paginate(query, model, order_by, window, after))
+
+        rows.sort(key=lambda r: (r.timestamp, r.id), reverse=order_by.lower() != "asc")
+        offset = 0 if after else skip
+        return rows[offset:offset + limit]
+
+    def get_logs(self, db: Session, action: Optional[str] = None,
+                 start_date: Optional[date] = None, end_date: Optional[date] = None,
+                 actor_id: Optional[int] = None, target_user_id: Optional[int] = None,
+                 entity: Optional[str] = None, entity_id: Optional[int] = None,
+                 order_by: str = "desc", skip: int = 0, limit: int = 100,
+                 after: Optional[Tuple[datetime, int]] = None) -> list:
+        return self._query_hot_and_archive(
+            db, order_by, skip, limit, after, start_date=start_date, end_date=end_date, action=action,
+            actor_id=actor_id, target_user_id=target_user_id, entity=entity, entity_id=entity_id
+        )
 
     def get_manual_changes(self, db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None,
-                           order_by: str = "desc", skip: int = 0, limit: int = 100):
-        query = db.query(AuditLog)
+                           actor_id: Optional[int] = None, target_user_id: Optional[int] = None,
+                           order_by: str = "desc", skip: int = 0, limit: int = 100,
+                           after: Optional[Tuple[datetime, int]] = None) -> list:
+        return self._query_hot_and_archive(
+            db, order_by, skip, limit, after, start_date=start_date, end_date=end_date,
+            actor_id=actor_id, target_user_id=target_user_id
+        )
 
-        if start_date:
-            dt_start = datetime.combine(start_date, time.min)
-            query = query.filter(AuditLog.timestamp >= dt_start)
-        if end_date:
-            dt_end = datetime.combine(end_date, time.max)
-            query = query.filter(AuditLog.timestamp <= dt_end)
+    def archive_before(self, db: Session, cutoff: datetime, batch_size: int = 1000) -> int:
+        max_id = db.query(func.max(AuditLog.id)).scalar()
+        if max_id is None:
+            return 0
 
-        if order_by.lower() == "asc":
-            query = query.order_by(asc(AuditLog.timestamp))
-        else:
-            query = query.order_by(desc(AuditLog.timestamp))
-        return query.offset(skip).limit(limit).all()
+        # The newest row is kept hot so SQLite never hands out an archived id again.
+        logs = (
+            db.query(AuditLog)
+            .filter(AuditLog.timestamp < cutoff, AuditLog.id < max_id)
+            .order_by(asc(AuditLog.timestamp), asc(AuditLog.id))
+            .limit(batch_size)
+            .all()
+        )
+        if not logs:
+            return 0
+
+        archived = []
+        for log in logs:
+            row = {column: getattr(log, column) for column in ARCHIVE_COLUMNS}
+            row["period"] = log.timestamp.strftime("%Y-%m")
+            row["payload"] = AuditLogArchive.pack_payload(log.old_data, log.new_data)
+            archived.append(row)
+
+        ids = [log.id for log in logs]
+        db.execute(insert(AuditLogArchive), archived)
+        db.query(AuditLog).filter(AuditLog.id.in_(ids)).delete(synchronize_session=False)
+        commit_or_flush(db)
+        return len(ids)
 
 
 audit_repository = AuditRepository()
@@ -3,6 +3,7 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from app.core.security import get_api_key_hash
+from app.database.unit_of_work import commit_or_flush
 from app.domain.models.device import DeviceCredential
 from app.schemas.device import DeviceCredentialCreate, DeviceCredentialUpdate
 
@@ -17,8 +18,7 @@ class DeviceCredentialRepository:
             is_active=obj_in.is_active
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db, db_obj)
         return db_obj
 
     def get(self, db: Session, id: int) -> Optional[DeviceCredential]:
@@ -33,13 +33,12 @@ class DeviceCredentialRepository:
             setattr(db_obj, field, value)
 
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db, db_obj)
         return db_obj
 
     def delete(self, db: Session, id: int):
         db.query(DeviceCredential).filter(DeviceCredential.id == id).delete()
-        db.commit()
+        commit_or_flush(db)
 
 
 device_credential_repository = DeviceCredentialRepository()
\ No newline at end of file
@@ -3,16 +3,16 @@ from typing import List
 
 from sqlalchemy.orm import Session
 
+from app.database.unit_of_work import commit_or_flush
 from app.domain.models.holiday import Holiday
 from app.schemas.holiday import HolidayCreate
 
 
 class HolidayRepository:
     def create(self, db: Session, obj_in: HolidayCreate) -> Holiday:
-        db_obj = Holiday(date=obj_in.date, name=obj_in.name)
+        db_obj = Holiday(date=obj_in.date, name=obj_in.name, is_recurring=obj_in.is_recurring)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db, db_obj)
         return db_obj
 
     def get_all(self, db: Session) -> List[Holiday]:
@@ -37,7 +37,7 @@ class HolidayRepository:
         obj = db.query(Holiday).filter(Holiday.id == id).first()
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
 
 
 holiday_repository = HolidayRepository()
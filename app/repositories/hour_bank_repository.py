@@ -0,0 +1,60 @@
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import desc, insert
+from sqlalchemy.orm import Session
+
+from app.database.unit_of_work import commit_or_flush
+from app.domain.models.hour_bank import HourBankEntry
+
+
+class HourBankRepository:
+    def get_prefix(self, db: Session, user_id: int, until: date) -> Optional[HourBankEntry]:
+        return db.query(HourBankEntry).filter(
+            HourBankEntry.user_id == user_id,
+            HourBankEntry.date <= until
+        ).order_by(desc(HourBankEntry.date)).first()
+
+    def get_first(self, db: Session, user_id: int) -> Optional[HourBankEntry]:
+        return db.query(HourBankEntry).filter(HourBankEntry.user_id == user_id).order_by(HourBankEntry.date).first()
+
+    def get_from(self, db: Session, user_id: int, start_date: date) -> List[HourBankEntry]:
+        return db.query(HourBankEntry).filter(
+            HourBankEntry.user_id == user_id,
+            HourBankEntry.date >= start_date
+        ).order_by(HourBankEntry.date).all()
+
+    def rewrite_from(self, db: Session, user_id: int, start_date: date,
+                     values: Dict[date, Tuple[float, float]]):
+        anchor = self.get_prefix(db, user_id, date.fromordinal(start_date.toordinal() - 1))
+        merged = {e.date: (e.worked_seconds, e.credit_seconds) for e in self.get_from(db, user_id, start_date)}
+        merged.update(values)
+
+        running_worked = anchor.running_worked_seconds if anchor else 0.0
+        running_credit = anchor.running_credit_seconds if anchor else 0.0
+        rows = []
+        for day in sorted(merged):
+            worked, credit = merged[day]
+            if not worked and not credit:
+                continue
+            running_worked += worked
+            running_credit += credit
+            rows.append({
+                "user_id": user_id,
+                "date": day,
+                "worked_seconds": worked,
+                "credit_seconds": credit,
+                "running_worked_seconds": running_worked,
+                "running_credit_seconds": running_credit
+            })
+
+        db.query(HourBankEntry).filter(
+            HourBankEntry.user_id == user_id,
+            HourBankEntry.date >= start_date
+        ).delete(synchronize_session="fetch")
+        if rows:
+            db.execute(insert(HourBankEntry), rows)
+        commit_or_flush(db)
+
+
+hour_bank_repository = HourBankRepository()
@@ -2,6 +2,7 @@ from typing import List
 
 from sqlalchemy.orm import Session
 
+from app.database.unit_of_work import commit_or_flush
 from app.domain.models.payroll import PayrollClosure
 
 
@@ -9,8 +10,7 @@ class PayrollRepository:
     def create(self, db: Session, month: int, year: int, user_id: int) -> PayrollClosure:
         db_obj = PayrollClosure(month=month, year=year, is_closed=True, closed_by_user_id=user_id)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db, db_obj)
         return db_obj
 
     def get_by_month(self, db: Session, month: int, year: int) -> PayrollClosure | None:
@@ -30,7 +30,7 @@ class PayrollRepository:
             PayrollClosure.month == month,
             PayrollClosure.year == year
         ).delete()
-        db.commit()
+        commit_or_flush(db)
 
 
 payroll_repository = PayrollRepository()
@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.database.unit_of_work import commit_or_flush
+from app.domain.models.enums import ReportJobStatus
+from app.domain.models.report_job import ReportJob, get_local_time
+
+ACTIVE_STATUSES = [ReportJobStatus.PENDING, ReportJobStatus.RUNNING]
+
+
+class ReportJobRepository:
+    def get(self, db: Session, job_id: str) -> Optional[ReportJob]:
+        return db.query(ReportJob).filter(ReportJob.id == job_id).first()
+
+    def get_active_by_key(self, db: Session, dedup_key: str) -> Optional[ReportJob]:
+        return db.query(ReportJob).filter(
+            ReportJob.dedup_key == dedup_key,
+            ReportJob.status.in_(ACTIVE_STATUSES)
+        ).first()
+
+    def count_active(self, db: Session) -> int:
+        return db.query(ReportJob).filter(ReportJob.status.in_(ACTIVE_STATUSES)).count()
+
+    def create(self, db: Session, job: ReportJob) -> ReportJob:
+        db.add(job)
+        commit_or_flush(db, job)
+        return job
+
+    def mark_running(self, db: Session, job: ReportJob) -> ReportJob:
+        job.status = ReportJobStatus.RUNNING
+        job.started_at = get_local_time()
+        commit_or_flush(db, job)
+        return job
+
+    def mark_finished(self, db: Session, job: ReportJob, status: ReportJobStatus,
+                      error: Optional[str] = None) -> ReportJob:
+        job.status = status
+        job.error = error
+        job.finished_at = get_local_time()
+        commit_or_flush(db, job)
+        return job
+
+    def fail_active(self, db: Session, error: str) -> int:
+        count = db.query(ReportJob).filter(ReportJob.status.in_(ACTIVE_STATUSES)).update(
+            {"status": ReportJobStatus.FAILED, "error": error, "finished_at": get_local_time()},
+            synchronize_session=False
+        )
+        commit_or_flush(db)
+        return count
+
+    def get_finished_before(self, db: Session, cutoff: datetime) -> List[ReportJob]:
+        return db.query(ReportJob).filter(
+            ReportJob.status.notin_(ACTIVE_STATUSES),
+            ReportJob.created_at < cutoff
+        ).all()
+
+    def delete_many(self, db: Session, jobs: List[ReportJob]):
+        for job in jobs:
+            db.delete(job)
+        commit_or_flush(db)
+
+
+report_job_repository = ReportJobRepository()
@@ -1,18 +1,30 @@
-from datetime import datetime
-from typing import List, Optional
+import csv
+import enum
+import io
+from datetime import date, datetime
+from typing import List, Optional, Set, Tuple
 
-from sqlalchemy import desc, and_, distinct, func
+from sqlalchemy import desc, and_, distinct, func, insert, update
 from sqlalchemy.orm import Session
 
-from app.domain.models.enums import RecordType
-from app.domain.models.time_record import TimeRecord
+from app.database.unit_of_work import commit_or_flush
+from app.domain.models.enums import RecordType, EditJustification
+from app.domain.models.time_record import TimeRecord, get_local_time
 from app.schemas.time_record import TimeRecordUpdate
 
+COPY_COLUMNS = [
+    "user_id", "record_type", "record_datetime", "ip_address", "device_name", "platform", "is_time_verified",
+    "biometric_id", "is_manual", "edited_by", "edit_justification", "edit_reason", "is_synced", "created_at",
+    "updated_at"
+]
+
 
 class TimeRecordRepository:
     def create(self, db: Session, user_id: int, record_type: RecordType, record_datetime: datetime,
                ip_address: Optional[str] = None, device_name: Optional[str] = None, platform: Optional[str] = None,
-               is_time_verified: bool = False, biometric_id: Optional[int] = None) -> TimeRecord:
+               is_time_verified: bool = False, biometric_id: Optional[int] = None, is_manual: bool = False,
+               edited_by: Optional[int] = None, edit_justification: Optional[EditJustification] = None,
+               edit_reason: Optional[str] = None) -> TimeRecord:
         db_record = TimeRecord(
             user_id=user_id,
             record_type=record_type,
@@ -21,13 +33,76 @@ class TimeRecordRepository:
             device_name=device_name,
             platform=platform,
             is_time_verified=is_time_verified,
-            biometric_id=biometric_id
+            biometric_id=biometric_id,
+            is_manual=is_manual,
+            edited_by=edited_by,
+            edit_justification=edit_justification,
+            edit_reason=edit_reason
         )
         db.add(db_record)
-        db.commit()
-        db.refresh(db_record)
+        commit_or_flush(db, db_record)
         return db_record
 
+    def bulk_create(self, db: Session, records: List[dict]) -> List[int]:
+        if not records:
+            return []
+
+        if db.get_bind().dialect.insert_executemany_returning:
+            stmt = insert(TimeRecord).returning(TimeRecord.id, sort_by_parameter_order=True)
+            record_ids = list(db.scalars(stmt, records))
+        else:
+            db_records = [TimeRecord(**data) for data in records]
+            db.add_all(db_records)
+            db.flush()
+            record_ids = [r.id for r in db_records]
+
+        commit_or_flush(db)
+        return record_ids
+
+    def copy_import(self, db: Session, records: List[dict]) -> int:
+        if not records:
+            return 0
+
+        bind = db.get_bind()
+        if bind.dialect.name != "postgresql":
+            return len(self.bulk_create(db, records))
+
+        now = get_local_time()
+        defaults = {"is_time_verified": False, "is_manual": False, "is_synced": False, "created_at": now,
+                    "updated_at": now}
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for data in records:
+            row = {**defaults, **data}
+            writer.writerow([self._to_copy_value(row.get(column)) for column in COPY_COLUMNS])
+
+        sql = f"COPY time_records ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        cursor = db.connection().connection.cursor()
+        try:
+            if bind.dialect.driver == "psycopg":
+                with cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+            else:
+                buffer.seek(0)
+                cursor.copy_expert(sql, buffer)
+        finally:
+            cursor.close()
+
+        commit_or_flush(db)
+        return len(records)
+
+    def _to_copy_value(self, value):
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, enum.Enum):
+            return value.value
+        return value
+
     def get(self, db: Session, record_id: int) -> TimeRecord | None:
         return db.query(TimeRecord).filter(TimeRecord.id == record_id).first()
 
@@ -39,6 +114,15 @@ class TimeRecordRepository:
         return db.query(TimeRecord).filter(TimeRecord.user_id == user_id).order_by(
             desc(TimeRecord.record_datetime)).offset(skip).limit(limit).all()
 
+    def get_device_sequences(self, db: Session, device_id: int, sequences: List[int]) -> Set[int]:
+        if not sequences:
+            return set()
+        rows = db.query(TimeRecord.device_sequence).filter(
+            TimeRecord.device_id == device_id,
+            TimeRecord.device_sequence.in_(sequences)
+        ).all()
+        return {row[0] for row in rows}
+
     def get_by_range(self, db: Session, user_id: int, start_date: datetime, end_date: datetime) -> list[TimeRecord]:
         return db.query(TimeRecord).filter(
             and_(
@@ -58,6 +142,63 @@ class TimeRecordRepository:
             )
         ).order_by(TimeRecord.record_datetime).all()
 
+    def get_report_rows_by_users(self, db: Session, user_ids: List[int], start_date: datetime,
+                                 end_date: datetime) -> List[tuple]:
+        return db.query(
+            TimeRecord.user_id, TimeRecord.id, TimeRecord.record_datetime, TimeRecord.record_type,
+            TimeRecord.ip_address, TimeRecord.device_name, TimeRecord.platform, TimeRecord.is_manual,
+            TimeRecord.is_time_verified, TimeRecord.biometric_id, TimeRecord.original_timestamp,
+            TimeRecord.edited_by, TimeRecord.edit_justification, TimeRecord.edit_reason
+        ).filter(
+            TimeRecord.user_id.in_(user_ids),
+            TimeRecord.record_datetime >= start_date,
+            TimeRecord.record_datetime <= end_date
+        ).order_by(TimeRecord.user_id, TimeRecord.record_datetime, TimeRecord.id).all()
+
+    def get_punches_by_range(self, db: Session, start_date: datetime, end_date: datetime,
+                             user_ids: Optional[List[int]] = None) -> List[Tuple[int, datetime, RecordType]]:
+        query = db.query(TimeRecord.user_id, TimeRecord.record_datetime, TimeRecord.record_type).filter(
+            TimeRecord.record_datetime >= start_date,
+            TimeRecord.record_datetime <= end_date
+        )
+        if user_ids is not None:
+            query = query.filter(TimeRecord.user_id.in_(user_ids))
+        return [tuple(row) for row in query.order_by(TimeRecord.user_id, TimeRecord.record_datetime).all()]
+
+    def get_user_date_bounds(self, db: Session, user_id: int) -> Tuple[Optional[date], Optional[date]]:
+        first, last = db.query(func.min(TimeRecord.record_datetime), func.max(TimeRecord.record_datetime)).filter(
+            TimeRecord.user_id == user_id
+        ).one()
+        return (first.date() if first else None), (last.date() if last else None)
+
+    def get_first_datetime(self, db: Session) -> datetime | None:
+        return db.query(func.min(TimeRecord.record_datetime)).scalar()
+
+    def get_unsynced(self, db: Session) -> List[TimeRecord]:
+        return db.query(TimeRecord).filter(TimeRecord.is_synced.is_(False)).order_by(TimeRecord.id).all()
+
+    def mark_as_synced(self, db: Session, record_ids: List[int]) -> int:
+        if not record_ids:
+            return 0
+        result = db.execute(
+            update(TimeRecord).where(TimeRecord.id.in_(record_ids)).values(is_synced=True),
+            execution_options={"synchronize_session": False}
+        )
+        commit_or_flush(db)
+        return result.rowcount
+
+    def get_user_ids_in_range(self, db: Session, start_date: datetime, end_date: datetime,
+                              user_id: Optional[int] = None) -> Set[int]:
+        query = db.query(distinct(TimeRecord.user_id)).filter(
+            and_(
+                TimeRecord.record_datetime >= start_date,
+                TimeRecord.record_datetime <= end_date
+            )
+        )
+        if user_id is not None:
+            query = query.filter(TimeRecord.user_id == user_id)
+        return {row[0] for row in query.all()}
+
     def count_unique_users_in_range(self, db: Session, start_date: datetime, end_date: datetime) -> int:
         return db.query(func.count(distinct(TimeRecord.user_id))).filter(
             and_(
@@ -66,19 +207,22 @@ class TimeRecordRepository:
             )
         ).scalar()
 
-    def update(self, db: Session, db_obj: TimeRecord, obj_in: TimeRecordUpdate) -> TimeRecord:
-        update_data = obj_in.model_dump(exclude_unset=True)
+    def update(self, db: Session, db_obj: TimeRecord, obj_in: TimeRecordUpdate | dict) -> TimeRecord:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
         for field, value in update_data.items():
             setattr(db_obj, field, value)
 
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db, db_obj)
         return db_obj
 
     def delete(self, db: Session, record_id: int):
         db.query(TimeRecord).filter(TimeRecord.id == record_id).delete()
-        db.commit()
+        commit_or_flush(db)
 
 
 time_record_repository = TimeRecordRepository()
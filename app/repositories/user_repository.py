@@ -4,6 +4,7 @@ from sqlalchemy import asc, desc, or_
 from sqlalchemy.orm import Session
 
 from app.core.security import get_password_hash
+from app.database.unit_of_work import commit_or_flush
 from app.domain.models.biometric import UserBiometric
 from app.domain.models.user import User, WorkSchedule
 from app.schemas.user import UserUpdate
@@ -102,8 +103,7 @@ class UserRepository:
             db_obj.biometrics = new_biometrics_list
 
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db, db_obj)
         return db_obj
 
 
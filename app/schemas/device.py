@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, Any
+from typing import Optional, Any, List
 
 from pydantic import BaseModel, Field
 
@@ -16,6 +16,28 @@ class DevicePunchRequest(BaseModel):
     sensor_index: int
 
 
+class DevicePunchBatchItem(BaseModel):
+    sensor_index: int
+    timestamp: datetime
+    sequence: int = Field(..., ge=0)
+
+
+class DevicePunchBatchRequest(BaseModel):
+    punches: List[DevicePunchBatchItem] = Field(..., min_length=1, max_length=5000)
+
+
+class DevicePunchBatchRejection(BaseModel):
+    sequence: int
+    reason: str
+
+
+class DevicePunchBatchResponse(BaseModel):
+    accepted: int
+    duplicates: List[int]
+    rejected: List[DevicePunchBatchRejection]
+    last_sequence: int
+
+
 class DeviceActions(BaseModel):
     buzzer_pattern: int
     buzzer_duration_ms: int
@@ -6,6 +6,7 @@ from pydantic import BaseModel
 class HolidayBase(BaseModel):
     date: date
     name: str
+    is_recurring: bool = False
 
 
 class HolidayCreate(HolidayBase):
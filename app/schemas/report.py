@@ -1,7 +1,9 @@
 from datetime import date, datetime
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.domain.models.enums import ReportJobType, ReportJobStatus
 
 
 class PunchDetail(BaseModel):
@@ -80,3 +82,23 @@ class DashboardMetricsResponse(BaseModel):
     pending_adjustments: int
     employees_present_today: int
     date: date
+
+
+class ReportJobCreate(BaseModel):
+    job_type: ReportJobType
+    month: Optional[int] = Field(None, ge=1, le=12)
+    year: Optional[int] = Field(None, ge=2000)
+    employee_ids: Optional[List[int]] = None
+
+
+class ReportJobResponse(BaseModel):
+    id: str
+    job_type: ReportJobType
+    status: ReportJobStatus
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result_filename: Optional[str] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
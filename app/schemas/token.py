@@ -2,11 +2,22 @@ from typing import Optional
 
 from pydantic import BaseModel
 
+from app.domain.models.enums import UserRole
+
 
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
 
 
 class TokenPayload(BaseModel):
     sub: Optional[str] = None
+    type: Optional[str] = None
+    iat: Optional[float] = None
+    role: Optional[UserRole] = None
+    active: Optional[bool] = None
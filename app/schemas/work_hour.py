@@ -13,3 +13,23 @@ class WorkHourBalanceResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class HourBankBalanceResponse(BaseModel):
+    user_id: int
+    start_date: date
+    end_date: date
+    total_worked_hours: float
+    credited_hours: float
+    expected_hours: float
+    balance_hours: float
+
+
+class HourBankMonthResponse(BaseModel):
+    month: int
+    year: int
+    total_worked_hours: float
+    credited_hours: float
+    expected_hours: float
+    balance_hours: float
+    accumulated_balance_hours: float
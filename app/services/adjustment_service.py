@@ -7,20 +7,28 @@ from fastapi import UploadFile, HTTPException
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.database.unit_of_work import unit_of_work
 from app.domain.models.adjustment import AdjustmentRequest
 from app.domain.models.enums import AdjustmentStatus, AdjustmentType, RecordType
 from app.repositories.adjustment_repository import adjustment_repository
 from app.repositories.time_record_repository import time_record_repository
 from app.schemas.adjustment import AdjustmentRequestCreate, AdjustmentRequestUpdate, AdjustmentWaiverCreate
+from app.services.anomaly_service import anomaly_service
 from app.services.audit_service import audit_service
+from app.services.dashboard_service import dashboard_service
+from app.services.event_bus import event_bus
+from app.services.hour_bank_service import hour_bank_service
 from app.services.payroll_service import payroll_service
+from app.services.punch_state import punch_state
 
 
 class AdjustmentService:
     def create_adjustment_request(self, db: Session, user_id: int,
                                   obj_in: AdjustmentRequestCreate) -> AdjustmentRequest:
         payroll_service.validate_period_open(db, obj_in.target_date)
-        return adjustment_repository.create(db, user_id, obj_in)
+        adjustment = adjustment_repository.create(db, user_id, obj_in)
+        dashboard_service.on_pending_changed(1)
+        return adjustment
 
     def create_manager_waiver(self, db: Session, waiver_in: AdjustmentWaiverCreate,
                               manager_id: int) -> AdjustmentRequest:
@@ -33,20 +41,22 @@ class AdjustmentService:
             amount_hours=waiver_in.amount_hours
         )
 
-        adjustment = adjustment_repository.create(db, waiver_in.user_id, adj_in)
-        adjustment = adjustment_repository.update_status(
-            db, adjustment, AdjustmentStatus.APPROVED, manager_id, "Abonado manualmente pelo gestor"
-        )
+        with unit_of_work(db):
+            adjustment = adjustment_repository.create(db, waiver_in.user_id, adj_in)
+            adjustment = adjustment_repository.update_status(
+                db, adjustment, AdjustmentStatus.APPROVED, manager_id, "Abonado manualmente pelo gestor"
+            )
 
-        audit_service.log(
-            db, actor_id=manager_id, target_user_id=waiver_in.user_id, action="CREATE_WAIVER",
-            entity="ADJUSTMENT", entity_id=adjustment.id,
-            new_data={
-                "target_date": str(waiver_in.target_date),
-                "amount_hours": waiver_in.amount_hours,
-                "reason": waiver_in.reason_text
-            }
-        )
+            audit_service.log(
+                db, actor_id=manager_id, target_user_id=waiver_in.user_id, action="CREATE_WAIVER",
+                entity="ADJUSTMENT", entity_id=adjustment.id,
+                new_data={
+                    "target_date": str(waiver_in.target_date),
+                    "amount_hours": waiver_in.amount_hours,
+                    "reason": waiver_in.reason_text
+                }
+            )
+            hour_bank_service.refresh_user_days(db, [(waiver_in.user_id, waiver_in.target_date)])
         return adjustment
 
     def delete_adjustment(self, db: Session, adjustment_id: int, manager_id: int):
@@ -57,17 +67,23 @@ class AdjustmentService:
         payroll_service.validate_period_open(db, request.target_date)
 
         target_user_id = request.user_id
+        old_target_date = request.target_date
+        was_pending = request.status == AdjustmentStatus.PENDING
         old_data = {
             "type": request.adjustment_type.value,
             "target_date": str(request.target_date)
         }
 
-        adjustment_repository.delete(db, adjustment_id)
+        with unit_of_work(db):
+            adjustment_repository.delete(db, adjustment_id)
 
-        audit_service.log(
-            db, actor_id=manager_id, target_user_id=target_user_id, action="DELETE_ADJUSTMENT",
-            entity="ADJUSTMENT", entity_id=adjustment_id, old_data=old_data
-        )
+            audit_service.log(
+                db, actor_id=manager_id, target_user_id=target_user_id, action="DELETE_ADJUSTMENT",
+                entity="ADJUSTMENT", entity_id=adjustment_id, old_data=old_data
+            )
+            hour_bank_service.refresh_user_days(db, [(target_user_id, old_target_date)])
+        if was_pending:
+            dashboard_service.on_pending_changed(-1)
 
     def upload_attachment(self, db: Session, request_id: int, file: UploadFile, user_id: int):
         request = adjustment_repository.get(db, request_id)
@@ -114,13 +130,14 @@ class AdjustmentService:
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
 
-        attachment = adjustment_repository.create_attachment(db, request_id, file_path, file.content_type)
+        with unit_of_work(db):
+            attachment = adjustment_repository.create_attachment(db, request_id, file_path, file.content_type)
 
-        audit_service.log(
-            db, actor_id=user_id, target_user_id=request.user_id, action="UPLOAD_ATTACHMENT",
-            entity="ADJUSTMENT", entity_id=request_id,
-            new_data={"file_name": safe_filename, "file_type": file.content_type}
-        )
+            audit_service.log(
+                db, actor_id=user_id, target_user_id=request.user_id, action="UPLOAD_ATTACHMENT",
+                entity="ADJUSTMENT", entity_id=request_id,
+                new_data={"file_name": safe_filename, "file_type": file.content_type}
+            )
         return attachment
 
     def approve_adjustment(self, db: Session, request_id: int, manager_id: int) -> AdjustmentRequest:
@@ -137,38 +154,64 @@ class AdjustmentService:
                     detail="Para aprovar um atestado, é obrigatório informar a quantidade de horas a abonar."
                 )
 
-        if request.adjustment_type in [AdjustmentType.MISSING_ENTRY, AdjustmentType.MISSING_EXIT, AdjustmentType.BOTH]:
-            self._create_punches_from_adjustment(db, request)
-
         old_status = request.status.value
-        updated = adjustment_repository.update_status(db, request, AdjustmentStatus.APPROVED, manager_id)
+        punches = []
 
-        audit_service.log(
-            db, actor_id=manager_id, target_user_id=request.user_id, action="APPROVE_ADJUSTMENT",
-            entity="ADJUSTMENT", entity_id=request_id,
-            old_data={"status": old_status}, new_data={"status": updated.status.value}
-        )
+        with unit_of_work(db):
+            if request.adjustment_type in [AdjustmentType.MISSING_ENTRY, AdjustmentType.MISSING_EXIT,
+                                           AdjustmentType.BOTH]:
+                punches = self._create_punches_from_adjustment(db, request)
+
+            updated = adjustment_repository.update_status(db, request, AdjustmentStatus.APPROVED, manager_id)
+
+            audit_service.log(
+                db, actor_id=manager_id, target_user_id=request.user_id, action="APPROVE_ADJUSTMENT",
+                entity="ADJUSTMENT", entity_id=request_id,
+                old_data={"status": old_status}, new_data={"status": updated.status.value}
+            )
+            hour_bank_service.refresh_user_days(db, [(request.user_id, request.target_date)])
+
+        if old_status == AdjustmentStatus.PENDING.value:
+            dashboard_service.on_pending_changed(-1)
+        if punches:
+            punch_state.invalidate(request.user_id)
+        for record_id, (record_type, record_datetime) in punches:
+            dashboard_service.on_punch(request.user_id, record_datetime)
+            event_bus.publish("punch", {
+                "action": "CREATED",
+                "id": record_id,
+                "user_id": request.user_id,
+                "record_type": record_type,
+                "record_datetime": record_datetime
+            })
         return updated
 
     def _create_punches_from_adjustment(self, db: Session, request: AdjustmentRequest):
         user_id = request.user_id
         target_date = request.target_date
+        punches = []
 
         if request.adjustment_type in [AdjustmentType.MISSING_ENTRY, AdjustmentType.BOTH]:
             if request.entry_time:
-                entry_dt = datetime.combine(target_date, request.entry_time)
-                time_record_repository.create(
-                    db, user_id=user_id, record_type=RecordType.ENTRY,
-                    record_datetime=entry_dt, ip_address="ADJUSTMENT_APPROVED", is_time_verified=True
-                )
+                punches.append((RecordType.ENTRY, datetime.combine(target_date, request.entry_time)))
 
         if request.adjustment_type in [AdjustmentType.MISSING_EXIT, AdjustmentType.BOTH]:
             if request.exit_time:
-                exit_dt = datetime.combine(target_date, request.exit_time)
-                time_record_repository.create(
-                    db, user_id=user_id, record_type=RecordType.EXIT,
-                    record_datetime=exit_dt, ip_address="ADJUSTMENT_APPROVED", is_time_verified=True
-                )
+                punches.append((RecordType.EXIT, datetime.combine(target_date, request.exit_time)))
+
+        record_ids = time_record_repository.bulk_create(db, [
+            {
+                "user_id": user_id,
+                "record_type": record_type,
+                "record_datetime": record_datetime,
+                "ip_address": "ADJUSTMENT_APPROVED",
+                "is_time_verified": True
+            }
+            for record_type, record_datetime in punches
+        ])
+        anomaly_service.refresh_user_days(db, [(user_id, target_date)])
+        hour_bank_service.refresh_user_days(db, [(user_id, target_date)])
+        return list(zip(record_ids, punches))
 
     def reject_adjustment(self, db: Session, request_id: int, manager_id: int, comment: str) -> AdjustmentRequest:
         request = adjustment_repository.get(db, request_id)
@@ -178,13 +221,20 @@ class AdjustmentService:
         payroll_service.validate_period_open(db, request.target_date)
 
         old_status = request.status.value
-        updated = adjustment_repository.update_status(db, request, AdjustmentStatus.REJECTED, manager_id, comment)
 
-        audit_service.log(
-            db, actor_id=manager_id, target_user_id=request.user_id, action="REJECT_ADJUSTMENT",
-            entity="ADJUSTMENT", entity_id=request_id,
-            old_data={"status": old_status}, new_data={"status": updated.status.value, "comment": comment}
-        )
+        with unit_of_work(db):
+            updated = adjustment_repository.update_status(db, request, AdjustmentStatus.REJECTED, manager_id,
+                                                          comment)
+
+            audit_service.log(
+                db, actor_id=manager_id, target_user_id=request.user_id, action="REJECT_ADJUSTMENT",
+                entity="ADJUSTMENT", entity_id=request_id,
+                old_data={"status": old_status}, new_data={"status": updated.status.value, "comment": comment}
+            )
+            hour_bank_service.refresh_user_days(db, [(request.user_id, request.target_date)])
+
+        if old_status == AdjustmentStatus.PENDING.value:
+            dashboard_service.on_pending_changed(-1)
         return updated
 
     def update_adjustment(self, db: Session, request_id: int, obj_in: AdjustmentRequestUpdate,
@@ -197,25 +247,31 @@ class AdjustmentService:
         if obj_in.target_date:
             payroll_service.validate_period_open(db, obj_in.target_date)
 
+        old_target_date = request.target_date
         old_data = {
             "adjustment_type": request.adjustment_type.value,
             "target_date": str(request.target_date),
             "amount_hours": request.amount_hours
         }
 
-        updated = adjustment_repository.update(db, request, obj_in)
+        with unit_of_work(db):
+            updated = adjustment_repository.update(db, request, obj_in)
 
-        new_data = {
-            "adjustment_type": updated.adjustment_type.value,
-            "target_date": str(updated.target_date),
-            "amount_hours": updated.amount_hours
-        }
+            new_data = {
+                "adjustment_type": updated.adjustment_type.value,
+                "target_date": str(updated.target_date),
+                "amount_hours": updated.amount_hours
+            }
 
-        audit_service.log(
-            db, actor_id=manager_id, target_user_id=request.user_id, action="UPDATE_ADJUSTMENT",
-            entity="ADJUSTMENT", entity_id=request_id,
-            old_data=old_data, new_data=new_data
-        )
+            audit_service.log(
+                db, actor_id=manager_id, target_user_id=request.user_id, action="UPDATE_ADJUSTMENT",
+                entity="ADJUSTMENT", entity_id=request_id,
+                old_data=old_data, new_data=new_data
+            )
+            hour_bank_service.refresh_user_days(db, [
+                (request.user_id, old_target_date),
+                (request.user_id, updated.target_date)
+            ])
         return updated
 
 
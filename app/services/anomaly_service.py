@@ -1,138 +1,183 @@
-from datetime import date, datetime
-from typing import List, Dict, Optional
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Iterable, Tuple
+from zoneinfo import ZoneInfo
 
+import numpy as np
 from sqlalchemy.orm import Session
 
-from app.domain.models.enums import RecordType, UserRole
-from app.domain.models.user import User
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.database.unit_of_work import unit_of_work, after_commit
+from app.domain.models.routine_log import RoutineLog
+from app.repositories.anomaly_repository import anomaly_repository
 from app.repositories.time_record_repository import time_record_repository
 from app.schemas.anomaly import AnomalyResponse
+from app.services.event_bus import event_bus
+from app.services.pairing_kernel import pair_punches, to_columns
+
+logger = logging.getLogger(__name__)
 
 
 class AnomalyService:
+    def __init__(self):
+        self._reconcile_lock = threading.Lock()
+
     def _format_duration(self, total_seconds: float) -> str:
         total_minutes = int(round(total_seconds / 60))
         hours = total_minutes // 60
         minutes = total_minutes % 60
         return f"{hours}h{minutes:02d}"
 
-    def _check_day_anomalies(self, user_id: int, user_name: str, current_date: date, records: List) -> List[
-        AnomalyResponse]:
-        anomalies = []
-        records.sort(key=lambda x: x.record_datetime)
+    def _detect(self, rows: List[Tuple], user_days: Optional[set] = None) -> List[dict]:
+        if user_days is not None:
+            rows = [r for r in rows if (r[0], r[1].date()) in user_days]
 
-        total_worked_seconds = 0.0
-        last_entry_time = None
+        result = pair_punches(to_columns(rows))
+        if not len(result.group_starts):
+            return []
 
-        if records and records[0].record_type == RecordType.EXIT:
-            anomalies.append(AnomalyResponse(
-                user_id=user_id,
-                user_name=user_name,
-                date=current_date,
-                type="MISSING_ENTRY",
-                description="Saída sem entrada"
-            ))
-
-        for i in range(len(records)):
-            current_record = records[i]
-
-            if i > 0 and current_record.record_type == RecordType.ENTRY and records[
-                i - 1].record_type == RecordType.ENTRY:
-                anomalies.append(AnomalyResponse(
-                    user_id=user_id,
-                    user_name=user_name,
-                    date=current_date,
-                    type="DOUBLE_ENTRY",
-                    description="Duas entradas consecutivas sem saída entre elas"
-                ))
-
-            if i > 0 and current_record.record_type == RecordType.EXIT and records[
-                i - 1].record_type == RecordType.EXIT:
-                anomalies.append(AnomalyResponse(
-                    user_id=user_id,
-                    user_name=user_name,
-                    date=current_date,
-                    type="DOUBLE_EXIT",
-                    description="Duas saídas consecutivas sem entrada entre elas"
-                ))
-
-            if current_record.record_type == RecordType.ENTRY:
-                last_entry_time = current_record.record_datetime
-            elif current_record.record_type == RecordType.EXIT:
-                if last_entry_time:
-                    delta = current_record.record_datetime - last_entry_time
-                    seconds = delta.total_seconds()
-
-                    if seconds > 8 * 3600:
-                        fmt_time = self._format_duration(seconds)
-                        anomalies.append(AnomalyResponse(
-                            user_id=user_id,
-                            user_name=user_name,
-                            date=current_date,
-                            type="LONG_INTERVAL",
-                            description=f"Intervalo de {fmt_time}"
-                        ))
-
-                    total_worked_seconds += seconds
-                    last_entry_time = None
-
-        if records and records[-1].record_type == RecordType.ENTRY:
-            anomalies.append(AnomalyResponse(
-                user_id=user_id,
-                user_name=user_name,
-                date=current_date,
-                type="MISSING_EXIT",
-                description="Entrada sem saída"
-            ))
-
-        if total_worked_seconds > (10 * 3600):
-            fmt_total = self._format_duration(total_worked_seconds)
-            anomalies.append(AnomalyResponse(
-                user_id=user_id,
-                user_name=user_name,
-                date=current_date,
-                type="EXCESSIVE_HOURS",
-                description=f"Trabalhou {fmt_total}"
-            ))
+        long_interval = result.pair_seconds > 8 * 3600
+        excessive = result.worked_seconds > 10 * 3600
+        row_events = np.flatnonzero(result.double_entry | result.double_exit | long_interval)
+        row_groups = np.searchsorted(result.group_starts, row_events, side="right") - 1
 
-        return anomalies
+        flagged = result.missing_entry | result.missing_exit | excessive
+        flagged[row_groups] = True
 
-    def get_anomalies(self, db: Session, start_date: date, end_date: date, user_id: Optional[int] = None) -> List[
-        AnomalyResponse]:
-        query = db.query(User).filter(User.is_active.is_(True), User.role == UserRole.EMPLOYEE)
-        if user_id:
-            query = query.filter(User.id == user_id)
-        users = query.all()
+        anomalies = []
+        cursor = 0
+        for group in np.flatnonzero(flagged).tolist():
+            user_id = int(result.group_users[group])
+            current_date = date.fromordinal(int(result.group_days[group]))
+
+            def add(anomaly_type: str, description: str):
+                anomalies.append({
+                    "user_id": user_id,
+                    "date": current_date,
+                    "type": anomaly_type,
+                    "description": description
+                })
+
+            if result.missing_entry[group]:
+                add("MISSING_ENTRY", "Saída sem entrada")
+
+            while cursor < len(row_events) and row_groups[cursor] == group:
+                row = row_events[cursor]
+                if result.double_entry[row]:
+                    add("DOUBLE_ENTRY", "Duas entradas consecutivas sem saída entre elas")
+                elif result.double_exit[row]:
+                    add("DOUBLE_EXIT", "Duas saídas consecutivas sem entrada entre elas")
+                else:
+                    add("LONG_INTERVAL", f"Intervalo de {self._format_duration(result.pair_seconds[row])}")
+                cursor += 1
+
+            if result.missing_exit[group]:
+                add("MISSING_EXIT", "Entrada sem saída")
+
+            if excessive[group]:
+                add("EXCESSIVE_HOURS", f"Trabalhou {self._format_duration(result.worked_seconds[group])}")
 
-        all_anomalies = []
+        return anomalies
 
-        target_user_ids = [u.id for u in users]
-        if not target_user_ids:
-            return []
+    def refresh_user_days(self, db: Session, user_days: Iterable[Tuple[int, date]]):
+        user_days = {(uid, day.date() if isinstance(day, datetime) else day) for uid, day in user_days}
+        if not user_days:
+            return
 
-        dt_start = datetime.combine(start_date, datetime.min.time())
-        dt_end = datetime.combine(end_date, datetime.max.time())
+        user_ids = sorted({uid for uid, _ in user_days})
+        dt_start = datetime.combine(min(day for _, day in user_days), datetime.min.time())
+        dt_end = datetime.combine(max(day for _, day in user_days), datetime.max.time())
 
-        records_flat = time_record_repository.get_by_users_and_range(db, target_user_ids, dt_start, dt_end)
+        rows = time_record_repository.get_punches_by_range(db, dt_start, dt_end, user_ids)
+        detected = self._detect(rows, user_days)
 
-        records_map: Dict[int, Dict[date, List]] = {uid: {} for uid in target_user_ids}
+        if event_bus.has_subscribers():
+            known = {
+                (a.user_id, a.date, a.type, a.description)
+                for a in anomaly_repository.get_for_user_days(db, user_days)
+            }
+            new_anomalies = [
+                a for a in detected if (a["user_id"], a["date"], a["type"], a["description"]) not in known
+            ]
+            def publish_new():
+                for anomaly in new_anomalies:
+                    event_bus.publish("anomaly", anomaly)
 
-        for record in records_flat:
-            uid = record.user_id
-            rdate = record.record_datetime.date()
-            if rdate not in records_map[uid]:
-                records_map[uid][rdate] = []
-            records_map[uid][rdate].append(record)
-        user_map = {u.id: u.name for u in users}
+            if new_anomalies:
+                after_commit(db, publish_new)
 
-        for uid in target_user_ids:
-            user_name = user_map.get(uid, "Unknown")
-            for rdate, day_records in records_map[uid].items():
-                day_anomalies = self._check_day_anomalies(uid, user_name, rdate, day_records)
-                all_anomalies.extend(day_anomalies)
+        anomaly_repository.replace_for_user_days(db, user_days, detected)
 
-        all_anomalies.sort(key=lambda x: x.date, reverse=True)
-        return all_anomalies
+    def rebuild(self, db: Session, start_date: date, end_date: date) -> int:
+        dt_start = datetime.combine(start_date, datetime.min.time())
+        dt_end = datetime.combine(end_date, datetime.max.time())
+
+        rows = self._detect(time_record_repository.get_punches_by_range(db, dt_start, dt_end))
+        anomaly_repository.replace_range(db, start_date, end_date, rows)
+        return len(rows)
+
+    def reconcile_anomalies(self):
+        if not self._reconcile_lock.acquire(blocking=False):
+            return
+        try:
+            now_local = datetime.now(ZoneInfo(settings.TIMEZONE)).replace(tzinfo=None)
+            today = now_local.date()
+
+            db = SessionLocal()
+            try:
+                ran_today = db.query(RoutineLog).filter(
+                    RoutineLog.routine_type == "RECALC_ANOMALIES",
+                    RoutineLog.status == "SUCCESS",
+                    RoutineLog.target_date == today
+                ).first()
+                if ran_today:
+                    return
+
+                has_run = db.query(RoutineLog).filter(
+                    RoutineLog.routine_type == "RECALC_ANOMALIES",
+                    RoutineLog.status == "SUCCESS"
+                ).first()
+
+                start_date = today - timedelta(days=7)
+                if not has_run:
+                    first_record = time_record_repository.get_first_datetime(db)
+                    if first_record:
+                        start_date = min(start_date, first_record.date())
+
+                with unit_of_work(db):
+                    total = self.rebuild(db, start_date, today)
+                    db.add(RoutineLog(
+                        routine_type="RECALC_ANOMALIES",
+                        target_date=today,
+                        status="SUCCESS",
+                        execution_time=now_local,
+                        details=f"{total} anomalias entre {start_date} e {today}"
+                    ))
+
+                if not has_run:
+                    logger.info(f"Anomalias recalculadas desde {start_date}: {total} registros.")
+            except Exception as e:
+                logger.error(f"Erro ao recalcular anomalias: {e}")
+            finally:
+                db.close()
+        finally:
+            self._reconcile_lock.release()
+
+    def get_anomalies(self, db: Session, start_date: date, end_date: date, user_id: Optional[int] = None,
+                      types: Optional[List[str]] = None) -> List[AnomalyResponse]:
+        rows = anomaly_repository.get_by_range(db, start_date, end_date, user_id=user_id, types=types)
+        return [
+            AnomalyResponse(
+                user_id=anomaly.user_id,
+                user_name=user_name,
+                date=anomaly.date,
+                type=anomaly.type,
+                description=anomaly.description
+            )
+            for anomaly, user_name in rows
+        ]
 
 
 anomaly_service = AnomalyService()
@@ -1,13 +1,35 @@
-from datetime import datetime
-from typing import Optional, Any
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Any, List
+from zoneinfo import ZoneInfo
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.database.unit_of_work import after_commit
+from app.domain.models.audit import get_local_time
+from app.domain.models.enums import AuditDurability
+from app.domain.models.routine_log import RoutineLog
 from app.repositories.audit_repository import audit_repository
-from app.schemas.audit import AuditLogCreate
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_FAILURES = 3
 
 
 class AuditService:
+    def __init__(self):
+        self._buffer: List[dict] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._archive_lock = threading.Lock()
+        self._failures = 0
+
     def log(self, db: Session, action: str, entity: str,
             actor_id: Optional[int] = None, target_user_id: Optional[int] = None,
             entity_id: Optional[int] = None, old_data: Optional[Any] = None,
@@ -15,28 +37,153 @@ class AuditService:
             details: Optional[str] = None, actor_name: Optional[str] = None,
             target_user_name: Optional[str] = None, justification: Optional[str] = None,
             reason: Optional[str] = None, record_time: Optional[datetime] = None,
-            record_type: Optional[str] = None):
+            record_type: Optional[str] = None, durability: Optional[AuditDurability] = None):
         final_actor_id = actor_id if actor_id is not None else user_id
         final_user_id = user_id if user_id is not None else actor_id
 
-        obj_in = AuditLogCreate(
-            actor_id=final_actor_id,
-            target_user_id=target_user_id,
-            action=action,
-            entity=entity,
-            entity_id=entity_id,
-            old_data=old_data,
-            new_data=new_data,
-            user_id=final_user_id,
-            details=details,
-            actor_name=actor_name,
-            target_user_name=target_user_name,
-            justification=justification,
-            reason=reason,
-            record_time=record_time,
-            record_type=record_type
-        )
-        return audit_repository.create(db, obj_in)
+        entry = {
+            "actor_id": final_actor_id,
+            "target_user_id": target_user_id,
+            "action": action,
+            "entity": entity,
+            "entity_id": entity_id,
+            "old_data": old_data,
+            "new_data": new_data,
+            "user_id": final_user_id,
+            "details": details,
+            "actor_name": actor_name,
+            "target_user_name": target_user_name,
+            "justification": justification,
+            "reason": reason,
+            "record_time": record_time,
+            "record_type": record_type,
+            "timestamp": get_local_time()
+        }
+
+        if durability is None:
+            is_batched = action in settings.AUDIT_BATCHED_ACTIONS
+            durability = AuditDurability.BATCHED if is_batched else AuditDurability.SYNC
+
+        if durability == AuditDurability.BATCHED:
+            after_commit(db, lambda: self._enqueue(entry))
+            return None
+
+        return audit_repository.create(db, entry)
+
+    def _enqueue(self, entry: dict):
+        with self._buffer_lock:
+            self._buffer.append(entry)
+            buffered = len(self._buffer)
+
+        self._ensure_flusher()
+        if buffered >= settings.AUDIT_BATCH_SIZE:
+            self._wakeup.set()
+
+    def _ensure_flusher(self):
+        if self._flusher and self._flusher.is_alive():
+            return
+        with self._buffer_lock:
+            if self._flusher and self._flusher.is_alive():
+                return
+            self._stop.clear()
+            self._flusher = threading.Thread(target=self._run_flusher, name="audit-flusher", daemon=True)
+            self._flusher.start()
+
+    def _run_flusher(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(settings.AUDIT_FLUSH_INTERVAL_SECONDS)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+
+            if not batch:
+                return 0
+
+            db = SessionLocal()
+            try:
+                written = audit_repository.bulk_create(db, batch)
+                self._failures = 0
+                return written
+            except Exception as e:
+                db.rollback()
+                self._failures += 1
+                logger.error(f"Erro ao gravar lote de auditoria ({len(batch)} registros): {e}")
+                if self._failures < MAX_BATCH_FAILURES:
+                    with self._buffer_lock:
+                        self._buffer[:0] = batch
+                    return 0
+
+                self._failures = 0
+                return self._flush_rows(db, batch)
+            finally:
+                db.close()
+
+    def _flush_rows(self, db: Session, batch: List[dict]) -> int:
+        written = 0
+        for entry in batch:
+            try:
+                audit_repository.create(db, entry)
+                written += 1
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Registro de auditoria descartado ({entry['action']} {entry['entity']} "
+                             f"{entry['entity_id']}): {e}")
+        return written
+
+    def shutdown(self):
+        self._stop.set()
+        self._wakeup.set()
+        if self._flusher:
+            self._flusher.join(timeout=settings.AUDIT_FLUSH_INTERVAL_SECONDS + 5)
+        self.flush()
+
+    def archive_old_logs(self):
+        if not self._archive_lock.acquire(blocking=False):
+            return
+        try:
+            now_local = datetime.now(ZoneInfo(settings.TIMEZONE)).replace(tzinfo=None)
+            today = now_local.date()
+
+            db = SessionLocal()
+            try:
+                ran_today = db.query(RoutineLog).filter(
+                    RoutineLog.routine_type == "ARCHIVE_AUDIT_LOGS",
+                    RoutineLog.status == "SUCCESS",
+                    RoutineLog.target_date == today
+                ).first()
+                if ran_today:
+                    return
+
+                cutoff = datetime.combine(today - timedelta(days=settings.AUDIT_RETENTION_DAYS), datetime.min.time())
+                total = 0
+                while True:
+                    moved = audit_repository.archive_before(db, cutoff, settings.AUDIT_ARCHIVE_BATCH_SIZE)
+                    total += moved
+                    if moved < settings.AUDIT_ARCHIVE_BATCH_SIZE:
+                        break
+
+                db.add(RoutineLog(
+                    routine_type="ARCHIVE_AUDIT_LOGS",
+                    target_date=today,
+                    status="SUCCESS",
+                    execution_time=now_local,
+                    details=f"{total} registros arquivados"
+                ))
+                db.commit()
+
+                if total > 0:
+                    logger.info(f"Arquivamento de auditoria: {total} registros anteriores a {cutoff.date()} arquivados.")
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Erro ao arquivar audit_logs: {e}")
+            finally:
+                db.close()
+        finally:
+            self._archive_lock.release()
 
 
 audit_service = AuditService()
@@ -9,6 +9,7 @@ from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.utils import parseaddr, formataddr
+from time import perf_counter
 from typing import Dict, List, Tuple, Optional
 from zoneinfo import ZoneInfo
 
@@ -17,6 +18,8 @@ from sqlalchemy import desc
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.metrics import BACKUP_DURATION, BACKUP_SIZE
+from app.core.request_context import track_external
 from app.database.session import SessionLocal
 from app.domain.models.enums import RecordType
 from app.domain.models.routine_log import RoutineLog
@@ -32,7 +35,8 @@ class BackupService:
         self._manual_backup_lock = threading.Lock()
         self._cleanup_lock = threading.Lock()
 
-    def _create_safe_backup(self, source_db: str) -> Optional[str]:
+    def _create_safe_backup(self, source_db: str, kind: str = "email") -> Optional[str]:
+        started = perf_counter()
         try:
             tz = ZoneInfo(settings.TIMEZONE)
             timestamp = datetime.now(tz).strftime('%Y%m%d_%H%M%S')
@@ -47,6 +51,8 @@ class BackupService:
             dst_conn.close()
             src_conn.close()
 
+            BACKUP_DURATION.labels(kind).observe(perf_counter() - started)
+            BACKUP_SIZE.labels(kind).set(os.path.getsize(backup_filename))
             return backup_filename
         except Exception as e:
             logger.error(f"Erro backup SQLite: {e}")
@@ -159,13 +165,14 @@ class BackupService:
             if not settings.SMTP_HOST or not settings.SMTP_USER or not settings.SMTP_PASSWORD or not settings.SMTP_PORT:
                 return False
 
-            server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=60)
-            server.ehlo()
-            server.starttls()
-            server.ehlo()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.sendmail(msg['From'], msg['To'], msg.as_string())
-            server.quit()
+            with track_external("smtp"):
+                server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=60)
+                server.ehlo()
+                server.starttls()
+                server.ehlo()
+                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+                server.sendmail(msg['From'], msg['To'], msg.as_string())
+                server.quit()
             return True
 
         except Exception as e:
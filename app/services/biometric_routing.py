@@ -0,0 +1,56 @@
+import threading
+from typing import Dict, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from app.domain.models.biometric import UserBiometric
+from app.domain.models.user import User
+
+
+class BiometricRoute(NamedTuple):
+    biometric_id: int
+    user_id: int
+    is_active: bool
+    user_name: str
+
+
+class BiometricRouting:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Optional[Dict[int, BiometricRoute]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _build(self, db: Session) -> Dict[int, BiometricRoute]:
+        rows = db.query(
+            UserBiometric.sensor_index, UserBiometric.id, User.id, User.is_active, User.name
+        ).join(User, UserBiometric.user_id == User.id).filter(
+            UserBiometric.sensor_index.isnot(None)
+        ).order_by(UserBiometric.id).all()
+
+        routes = {}
+        for sensor_index, biometric_id, user_id, is_active, name in rows:
+            routes.setdefault(sensor_index, BiometricRoute(biometric_id, user_id, bool(is_active), name or ""))
+        return routes
+
+    def _load(self, db: Session) -> Dict[int, BiometricRoute]:
+        routes = self._routes
+        if routes is None:
+            with self._lock:
+                if self._routes is None:
+                    self.misses += 1
+                    self._routes = self._build(db)
+                routes = self._routes
+        else:
+            self.hits += 1
+        return routes
+
+    def resolve(self, db: Session, sensor_index: int) -> Optional[BiometricRoute]:
+        return self._load(db).get(sensor_index)
+
+    def invalidate(self):
+        with self._lock:
+            self._routes = None
+
+
+biometric_routing = BiometricRouting()
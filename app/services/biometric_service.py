@@ -3,10 +3,12 @@ from typing import List
 
 from sqlalchemy.orm import Session
 
+from app.database.unit_of_work import unit_of_work
 from app.domain.models.biometric import UserBiometric
 from app.domain.models.user import User
 from app.schemas.device import BiometricSyncData, EnrollResultPayload, BiometricSyncAck
 from app.services.audit_service import audit_service
+from app.services.biometric_routing import biometric_routing
 
 logger = logging.getLogger(__name__)
 
@@ -53,14 +55,15 @@ class BiometricService:
                 sensor_index=result.sensor_index,
                 finger_id=result.finger_id
             )
-            db.add(new_bio)
-            db.commit()
-            db.refresh(new_bio)
-
-            audit_service.log(
-                db, target_user_id=user.id, action="ENROLL", entity="BIOMETRIC",
-                entity_id=new_bio.id, new_data={"sensor_index": result.sensor_index, "finger_id": result.finger_id}
-            )
+            with unit_of_work(db):
+                db.add(new_bio)
+                db.flush()
+
+                audit_service.log(
+                    db, target_user_id=user.id, action="ENROLL", entity="BIOMETRIC",
+                    entity_id=new_bio.id, new_data={"sensor_index": result.sensor_index, "finger_id": result.finger_id}
+                )
+            biometric_routing.invalidate()
 
             return True, "Sucesso"
         except Exception as e:
@@ -0,0 +1,170 @@
+import logging
+import threading
+from datetime import datetime, date
+from typing import Optional, Set
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.domain.models.enums import UserRole
+from app.domain.models.user import User
+from app.repositories.adjustment_repository import adjustment_repository
+from app.repositories.time_record_repository import time_record_repository
+from app.schemas.report import DashboardMetricsResponse
+from app.services.event_bus import event_bus, RESYNC_EVENT
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardService:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active_employees: Optional[int] = None
+        self._pending_adjustments: Optional[int] = None
+        self._present_day: Optional[date] = None
+        self._present_users: Optional[Set[int]] = None
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _today(self) -> date:
+        return datetime.now(ZoneInfo(settings.TIMEZONE)).date()
+
+    def _count_active_employees(self, db: Session) -> int:
+        return db.query(User).filter(
+            User.is_active.is_(True),
+            User.role == UserRole.EMPLOYEE,
+            User.is_exempt_from_rules.is_(False)
+        ).count()
+
+    def _load_present_users(self, db: Session, today: date, user_id: Optional[int] = None) -> Set[int]:
+        tz = ZoneInfo(settings.TIMEZONE)
+        today_start = datetime.combine(today, datetime.min.time(), tzinfo=tz)
+        today_end = datetime.combine(today, datetime.max.time(), tzinfo=tz)
+        return time_record_repository.get_user_ids_in_range(db, today_start, today_end, user_id)
+
+    def get_metrics(self, db: Session) -> DashboardMetricsResponse:
+        today = self._today()
+        with self._lock:
+            version = self._version
+            active = self._active_employees
+            pending = self._pending_adjustments
+            present = self._present_users if self._present_day == today else None
+            if active is not None and pending is not None and present is not None:
+                self.hits += 1
+                return self._response(active, pending, len(present), today)
+            self.misses += 1
+
+        load_active, load_pending, load_present = active is None, pending is None, present is None
+        if load_active:
+            active = self._count_active_employees(db)
+        if load_pending:
+            pending = adjustment_repository.count_pending(db)
+        if load_present:
+            present = self._load_present_users(db, today)
+
+        with self._lock:
+            if self._version == version:
+                if load_active:
+                    self._active_employees = active
+                if load_pending:
+                    self._pending_adjustments = pending
+                if load_present:
+                    self._present_users = present
+                    self._present_day = today
+            return self._response(active, pending, len(present), today)
+
+    def _response(self, active: int, pending: int, present: int, today: date) -> DashboardMetricsResponse:
+        return DashboardMetricsResponse(
+            total_active_employees=active,
+            pending_adjustments=pending,
+            employees_present_today=present,
+            date=today
+        )
+
+    def _publish_presence(self, user_id: int, day: date, present: bool):
+        event_bus.publish("presence", {"user_id": user_id, "date": day, "present": present})
+
+    def on_punch(self, user_id: int, record_datetime: datetime):
+        if record_datetime.tzinfo is not None:
+            record_datetime = record_datetime.astimezone(ZoneInfo(settings.TIMEZONE))
+        day = record_datetime.date()
+        with self._lock:
+            if self._present_users is None or day != self._present_day:
+                self._version += 1
+                return
+            if user_id in self._present_users:
+                return
+            self._present_users.add(user_id)
+        self._publish_presence(user_id, day, True)
+
+    def refresh_presence(self, db: Session, user_id: int):
+        with self._lock:
+            day = self._present_day
+            if self._present_users is None:
+                self._version += 1
+                return
+
+        present = bool(self._load_present_users(db, day, user_id))
+        with self._lock:
+            if self._present_users is None or day != self._present_day:
+                return
+            if present == (user_id in self._present_users):
+                return
+            if present:
+                self._present_users.add(user_id)
+            else:
+                self._present_users.discard(user_id)
+        self._publish_presence(user_id, day, present)
+
+    def on_users_changed(self):
+        with self._lock:
+            self._active_employees = None
+            self._version += 1
+
+    def on_pending_changed(self, delta: int):
+        with self._lock:
+            if self._pending_adjustments is None:
+                self._version += 1
+                return
+            self._pending_adjustments = max(self._pending_adjustments + delta, 0)
+
+    def invalidate(self):
+        with self._lock:
+            self._active_employees = None
+            self._pending_adjustments = None
+            self._present_users = None
+            self._version += 1
+        event_bus.publish(RESYNC_EVENT, {})
+
+    def reconcile(self):
+        db = SessionLocal()
+        try:
+            today = self._today()
+            active = self._count_active_employees(db)
+            pending = adjustment_repository.count_pending(db)
+            present = self._load_present_users(db, today)
+
+            with self._lock:
+                drifted = (
+                    self._active_employees not in (None, active)
+                    or self._pending_adjustments not in (None, pending)
+                    or (self._present_day == today and self._present_users not in (None, present))
+                )
+                self._active_employees = active
+                self._pending_adjustments = pending
+                self._present_users = present
+                self._present_day = today
+                self._version += 1
+
+            if drifted:
+                logger.warning("Métricas do dashboard divergentes do banco; contadores recarregados.")
+        except Exception as e:
+            logger.error(f"Erro ao conciliar métricas do dashboard: {e}")
+        finally:
+            db.close()
+
+
+dashboard_service = DashboardService()
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import logging
+import threading
+from datetime import datetime, date
+from typing import Any, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RESYNC_EVENT = "resync"
+
+
+class Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_size: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.dropped = 0
+        self.closed = False
+
+    def deliver(self, event: str, payload: str):
+        if self.closed:
+            return
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait((RESYNC_EVENT, json.dumps({"dropped": self.dropped})))
+            return
+        self.queue.put_nowait((event, payload))
+
+    async def get(self, timeout: float) -> Optional[tuple]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: List[Subscription] = []
+
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Optional[Subscription]:
+        with self._lock:
+            if len(self._subscribers) >= settings.EVENT_STREAM_MAX_CONNECTIONS:
+                return None
+            subscription = Subscription(asyncio.get_running_loop(), settings.EVENT_STREAM_QUEUE_SIZE)
+            self._subscribers = self._subscribers + [subscription]
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.closed = True
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s is not subscription]
+
+    def publish(self, event: str, data: Any):
+        subscribers = self._subscribers
+        if not subscribers:
+            return
+
+        payload = json.dumps(data, default=self._serialize)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event, payload)
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+    def _serialize(self, value: Any):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if hasattr(value, "value"):
+            return value.value
+        return str(value)
+
+
+event_bus = EventBus()
@@ -0,0 +1,115 @@
+import threading
+from bisect import bisect_left, bisect_right
+from calendar import isleap
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.repositories.holiday_repository import holiday_repository
+
+
+class _CalendarData(NamedTuple):
+    dates: List[date]
+    date_set: Set[date]
+    recurring: Dict[Tuple[int, int], int]
+    recurring_overlaps: List[date]
+
+
+class HolidayCalendar:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Optional[_CalendarData] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _build(self, db: Session) -> _CalendarData:
+        fixed = set()
+        recurring: Dict[Tuple[int, int], int] = {}
+        for holiday in holiday_repository.get_all(db):
+            if holiday.is_recurring:
+                key = (holiday.date.month, holiday.date.day)
+                recurring[key] = min(recurring.get(key, holiday.date.year), holiday.date.year)
+            else:
+                fixed.add(holiday.date)
+
+        overlaps = sorted(d for d in fixed if self._recurs_on(recurring, d))
+        return _CalendarData(sorted(fixed), fixed, recurring, overlaps)
+
+    def _load(self, db: Session) -> _CalendarData:
+        data = self._data
+        if data is None:
+            with self._lock:
+                if self._data is None:
+                    self.misses += 1
+                    self._data = self._build(db)
+                data = self._data
+        else:
+            self.hits += 1
+        return data
+
+    def _recurs_on(self, recurring: Dict[Tuple[int, int], int], day: date) -> bool:
+        first_year = recurring.get((day.month, day.day))
+        return first_year is not None and day.year >= first_year
+
+    def _occurrences(self, month: int, day: int, first_year: int, start_date: date, end_date: date) -> int:
+        first = max(start_date.year, first_year)
+        last = end_date.year
+        if first > last:
+            return 0
+
+        if (month, day) == (2, 29):
+            count = self._leap_years_until(last) - self._leap_years_until(first - 1)
+        else:
+            count = last - first + 1
+
+        if first == start_date.year and (month, day) < (start_date.month, start_date.day):
+            count -= self._exists(first, month, day)
+        if (month, day) > (end_date.month, end_date.day):
+            count -= self._exists(last, month, day)
+        return count
+
+    def _leap_years_until(self, year: int) -> int:
+        return year // 4 - year // 100 + year // 400
+
+    def _exists(self, year: int, month: int, day: int) -> int:
+        return 0 if (month, day) == (2, 29) and not isleap(year) else 1
+
+    def is_holiday(self, db: Session, day: date) -> bool:
+        data = self._load(db)
+        return day in data.date_set or self._recurs_on(data.recurring, day)
+
+    def count_in_range(self, db: Session, start_date: date, end_date: date) -> int:
+        if start_date > end_date:
+            return 0
+
+        data = self._load(db)
+        fixed = bisect_right(data.dates, end_date) - bisect_left(data.dates, start_date)
+        overlaps = (bisect_right(data.recurring_overlaps, end_date)
+                    - bisect_left(data.recurring_overlaps, start_date))
+        recurring = sum(
+            self._occurrences(month, day, first_year, start_date, end_date)
+            for (month, day), first_year in data.recurring.items()
+        )
+        return fixed + recurring - overlaps
+
+    def between(self, db: Session, start_date: date, end_date: date) -> List[date]:
+        data = self._load(db)
+        days = set(data.dates[bisect_left(data.dates, start_date):bisect_right(data.dates, end_date)])
+
+        for (month, day), first_year in data.recurring.items():
+            for year in range(max(start_date.year, first_year), end_date.year + 1):
+                if not self._exists(year, month, day):
+                    continue
+                occurrence = date(year, month, day)
+                if start_date <= occurrence <= end_date:
+                    days.add(occurrence)
+
+        return sorted(days)
+
+    def invalidate(self):
+        with self._lock:
+            self._data = None
+
+
+holiday_calendar = HolidayCalendar()
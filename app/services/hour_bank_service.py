@@ -0,0 +1,223 @@
+import logging
+import threading
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.database.unit_of_work import unit_of_work
+from app.domain.models.enums import AdjustmentType
+from app.domain.models.routine_log import RoutineLog
+from app.domain.models.user import User
+from app.repositories.adjustment_repository import adjustment_repository
+from app.repositories.hour_bank_repository import hour_bank_repository
+from app.repositories.time_record_repository import time_record_repository
+from app.repositories.user_repository import user_repository
+from app.schemas.work_hour import HourBankBalanceResponse, HourBankMonthResponse
+from app.services.holiday_calendar import holiday_calendar
+from app.services.pairing_kernel import to_columns, worked_by_entry_day
+from app.services.work_hour_service import work_hour_service
+
+logger = logging.getLogger(__name__)
+
+
+class HourBankService:
+    def __init__(self):
+        self._reconcile_lock = threading.Lock()
+
+    def _compute(self, db: Session, user: User, start_date: date,
+                 end_date: date) -> Dict[date, Tuple[float, float]]:
+        tz = ZoneInfo(settings.TIMEZONE)
+        start_dt = datetime.combine(start_date, datetime.min.time(), tzinfo=tz)
+        end_dt = datetime.combine(end_date + timedelta(days=1), datetime.max.time(), tzinfo=tz)
+
+        rows = time_record_repository.get_punches_by_range(db, start_dt, end_dt, [user.id])
+        worked = {
+            day: seconds for day, seconds in worked_by_entry_day(to_columns(rows), max_pair_seconds=86400).items()
+            if start_date <= day <= end_date
+        }
+
+        hours_by_weekday = work_hour_service.schedule_hours(user.schedules)
+        credits = {}
+        adjustments = adjustment_repository.get_approved_by_range(db, user.id, start_date, end_date)
+        for adjustment in sorted(adjustments, key=lambda a: a.id):
+            if adjustment.adjustment_type not in [AdjustmentType.CERTIFICATE, AdjustmentType.WAIVER]:
+                continue
+            day = adjustment.target_date
+            if day in credits:
+                continue
+            if adjustment.amount_hours and adjustment.amount_hours > 0:
+                credits[day] = adjustment.amount_hours * 3600
+            else:
+                expected = 0.0
+                if not holiday_calendar.is_holiday(db, day):
+                    expected = hours_by_weekday.get(day.weekday(), 0.0) * 3600
+                credits[day] = max(expected - worked.get(day, 0.0), 0.0)
+
+        return {day: (worked.get(day, 0.0), credits.get(day, 0.0)) for day in set(worked) | set(credits)}
+
+    def refresh_user_days(self, db: Session, user_days: Iterable[Tuple[int, date]]):
+        days_by_user: Dict[int, set] = {}
+        for uid, day in user_days:
+            day = day.date() if isinstance(day, datetime) else day
+            days_by_user.setdefault(uid, set()).update({day - timedelta(days=1), day})
+
+        for uid, days in days_by_user.items():
+            user = user_repository.get(db, uid)
+            if not user:
+                continue
+            start_date, end_date = min(days), max(days)
+            computed = self._compute(db, user, start_date, end_date)
+            values = {day: computed.get(day, (0.0, 0.0)) for day in days}
+            hour_bank_repository.rewrite_from(db, uid, start_date, values)
+
+    def refresh_schedule_credits(self, db: Session, user_ids: Optional[List[int]] = None,
+                                 matches: Optional[Callable[[date], bool]] = None):
+        adjustments = adjustment_repository.get_approved_schedule_credits(db, user_ids)
+        self.refresh_user_days(db, [
+            (a.user_id, a.target_date) for a in adjustments if matches is None or matches(a.target_date)
+        ])
+
+    def rebuild_user(self, db: Session, user: User) -> bool:
+        first, last = time_record_repository.get_user_date_bounds(db, user.id)
+        adjustments = adjustment_repository.get_approved_by_range(db, user.id, date.min, date.max)
+        bounds = [d for d in (first, last) if d] + [a.target_date for a in adjustments]
+        if not bounds:
+            computed = {}
+        else:
+            computed = self._compute(db, user, min(bounds), max(bounds))
+
+        ledger_start = hour_bank_repository.get_first(db, user.id)
+        stored = {}
+        if ledger_start:
+            stored = {e.date: (e.worked_seconds, e.credit_seconds)
+                      for e in hour_bank_repository.get_from(db, user.id, ledger_start.date)}
+
+        expected = {d: v for d, v in computed.items() if v[0] or v[1]}
+        mismatched = [
+            d for d in set(stored) | set(expected)
+            if any(abs(a - b) > 1e-6 for a, b in zip(stored.get(d, (0.0, 0.0)), expected.get(d, (0.0, 0.0))))
+        ]
+        if not mismatched:
+            return False
+
+        first_mismatch = min(mismatched)
+        values = {d: expected.get(d, (0.0, 0.0)) for d in set(stored) | set(expected) if d >= first_mismatch}
+        hour_bank_repository.rewrite_from(db, user.id, first_mismatch, values)
+        return True
+
+    def _prefix(self, db: Session, user_id: int, until: date) -> Tuple[float, float]:
+        entry = hour_bank_repository.get_prefix(db, user_id, until)
+        if not entry:
+            return 0.0, 0.0
+        return entry.running_worked_seconds, entry.running_credit_seconds
+
+    def _range_totals(self, db: Session, user: User, start_date: date, end_date: date) -> Tuple[float, float, float]:
+        end_worked, end_credit = self._prefix(db, user.id, end_date)
+        start_worked, start_credit = self._prefix(db, user.id, start_date - timedelta(days=1))
+
+        expected = 0.0
+        if user.schedules:
+            holidays = holiday_calendar.between(db, start_date, end_date)
+            expected = work_hour_service.expected_hours(user.schedules, start_date, end_date, holidays)
+
+        return (end_worked - start_worked) / 3600.0, (end_credit - start_credit) / 3600.0, expected
+
+    def get_ledger_start(self, db: Session, user_id: int) -> Optional[date]:
+        first = hour_bank_repository.get_first(db, user_id)
+        return first.date if first else None
+
+    def get_balance(self, db: Session, user: User, start_date: date, end_date: date) -> HourBankBalanceResponse:
+        worked, credited, expected = self._range_totals(db, user, start_date, end_date)
+        balance = worked + credited - expected if user.schedules else 0.0
+
+        return HourBankBalanceResponse(
+            user_id=user.id,
+            start_date=start_date,
+            end_date=end_date,
+            total_worked_hours=round(worked, 2),
+            credited_hours=round(credited, 2),
+            expected_hours=round(expected, 2),
+            balance_hours=round(balance, 2)
+        )
+
+    def get_monthly(self, db: Session, user: User, year: int) -> List[HourBankMonthResponse]:
+        ledger_start = self.get_ledger_start(db, user.id)
+        accumulated = 0.0
+        if ledger_start and ledger_start < date(year, 1, 1):
+            accumulated = self.get_balance(db, user, ledger_start, date(year - 1, 12, 31)).balance_hours
+
+        today = datetime.now(ZoneInfo(settings.TIMEZONE)).date()
+
+        months = []
+        for month in range(1, 13):
+            start_date = date(year, month, 1)
+            end_date = min(date(year, month, monthrange(year, month)[1]), today)
+            if ledger_start:
+                start_date = max(start_date, ledger_start)
+            if not ledger_start or start_date > end_date:
+                continue
+
+            worked, credited, expected = self._range_totals(db, user, start_date, end_date)
+            balance = worked + credited - expected if user.schedules else 0.0
+            accumulated += balance
+
+            months.append(HourBankMonthResponse(
+                month=month,
+                year=year,
+                total_worked_hours=round(worked, 2),
+                credited_hours=round(credited, 2),
+                expected_hours=round(expected, 2),
+                balance_hours=round(balance, 2),
+                accumulated_balance_hours=round(accumulated, 2)
+            ))
+        return months
+
+    def reconcile_ledger(self):
+        if not self._reconcile_lock.acquire(blocking=False):
+            return
+        try:
+            now_local = datetime.now(ZoneInfo(settings.TIMEZONE)).replace(tzinfo=None)
+            today = now_local.date()
+
+            db = SessionLocal()
+            try:
+                ran_today = db.query(RoutineLog).filter(
+                    RoutineLog.routine_type == "RECONCILE_HOUR_BANK",
+                    RoutineLog.status == "SUCCESS",
+                    RoutineLog.target_date == today
+                ).first()
+                if ran_today:
+                    return
+
+                fixed = 0
+                for user in db.query(User).all():
+                    with unit_of_work(db):
+                        if self.rebuild_user(db, user):
+                            fixed += 1
+
+                db.add(RoutineLog(
+                    routine_type="RECONCILE_HOUR_BANK",
+                    target_date=today,
+                    status="SUCCESS",
+                    execution_time=now_local,
+                    details=f"{fixed} usuários corrigidos"
+                ))
+                db.commit()
+
+                if fixed > 0:
+                    logger.warning(f"Banco de horas: divergências corrigidas para {fixed} usuários.")
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Erro ao conciliar banco de horas: {e}")
+            finally:
+                db.close()
+        finally:
+            self._reconcile_lock.release()
+
+
+hour_bank_service = HourBankService()
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+IN_PROGRESS_WAIT_SECONDS = 10.0
+
+
+class _Entry:
+    __slots__ = ("expires_at", "fingerprint", "response", "done")
+
+    def __init__(self, expires_at: float, fingerprint: Optional[str]):
+        self.expires_at = expires_at
+        self.fingerprint = fingerprint
+        self.response: Any = None
+        self.done = threading.Event()
+
+
+class IdempotencyStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _purge(self, now: float):
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            if entry.expires_at > now and len(self._entries) <= settings.IDEMPOTENCY_MAX_KEYS:
+                break
+            self._entries.popitem(last=False)
+
+    def _release(self, entry_key: Tuple[str, str], entry: _Entry):
+        with self._lock:
+            if self._entries.get(entry_key) is entry:
+                del self._entries[entry_key]
+
+    def run(self, scope: str, key: Optional[str], handler: Callable[[], Any], fingerprint: Optional[str] = None,
+            should_store: Optional[Callable[[Any], bool]] = None):
+        if not key or settings.IDEMPOTENCY_TTL_SECONDS <= 0:
+            return handler()
+
+        entry_key = (scope, key)
+        with self._lock:
+            now = time.monotonic()
+            self._purge(now)
+            entry = self._entries.get(entry_key)
+            is_owner = entry is None
+            if is_owner:
+                self.misses += 1
+                entry = _Entry(now + settings.IDEMPOTENCY_TTL_SECONDS, fingerprint)
+                self._entries[entry_key] = entry
+            else:
+                self.hits += 1
+
+        if entry.fingerprint != fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key reused with a different payload")
+
+        if not is_owner:
+            if not entry.done.wait(IN_PROGRESS_WAIT_SECONDS):
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is in progress")
+            if entry.response is not None:
+                return entry.response
+            return self.run(scope, key, handler, fingerprint, should_store)
+
+        try:
+            response = handler()
+        except BaseException:
+            self._release(entry_key, entry)
+            entry.done.set()
+            raise
+
+        if should_store is None or should_store(response):
+            entry.response = response
+        else:
+            self._release(entry_key, entry)
+        entry.done.set()
+        return response
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+idempotency_store = IdempotencyStore()
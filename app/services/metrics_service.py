@@ -0,0 +1,126 @@
+import threading
+
+from prometheus_client import generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+
+from app.core.logger import log_pipeline
+from app.core.metrics import registry, ROUTINE_RESULTS
+from app.core.password_hasher import password_hasher
+from app.database.session import engine
+from app.domain.models.routine_log import RoutineLog
+from app.services.biometric_routing import biometric_routing
+from app.services.dashboard_service import dashboard_service
+from app.services.event_bus import event_bus
+from app.services.holiday_calendar import holiday_calendar
+from app.services.idempotency_store import idempotency_store
+from app.services.punch_state import punch_state
+
+CACHES = {
+    "holiday_calendar": holiday_calendar,
+    "biometric_routing": biometric_routing,
+    "punch_state": punch_state,
+    "dashboard": dashboard_service,
+    "idempotency": idempotency_store,
+}
+
+
+class RuntimeCollector:
+    def collect(self):
+        yield from self._collect_db_pool()
+        yield from self._collect_caches()
+        yield from self._collect_log_queue()
+        yield from self._collect_password_hasher()
+
+        subscribers = GaugeMetricFamily("spe_event_stream_subscribers", "Conexões abertas no fluxo de eventos.")
+        subscribers.add_metric([], event_bus.subscriber_count())
+        yield subscribers
+
+    def _collect_db_pool(self):
+        pool = engine.pool
+        for name, attr, doc in (
+                ("spe_db_pool_size", "size", "Tamanho configurado do pool de conexões."),
+                ("spe_db_pool_checked_out", "checkedout", "Conexões em uso."),
+                ("spe_db_pool_checked_in", "checkedin", "Conexões livres no pool."),
+                ("spe_db_pool_overflow", "overflow", "Conexões abertas além do tamanho do pool."),
+        ):
+            reader = getattr(pool, attr, None)
+            if reader is not None:
+                gauge = GaugeMetricFamily(name, doc)
+                gauge.add_metric([], reader())
+                yield gauge
+
+    def _collect_caches(self):
+        requests = CounterMetricFamily("spe_cache_requests", "Consultas aos caches em memória.",
+                                       labels=["cache", "result"])
+        ratio = GaugeMetricFamily("spe_cache_hit_ratio", "Proporção de acertos dos caches em memória.",
+                                  labels=["cache"])
+        for name, cache in CACHES.items():
+            hits, misses = cache.hits, cache.misses
+            requests.add_metric([name, "hit"], hits)
+            requests.add_metric([name, "miss"], misses)
+            ratio.add_metric([name], hits / (hits + misses) if hits + misses else 0.0)
+        yield requests
+        yield ratio
+
+    def _collect_log_queue(self):
+        stats = log_pipeline.stats()
+        if not stats:
+            return
+        for name, key, doc in (
+                ("spe_log_queue_depth", "queue_depth", "Mensagens aguardando gravação no log."),
+                ("spe_log_queue_capacity", "queue_capacity", "Capacidade da fila de log."),
+                ("spe_log_queue_max_depth", "max_depth", "Maior ocupação registrada da fila de log."),
+        ):
+            gauge = GaugeMetricFamily(name, doc)
+            gauge.add_metric([], stats[key])
+            yield gauge
+        for name, key, doc in (
+                ("spe_log_records_dropped", "dropped", "Mensagens de log descartadas com a fila cheia."),
+                ("spe_log_records_written", "written", "Mensagens de log gravadas."),
+        ):
+            counter = CounterMetricFamily(name, doc)
+            counter.add_metric([], stats[key])
+            yield counter
+
+    def _collect_password_hasher(self):
+        stats = password_hasher.stats()
+        for name, key, doc in (
+                ("spe_password_hash_pending", "pending", "Verificações de senha em execução ou na fila."),
+                ("spe_password_hash_queued", "queued", "Verificações de senha aguardando uma thread."),
+        ):
+            gauge = GaugeMetricFamily(name, doc)
+            gauge.add_metric([], stats[key])
+            yield gauge
+        for name, key, doc in (
+                ("spe_password_hash_completed", "completed", "Verificações de senha concluídas."),
+                ("spe_password_hash_rejected", "rejected", "Logins recusados com a fila de senhas cheia."),
+                ("spe_password_hash_wait_seconds", "wait_seconds", "Tempo total de espera na fila de senhas."),
+                ("spe_password_hash_seconds", "hash_seconds", "Tempo total gasto no bcrypt."),
+        ):
+            counter = CounterMetricFamily(name, doc)
+            counter.add_metric([], stats[key])
+            yield counter
+
+
+class MetricsService:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._installed = False
+
+    def install(self):
+        with self._lock:
+            if self._installed:
+                return
+            registry.register(RuntimeCollector())
+            event.listen(RoutineLog, "after_insert", self._on_routine_log)
+            self._installed = True
+
+    def _on_routine_log(self, mapper, connection, target: RoutineLog):
+        ROUTINE_RESULTS.labels(target.routine_type, target.status).inc()
+
+    def render(self) -> bytes:
+        return generate_latest(registry)
+
+
+metrics_service = MetricsService()
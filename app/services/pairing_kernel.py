@@ -0,0 +1,136 @@
+from datetime import datetime, date
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.domain.models.enums import RecordType
+
+ENTRY_CODE = 0
+EXIT_CODE = 1
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+
+
+class PunchColumns(NamedTuple):
+    user_ids: np.ndarray
+    seconds: np.ndarray
+    types: np.ndarray
+    days: np.ndarray
+
+
+class PairingResult(NamedTuple):
+    order: np.ndarray
+    group_users: np.ndarray
+    group_days: np.ndarray
+    group_starts: np.ndarray
+    group_ends: np.ndarray
+    worked_seconds: np.ndarray
+    pair_seconds: np.ndarray
+    is_pair: np.ndarray
+    double_entry: np.ndarray
+    double_exit: np.ndarray
+    missing_entry: np.ndarray
+    missing_exit: np.ndarray
+
+    def worked_by_day(self) -> dict:
+        return {date.fromordinal(int(d)): float(w) for d, w in zip(self.group_days, self.worked_seconds)}
+
+    def worked_by_user(self) -> dict:
+        totals = {}
+        for uid, worked in zip(self.group_users.tolist(), self.worked_seconds.tolist()):
+            totals[uid] = totals.get(uid, 0.0) + worked
+        return totals
+
+
+def _to_seconds(value: datetime) -> float:
+    if value.tzinfo is None:
+        return (value - _NAIVE_EPOCH).total_seconds()
+    return value.timestamp()
+
+
+def to_columns(rows: Iterable[Tuple[int, datetime, RecordType]]) -> PunchColumns:
+    rows = list(rows)
+    count = len(rows)
+    return PunchColumns(
+        user_ids=np.fromiter((r[0] for r in rows), dtype=np.int64, count=count),
+        seconds=np.fromiter((_to_seconds(r[1]) for r in rows), dtype=np.float64, count=count),
+        types=np.fromiter((ENTRY_CODE if r[2] == RecordType.ENTRY else EXIT_CODE for r in rows),
+                          dtype=np.int8, count=count),
+        days=np.fromiter((r[1].date().toordinal() for r in rows), dtype=np.int64, count=count),
+    )
+
+
+def pair_punches(columns: PunchColumns, by_day: bool = True,
+                 max_pair_seconds: Optional[float] = None) -> PairingResult:
+    if by_day:
+        order = np.lexsort((columns.seconds, columns.days, columns.user_ids))
+    else:
+        order = np.lexsort((columns.seconds, columns.user_ids))
+
+    users = columns.user_ids[order]
+    seconds = columns.seconds[order]
+    types = columns.types[order]
+    days = columns.days[order]
+    count = len(order)
+
+    if count == 0:
+        empty_int = np.empty(0, dtype=np.int64)
+        empty_bool = np.empty(0, dtype=bool)
+        return PairingResult(order, empty_int, empty_int, empty_int, empty_int, np.empty(0), np.empty(0),
+                             empty_bool, empty_bool, empty_bool, empty_bool, empty_bool)
+
+    new_group = np.empty(count, dtype=bool)
+    new_group[0] = True
+    new_group[1:] = users[1:] != users[:-1]
+    if by_day:
+        new_group[1:] |= days[1:] != days[:-1]
+
+    group_index = np.cumsum(new_group) - 1
+    group_starts = np.flatnonzero(new_group)
+    group_ends = np.append(group_starts[1:], count) - 1
+
+    same_group = ~new_group
+    is_entry = types == ENTRY_CODE
+    is_exit = ~is_entry
+    prev_entry = np.zeros(count, dtype=bool)
+    prev_entry[1:] = is_entry[:-1]
+    prev_exit = np.zeros(count, dtype=bool)
+    prev_exit[1:] = is_exit[:-1]
+
+    is_pair = same_group & is_exit & prev_entry
+    deltas = np.zeros(count)
+    deltas[1:] = seconds[1:] - seconds[:-1]
+    pair_seconds = np.where(is_pair, deltas, 0.0)
+
+    counted = pair_seconds
+    if max_pair_seconds is not None:
+        counted = np.where(pair_seconds <= max_pair_seconds, pair_seconds, 0.0)
+
+    return PairingResult(
+        order=order,
+        group_users=users[group_starts],
+        group_days=days[group_starts],
+        group_starts=group_starts,
+        group_ends=group_ends,
+        worked_seconds=np.bincount(group_index, weights=counted, minlength=len(group_starts)),
+        pair_seconds=pair_seconds,
+        is_pair=is_pair,
+        double_entry=same_group & is_entry & prev_entry,
+        double_exit=same_group & is_exit & prev_exit,
+        missing_entry=is_exit[group_starts],
+        missing_exit=is_entry[group_ends],
+    )
+
+
+def worked_by_entry_day(columns: PunchColumns, max_pair_seconds: Optional[float] = None) -> dict:
+    result = pair_punches(columns, by_day=False, max_pair_seconds=max_pair_seconds)
+
+    counted = result.is_pair
+    if max_pair_seconds is not None:
+        counted = counted & (result.pair_seconds <= max_pair_seconds)
+
+    exit_rows = np.flatnonzero(counted)
+    entry_days = columns.days[result.order][exit_rows - 1]
+    days, inverse = np.unique(entry_days, return_inverse=True)
+    totals = np.bincount(inverse, weights=result.pair_seconds[exit_rows], minlength=len(days))
+    return {date.fromordinal(int(d)): float(w) for d, w in zip(days, totals)}
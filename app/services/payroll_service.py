@@ -6,6 +6,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.database.unit_of_work import unit_of_work
 from app.domain.models.enums import UserRole
 from app.domain.models.time_record import TimeRecord
 from app.domain.models.user import User
@@ -80,12 +81,13 @@ class PayrollService:
                 detail=f"Payroll period {month}/{year} is already closed."
             )
 
-        closure = payroll_repository.create(db, month, year, current_user.id)
+        with unit_of_work(db):
+            closure = payroll_repository.create(db, month, year, current_user.id)
 
-        audit_service.log(
-            db, actor_id=current_user.id, action="CLOSE", entity="PAYROLL", entity_id=closure.id,
-            new_data={"month": month, "year": year}
-        )
+            audit_service.log(
+                db, actor_id=current_user.id, action="CLOSE", entity="PAYROLL", entity_id=closure.id,
+                new_data={"month": month, "year": year}
+            )
         return closure
 
     def reopen_period(self, db: Session, month: int, year: int, current_user: User):
@@ -102,17 +104,20 @@ class PayrollService:
                 detail=f"Payroll period {month}/{year} is not closed."
             )
 
-        payroll_repository.delete(db, month, year)
+        with unit_of_work(db):
+            payroll_repository.delete(db, month, year)
 
-        audit_service.log(
-            db, actor_id=current_user.id, action="REOPEN", entity="PAYROLL",
-            old_data={"month": month, "year": year}
-        )
+            audit_service.log(
+                db, actor_id=current_user.id, action="REOPEN", entity="PAYROLL",
+                old_data={"month": month, "year": year}
+            )
         return {"status": "success", "message": f"Payroll period {month}/{year} reopened successfully."}
 
+    def is_period_open(self, db: Session, target_date: date) -> bool:
+        return payroll_repository.get_by_month(db, target_date.month, target_date.year) is None
+
     def validate_period_open(self, db: Session, target_date: date):
-        closure = payroll_repository.get_by_month(db, target_date.month, target_date.year)
-        if closure:
+        if not self.is_period_open(db, target_date):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Action blocked: Payroll for {target_date.month}/{target_date.year} is CLOSED."
@@ -1,49 +1,150 @@
 import logging
-from datetime import datetime
-from typing import Optional
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.services.time_record_service import time_record_service
+from app.domain.models.enums import RecordType
+from app.domain.models.time_record import TimeRecord
+from app.schemas.device import (
+    FeedbackPayload, DeviceActions, DevicePunchBatchItem, DevicePunchBatchRejection, DevicePunchBatchResponse
+)
+from app.services.biometric_routing import biometric_routing
+from app.services.payroll_service import payroll_service
+from app.services.punch_state import punch_state
+from app.services.time_record_service import time_record_service, DevicePunch
 
 logger = logging.getLogger(__name__)
 
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
 
 class PunchService:
+    def __init__(self):
+        self._recent: Dict[int, Tuple[float, FeedbackPayload]] = {}
+
     def process_biometric_punch(self, db: Session, sensor_index: int, ip_address: Optional[str] = None):
         try:
-            from app.domain.models.biometric import UserBiometric
-
-            biometric = db.query(UserBiometric).filter(UserBiometric.sensor_index == sensor_index).first()
+            route = biometric_routing.resolve(db, sensor_index)
 
-            if not biometric:
+            if not route:
                 logger.warning(f"Batida recebida de index desconhecido: {sensor_index}")
-                return False, "Nao Cadastrado", None
+                return False, "Nao Cadastrado", None, None
 
-            user = biometric.user
-
-            if not user.is_active:
-                return False, "Bloqueado", None
+            if not route.is_active:
+                return False, "Bloqueado", None, None
 
             tz = ZoneInfo(settings.TIMEZONE)
             server_time = datetime.now(tz)
 
             new_record = time_record_service.create_punch(
                 db,
-                user_id=user.id,
+                user_id=route.user_id,
                 timestamp=server_time,
                 ip_address=ip_address if ip_address else "0.0.0.0",
-                biometric_id=biometric.id,
+                biometric_id=route.biometric_id,
                 platform="IOT"
             )
 
-            return True, "Ponto Registrado", new_record
+            return True, "Ponto Registrado", new_record, route.user_name
 
         except Exception as e:
             logger.error(f"Erro ao processar punch: {e}")
-            return False, "Erro Interno", None
+            return False, "Erro Interno", None, None
+
+    def _build_feedback(self, success: bool, message: str, record: Optional[TimeRecord],
+                        user_name: Optional[str]) -> FeedbackPayload:
+        if success and record:
+            user_first_name = user_name.split()[0] if user_name else "Usuario"
+            time_formatted = record.record_datetime.strftime('%H:%M')
+            type_label = "Entrada" if record.record_type == RecordType.ENTRY else "Saida"
+
+            return FeedbackPayload(
+                line1=f"Ola, {user_first_name[:11]}",
+                line2=f"{type_label} {time_formatted}",
+                led="green",
+                actions=DeviceActions(
+                    buzzer_pattern=1, buzzer_duration_ms=500
+                )
+            )
+
+        return FeedbackPayload(
+            line1="Erro",
+            line2=message[:16],
+            led="red",
+            actions=DeviceActions(
+                buzzer_pattern=2, buzzer_duration_ms=1000
+            )
+        )
+
+    def register_device_punch(self, db: Session, sensor_index: int,
+                              ip_address: Optional[str] = None) -> FeedbackPayload:
+        window = settings.PUNCH_DEDUP_WINDOW_SECONDS
+        route = biometric_routing.resolve(db, sensor_index)
+        if not route or not route.is_active or window <= 0:
+            return self._build_feedback(*self.process_biometric_punch(db, sensor_index, ip_address))
+
+        with punch_state.user_lock(route.user_id):
+            recent = self._recent.get(route.user_id)
+            if recent and time.monotonic() - recent[0] < window:
+                logger.info(f"Batida repetida ignorada (usuario {route.user_id}, index {sensor_index})")
+                return recent[1]
+
+            success, message, record, user_name = self.process_biometric_punch(db, sensor_index, ip_address)
+            feedback = self._build_feedback(success, message, record, user_name)
+            if success:
+                self._recent[route.user_id] = (time.monotonic(), feedback)
+            return feedback
+
+    def register_punch_batch(self, db: Session, device_id: int, items: List[DevicePunchBatchItem],
+                             ip_address: Optional[str] = None) -> DevicePunchBatchResponse:
+        tz = ZoneInfo(settings.TIMEZONE)
+        latest_allowed = datetime.now(tz) + MAX_CLOCK_SKEW
+        open_periods = {}
+
+        punches, rejected = [], []
+        for item in items:
+            timestamp = item.timestamp.replace(tzinfo=tz) if item.timestamp.tzinfo is None else item.timestamp
+            route = biometric_routing.resolve(db, item.sensor_index)
+
+            reason = None
+            if not route:
+                reason = "Nao Cadastrado"
+            elif not route.is_active:
+                reason = "Bloqueado"
+            elif timestamp > latest_allowed:
+                reason = "Horario Invalido"
+            else:
+                local_date = timestamp.astimezone(tz).date()
+                period = (local_date.year, local_date.month)
+                if period not in open_periods:
+                    open_periods[period] = payroll_service.is_period_open(db, local_date)
+                if not open_periods[period]:
+                    reason = "Periodo Fechado"
+
+            if reason:
+                rejected.append(DevicePunchBatchRejection(sequence=item.sequence, reason=reason))
+                continue
+            punches.append(DevicePunch(item.sequence, route.user_id, route.biometric_id, timestamp))
+
+        accepted, duplicates = [], []
+        if punches:
+            accepted, duplicates = time_record_service.create_device_punches(
+                db, device_id, punches, ip_address if ip_address else "0.0.0.0"
+            )
+
+        if rejected:
+            logger.warning(f"Lote do dispositivo {device_id}: {len(rejected)} batidas rejeitadas")
+
+        return DevicePunchBatchResponse(
+            accepted=len(accepted),
+            duplicates=duplicates,
+            rejected=rejected,
+            last_sequence=max(item.sequence for item in items)
+        )
 
 
 punch_service = PunchService()
@@ -0,0 +1,50 @@
+import threading
+from datetime import date, datetime
+from typing import Dict, NamedTuple, Optional
+
+from app.domain.models.enums import RecordType
+
+
+class PunchState(NamedTuple):
+    record_type: Optional[RecordType]
+    local_date: Optional[date]
+    timestamp: Optional[datetime]
+
+
+NO_PUNCH = PunchState(None, None, None)
+
+
+class PunchStateCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._user_locks: Dict[int, threading.RLock] = {}
+        self._states: Dict[int, PunchState] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def user_lock(self, user_id: int) -> threading.RLock:
+        lock = self._user_locks.get(user_id)
+        if lock is None:
+            with self._lock:
+                lock = self._user_locks.setdefault(user_id, threading.RLock())
+        return lock
+
+    def get(self, user_id: int) -> Optional[PunchState]:
+        state = self._states.get(user_id)
+        if state is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return state
+
+    def set(self, user_id: int, state: PunchState):
+        self._states[user_id] = state
+
+    def invalidate(self, user_id: Optional[int] = None):
+        if user_id is None:
+            self._states.clear()
+        else:
+            self._states.pop(user_id, None)
+
+
+punch_state = PunchStateCache()
@@ -0,0 +1,251 @@
+from datetime import date, datetime, timedelta
+from typing import FrozenSet, List, NamedTuple, Optional, Tuple
+
+from app.domain.models.enums import RecordType, AdjustmentType, EditJustification
+from app.schemas.report import UserPayrollSummary, AdvancedUserReportResponse, DailyReportItem, PunchDetail
+from app.services.pairing_kernel import pair_punches, to_columns
+
+DAY_NAMES = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado", "Domingo"]
+EXCUSED_TYPES = (AdjustmentType.CERTIFICATE, AdjustmentType.WAIVER)
+
+
+class ReportPeriod(NamedTuple):
+    start_date: date
+    end_date: date
+    today: date
+    holidays: FrozenSet[date]
+    is_maintainer: bool
+
+
+class PunchRow(NamedTuple):
+    id: int
+    record_datetime: datetime
+    record_type: RecordType
+    ip_address: Optional[str]
+    device_name: Optional[str]
+    platform: Optional[str]
+    is_manual: bool
+    is_time_verified: Optional[bool]
+    biometric_id: Optional[int]
+    original_timestamp: Optional[datetime]
+    edited_by: Optional[int]
+    edit_justification: Optional[EditJustification]
+    edit_reason: Optional[str]
+
+
+class AdjustmentRow(NamedTuple):
+    id: int
+    target_date: date
+    adjustment_type: AdjustmentType
+    amount_hours: Optional[float]
+
+
+class UserReportInput(NamedTuple):
+    user_id: int
+    user_name: str
+    schedules: Tuple[Tuple[int, float], ...]
+    punches: Tuple[PunchRow, ...]
+    adjustments: Tuple[AdjustmentRow, ...]
+
+
+def format_duration(total_seconds: float) -> str:
+    total_minutes = int(round(total_seconds / 60))
+    hours = total_minutes // 60
+    minutes = total_minutes % 60
+    return f"{hours}h:{minutes:02d}min"
+
+
+def build_user_report(data: UserReportInput, period: ReportPeriod) -> AdvancedUserReportResponse:
+    has_schedule = bool(data.schedules)
+    schedule_hours = {}
+    for day_of_week, daily_hours in data.schedules:
+        schedule_hours.setdefault(day_of_week, daily_hours)
+
+    records_by_day = {}
+    for record in data.punches:
+        records_by_day.setdefault(record.record_datetime.date(), []).append(record)
+
+    excused_by_day = {}
+    for adjustment in data.adjustments:
+        if adjustment.adjustment_type in EXCUSED_TYPES:
+            excused_by_day.setdefault(adjustment.target_date, adjustment)
+
+    pairing = pair_punches(
+        to_columns((data.user_id, r.record_datetime, r.record_type) for r in data.punches),
+        max_pair_seconds=86400
+    )
+    worked_by_day = pairing.worked_by_day()
+
+    daily_details = []
+
+    total_worked_seconds = 0.0
+    total_expected_seconds = 0.0
+
+    total_extra_hours = 0.0
+    total_missing_hours = 0.0
+
+    days_worked_count = 0
+    absences_count = 0
+
+    is_maintainer = period.is_maintainer
+
+    current = period.start_date
+    while current <= period.end_date:
+        is_future = current > period.today
+
+        day_records = records_by_day.get(current, [])
+
+        is_holiday = current in period.holidays
+
+        adjustment_day = excused_by_day.get(current)
+
+        is_certificate = adjustment_day is not None and adjustment_day.adjustment_type == AdjustmentType.CERTIFICATE
+        is_waiver = adjustment_day is not None and adjustment_day.adjustment_type == AdjustmentType.WAIVER
+
+        adj_id = adjustment_day.id if adjustment_day else None
+
+        is_excused = is_certificate or is_waiver
+
+        weekday = current.weekday()
+        is_weekend = weekday >= 5
+
+        expected_seconds = 0.0
+        if has_schedule and not is_holiday and not is_future:
+            if weekday in schedule_hours:
+                expected_seconds = schedule_hours[weekday] * 3600
+
+        entries = []
+        exits = []
+        punches = []
+        detailed_punches = []
+        worked_seconds = worked_by_day.get(current, 0.0)
+
+        for rec in day_records:
+            time_str = rec.record_datetime.strftime("%H:%M")
+            suffix = "(E)" if rec.record_type == RecordType.ENTRY else "(S)"
+            punches.append(f"{time_str} {suffix}")
+
+            if is_maintainer:
+                detailed_punches.append(PunchDetail(
+                    id=rec.id,
+                    time=rec.record_datetime.strftime("%H:%M:%S"),
+                    record_type=rec.record_type.value,
+                    ip_address=rec.ip_address,
+                    device_name=rec.device_name,
+                    platform=rec.platform,
+                    is_manual=rec.is_manual,
+                    is_time_verified=rec.is_time_verified,
+                    biometric_id=rec.biometric_id,
+                    original_timestamp=rec.original_timestamp,
+                    edited_by=rec.edited_by,
+                    edit_justification=rec.edit_justification.value if rec.edit_justification else None,
+                    edit_reason=rec.edit_reason
+                ))
+
+            if rec.record_type == RecordType.ENTRY:
+                entries.append(time_str)
+            elif rec.record_type == RecordType.EXIT:
+                exits.append(time_str)
+
+        waiver_credit = 0.0
+        if is_excused:
+            if adjustment_day.amount_hours and adjustment_day.amount_hours > 0:
+                waiver_credit = adjustment_day.amount_hours * 3600
+            else:
+                if expected_seconds > 0 and worked_seconds < expected_seconds:
+                    waiver_credit = expected_seconds - worked_seconds
+            worked_seconds += waiver_credit
+
+        if worked_seconds > 0:
+            days_worked_count += 1
+
+        if worked_seconds == 0 and expected_seconds > 0 and not is_weekend and not is_holiday and not is_excused and not is_future:
+            absences_count += 1
+
+        day_worked_hours = worked_seconds / 3600.0
+        day_expected_hours = expected_seconds / 3600.0
+
+        day_balance = 0.0
+        if has_schedule:
+            day_balance = day_worked_hours - day_expected_hours
+
+        day_extra = day_balance if day_balance > 0 else 0.0
+        day_missing = abs(day_balance) if day_balance < 0 else 0.0
+
+        total_worked_seconds += worked_seconds
+        total_expected_seconds += expected_seconds
+
+        total_extra_hours += day_extra
+        total_missing_hours += day_missing
+
+        status = "Normal"
+        if is_future:
+            status = ""
+        elif is_waiver:
+            status = f"Abonado ({format_duration(waiver_credit)})"
+        elif is_certificate:
+            status = f"Atestado ({format_duration(waiver_credit)})"
+        elif is_holiday:
+            status = "Feriado"
+        elif is_weekend:
+            if worked_seconds > 0:
+                status = "Normal"
+            else:
+                status = "Fim de Semana"
+        elif worked_seconds == 0 and expected_seconds > 0:
+            status = "Falta"
+        elif not has_schedule and worked_seconds == 0:
+            status = "-"
+
+        worked_minutes_int = int(round(worked_seconds / 60))
+
+        daily_details.append(DailyReportItem(
+            date=current,
+            day_name=DAY_NAMES[weekday],
+            is_holiday=is_holiday,
+            is_weekend=is_weekend,
+            status=status,
+            entries=entries,
+            exits=exits,
+            punches=punches,
+            detailed_punches=detailed_punches if is_maintainer else None,
+
+            adjustment_id=adj_id,
+
+            worked_hours=round(day_worked_hours, 2),
+            expected_hours=round(day_expected_hours, 2),
+            balance_hours=round(day_balance, 2),
+            extra_hours=round(day_extra, 2),
+            missing_hours=round(day_missing, 2),
+
+            worked_minutes=worked_minutes_int,
+            worked_time=format_duration(worked_seconds),
+            expected_time=format_duration(expected_seconds)
+        ))
+
+        current += timedelta(days=1)
+
+    summary = UserPayrollSummary(
+        user_id=data.user_id,
+        user_name=data.user_name,
+        total_worked_time=format_duration(total_worked_seconds),
+        total_expected_time=format_duration(total_expected_seconds),
+
+        total_worked_minutes=int(round(total_worked_seconds / 60)),
+        total_expected_minutes=int(round(total_expected_seconds / 60)),
+
+        days_worked=days_worked_count,
+        absences=absences_count,
+
+        total_worked_hours=round(total_worked_seconds / 3600.0, 2),
+        total_expected_hours=round(total_expected_seconds / 3600.0, 2),
+        total_extra_hours=round(total_extra_hours, 2),
+        total_missing_hours=round(total_missing_hours, 2),
+        final_balance=round(total_extra_hours - total_missing_hours, 2)
+    )
+
+    return AdvancedUserReportResponse(summary=summary, daily_details=daily_details)
+
+
+def build_user_reports(chunk: List[UserReportInput], period: ReportPeriod) -> List[AdvancedUserReportResponse]:
+    return [build_user_report(data, period) for data in chunk]
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.domain.models.enums import ReportJobType, ReportJobStatus, UserRole
+from app.domain.models.report_job import ReportJob
+from app.domain.models.user import User
+from app.repositories.report_job_repository import report_job_repository
+from app.repositories.user_repository import user_repository
+from app.services.event_bus import event_bus
+from app.services.report_service import report_service
+from app.services.telegram_service import telegram_service
+
+logger = logging.getLogger(__name__)
+
+
+class ReportJobService:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=settings.REPORT_JOB_WORKERS,
+                                                thread_name_prefix="report-job")
+        return self._executor
+
+    def _dedup_key(self, job_type: ReportJobType, params: dict) -> str:
+        raw = json.dumps({"job_type": job_type.value, **params}, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def submit(self, db: Session, job_type: ReportJobType, params: dict, current_user: User) -> ReportJob:
+        params = {**params, "maintainer_view": current_user.role == UserRole.MAINTAINER}
+        if params.get("employee_ids"):
+            params["employee_ids"] = sorted(set(params["employee_ids"]))
+        dedup_key = self._dedup_key(job_type, params)
+
+        with self._lock:
+            existing = report_job_repository.get_active_by_key(db, dedup_key)
+            if existing:
+                return existing
+
+            if report_job_repository.count_active(db) >= settings.REPORT_JOB_MAX_ACTIVE:
+                raise HTTPException(status_code=429, detail="Too many report jobs in progress. Try again later.")
+
+            job = report_job_repository.create(db, ReportJob(
+                id=uuid.uuid4().hex,
+                job_type=job_type,
+                status=ReportJobStatus.PENDING,
+                params=json.dumps(params),
+                dedup_key=dedup_key,
+                requested_by=current_user.id
+            ))
+            self._get_executor().submit(self._run, job.id)
+        return job
+
+    def get_job(self, db: Session, job_id: str, current_user: User) -> ReportJob:
+        job = report_job_repository.get(db, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Report job not found")
+
+        is_maintainer = current_user.role == UserRole.MAINTAINER
+        if job.requested_by != current_user.id and json.loads(job.params)["maintainer_view"] and not is_maintainer:
+            raise HTTPException(status_code=403, detail="Not authorized")
+        return job
+
+    def _run(self, job_id: str):
+        db = SessionLocal()
+        try:
+            job = report_job_repository.get(db, job_id)
+            if not job or job.status != ReportJobStatus.PENDING:
+                return
+
+            report_job_repository.mark_running(db, job)
+            try:
+                self._execute(db, job, json.loads(job.params))
+                status, error = ReportJobStatus.SUCCESS, None
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Erro ao executar job de relatório {job_id} ({job.job_type.value}): {e}")
+                status, error = ReportJobStatus.FAILED, str(e)
+
+            report_job_repository.mark_finished(db, job, status, error)
+            event_bus.publish("report_job", {"id": job.id, "job_type": job.job_type, "status": status})
+        except Exception as e:
+            logger.error(f"Erro ao atualizar job de relatório {job_id}: {e}")
+        finally:
+            db.close()
+
+    def _execute(self, db: Session, job: ReportJob, params: dict):
+        if job.job_type == ReportJobType.TELEGRAM_REPORT:
+            telegram_service.send_manual_report(date.fromisoformat(params["start_date"]),
+                                                date.fromisoformat(params["end_date"]))
+            return
+
+        requester = user_repository.get(db, job.requested_by)
+        month, year, employee_ids = params["month"], params["year"], params.get("employee_ids")
+
+        if job.job_type == ReportJobType.EXCEL:
+            content = report_service.generate_excel_report(db, month, year, employee_ids, requester).getvalue()
+            filename = f"folha_ponto_{month}_{year}.xlsx"
+            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        else:
+            report = report_service.get_monthly_summary(db, month, year, employee_ids, requester)
+            content = report.model_dump_json().encode()
+            filename = f"resumo_mensal_{month}_{year}.json"
+            media_type = "application/json"
+
+        result_path = os.path.join(settings.REPORT_JOBS_DIR, f"{job.id}{os.path.splitext(filename)[1]}")
+        with open(result_path, "wb") as f:
+            f.write(content)
+
+        job.result_path = result_path
+        job.result_filename = filename
+        job.result_media_type = media_type
+
+    def recover(self):
+        db = SessionLocal()
+        try:
+            failed = report_job_repository.fail_active(db, "Interrompido pela reinicialização do servidor")
+            if failed:
+                logger.warning(f"{failed} jobs de relatório interrompidos marcados como falha.")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Erro ao recuperar jobs de relatório: {e}")
+        finally:
+            db.close()
+
+    def clean_old_results(self):
+        now_local = datetime.now(ZoneInfo(settings.TIMEZONE)).replace(tzinfo=None)
+        cutoff = now_local - timedelta(days=settings.REPORT_JOB_RETENTION_DAYS)
+
+        db = SessionLocal()
+        try:
+            jobs = report_job_repository.get_finished_before(db, cutoff)
+            for job in jobs:
+                if job.result_path and os.path.exists(job.result_path):
+                    os.remove(job.result_path)
+            report_job_repository.delete_many(db, jobs)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Erro ao limpar resultados de relatórios: {e}")
+        finally:
+            db.close()
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+report_job_service = ReportJobService()
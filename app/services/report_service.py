@@ -1,7 +1,13 @@
 import locale
+import logging
+import multiprocessing
+import threading
 from calendar import monthrange
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import date, timedelta, datetime
 from io import BytesIO
+from itertools import repeat
 from typing import List, Optional
 from zoneinfo import ZoneInfo
 
@@ -11,17 +17,20 @@ from openpyxl.utils import get_column_letter
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.domain.models.enums import RecordType, UserRole, AdjustmentType
+from app.domain.models.enums import UserRole
 from app.domain.models.user import User
 from app.repositories.adjustment_repository import adjustment_repository
-from app.repositories.holiday_repository import holiday_repository
 from app.repositories.time_record_repository import time_record_repository
 from app.repositories.user_repository import user_repository
-from app.schemas.report import (
-    MonthlyReportResponse, UserPayrollSummary, AdvancedUserReportResponse,
-    DailyReportItem, DashboardMetricsResponse, PunchDetail
+from app.schemas.report import MonthlyReportResponse, AdvancedUserReportResponse, DashboardMetricsResponse
+from app.services.dashboard_service import dashboard_service
+from app.services.holiday_calendar import holiday_calendar
+from app.services.report_builder import (
+    ReportPeriod, PunchRow, AdjustmentRow, UserReportInput, build_user_reports
 )
 
+logger = logging.getLogger(__name__)
+
 try:
     locale.setlocale(locale.LC_TIME, 'pt_BR.utf8')
 except Exception:
@@ -29,22 +38,16 @@ except Exception:
 
 
 class ReportService:
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
     def _get_month_range(self, month: int, year: int):
         start_date = date(year, month, 1)
         _, last_day = monthrange(year, month)
         end_date = date(year, month, last_day)
         return start_date, end_date
 
-    def _get_day_name(self, dt: date) -> str:
-        days = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado", "Domingo"]
-        return days[dt.weekday()]
-
-    def _format_duration(self, total_seconds: float) -> str:
-        total_minutes = int(round(total_seconds / 60))
-        hours = total_minutes // 60
-        minutes = total_minutes % 60
-        return f"{hours}h:{minutes:02d}min"
-
     def _apply_employee_filters(self, query, employee_ids: Optional[List[int]] = None):
         query = query.filter(User.role == UserRole.EMPLOYEE)
         query = query.filter(User.is_exempt_from_rules.is_(False))
@@ -55,231 +58,93 @@ class ReportService:
         return query
 
     def get_dashboard_metrics(self, db: Session) -> DashboardMetricsResponse:
-        tz = ZoneInfo(settings.TIMEZONE)
-        today = datetime.now(tz).date()
+        return dashboard_service.get_metrics(db)
 
-        active_users = db.query(User).filter(
-            User.is_active.is_(True),
-            User.role == UserRole.EMPLOYEE,
-            User.is_exempt_from_rules.is_(False)
-        ).count()
+    def _get_report_period(self, db: Session, start_date: date, end_date: date,
+                           current_user: Optional[User]) -> ReportPeriod:
+        today_date = datetime.now(ZoneInfo(settings.TIMEZONE)).date()
+        holidays = set()
+        current = start_date
+        while current <= end_date:
+            if holiday_calendar.is_holiday(db, current):
+                holidays.add(current)
+            current += timedelta(days=1)
 
-        pending = adjustment_repository.count_pending(db)
+        is_maintainer = current_user is not None and current_user.role == UserRole.MAINTAINER
+        return ReportPeriod(start_date, end_date, today_date, frozenset(holidays), is_maintainer)
 
-        today_start = datetime.combine(today, datetime.min.time(), tzinfo=tz)
-        today_end = datetime.combine(today, datetime.max.time(), tzinfo=tz)
-        present = time_record_repository.count_unique_users_in_range(db, today_start, today_end)
+    def _load_report_inputs(self, db: Session, users: List[User], start_date: date,
+                            end_date: date) -> List[UserReportInput]:
+        if not users:
+            return []
 
-        return DashboardMetricsResponse(
-            total_active_employees=active_users,
-            pending_adjustments=pending,
-            employees_present_today=present,
-            date=today
-        )
+        tz = ZoneInfo(settings.TIMEZONE)
+        start_dt = datetime.combine(start_date, datetime.min.time(), tzinfo=tz)
+        end_dt = datetime.combine(end_date, datetime.max.time(), tzinfo=tz)
+        user_ids = [user.id for user in users]
+
+        punches_by_user = {}
+        for row in time_record_repository.get_report_rows_by_users(db, user_ids, start_dt, end_dt):
+            punches_by_user.setdefault(row[0], []).append(PunchRow(*row[1:]))
+
+        adjustments_by_user = {}
+        for adj in adjustment_repository.get_approved_by_users_and_range(db, user_ids, start_date, end_date):
+            adjustments_by_user.setdefault(adj.user_id, []).append(
+                AdjustmentRow(adj.id, adj.target_date, adj.adjustment_type, adj.amount_hours)
+            )
+
+        return [
+            UserReportInput(
+                user_id=user.id,
+                user_name=user.name,
+                schedules=tuple((s.day_of_week, s.daily_hours) for s in user.schedules),
+                punches=tuple(punches_by_user.get(user.id, ())),
+                adjustments=tuple(adjustments_by_user.get(user.id, ()))
+            )
+            for user in users
+        ]
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=settings.REPORT_PARALLEL_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def _build_reports(self, inputs: List[UserReportInput],
+                       period: ReportPeriod) -> List[AdvancedUserReportResponse]:
+        workers = settings.REPORT_PARALLEL_WORKERS
+        if workers <= 1 or len(inputs) < settings.REPORT_PARALLEL_MIN_USERS:
+            return build_user_reports(inputs, period)
+
+        chunk_size = -(-len(inputs) // (workers * 4))
+        chunks = [inputs[i:i + chunk_size] for i in range(0, len(inputs), chunk_size)]
+        try:
+            reports = []
+            for part in self._get_pool().map(build_user_reports, chunks, repeat(period, len(chunks))):
+                reports.extend(part)
+            return reports
+        except BrokenProcessPool as e:
+            logger.error(f"Pool de processos de relatórios indisponível, calculando em série: {e}")
+            with self._pool_lock:
+                self._pool = None
+            return build_user_reports(inputs, period)
+
+    def get_user_reports(self, db: Session, users: List[User], month: int, year: int,
+                         current_user: Optional[User] = None) -> List[AdvancedUserReportResponse]:
+        start_date, end_date = self._get_month_range(month, year)
+        period = self._get_report_period(db, start_date, end_date, current_user)
+        return self._build_reports(self._load_report_inputs(db, users, start_date, end_date), period)
 
     def get_advanced_user_report(self, db: Session, user_id: int, month: int, year: int,
                                  current_user: Optional[User] = None) -> Optional[AdvancedUserReportResponse]:
-        start_date, end_date = self._get_month_range(month, year)
         user = user_repository.get(db, user_id)
         if not user:
             return None
 
-        has_schedule = bool(user.schedules)
-
-        tz = ZoneInfo(settings.TIMEZONE)
-        today_date = datetime.now(tz).date()
-
-        start_dt = datetime.combine(start_date, datetime.min.time(), tzinfo=tz)
-        end_dt = datetime.combine(end_date, datetime.max.time(), tzinfo=tz)
-
-        all_records = time_record_repository.get_by_range(db, user_id, start_dt, end_dt)
-        holidays = holiday_repository.get_by_month(db, month, year)
-        approved_adjustments = adjustment_repository.get_approved_by_range(db, user_id, start_date, end_date)
-
-        daily_details = []
-
-        total_worked_seconds = 0.0
-        total_expected_seconds = 0.0
-
-        total_extra_hours = 0.0
-        total_missing_hours = 0.0
-
-        days_worked_count = 0
-        absences_count = 0
-
-        is_maintainer = current_user is not None and current_user.role == UserRole.MAINTAINER
-
-        current = start_date
-        while current <= end_date:
-            is_future = current > today_date
-
-            day_records = [r for r in all_records if r.record_datetime.date() == current]
-            day_records.sort(key=lambda x: x.record_datetime)
-
-            is_holiday = any(h.date == current for h in holidays)
-
-            adjustment_day = next((adj for adj in approved_adjustments
-                                   if adj.target_date == current
-                                   and adj.adjustment_type in [AdjustmentType.CERTIFICATE, AdjustmentType.WAIVER]),
-                                  None)
-
-            is_certificate = adjustment_day is not None and adjustment_day.adjustment_type == AdjustmentType.CERTIFICATE
-            is_waiver = adjustment_day is not None and adjustment_day.adjustment_type == AdjustmentType.WAIVER
-
-            adj_id = adjustment_day.id if adjustment_day else None
-
-            is_excused = is_certificate or is_waiver
-
-            weekday = current.weekday()
-            is_weekend = weekday >= 5
-
-            expected_seconds = 0.0
-            if has_schedule and not is_holiday and not is_future:
-                schedule = next((s for s in user.schedules if s.day_of_week == weekday), None)
-                if schedule:
-                    expected_seconds = schedule.daily_hours * 3600
-
-            entries = []
-            exits = []
-            punches = []
-            detailed_punches = []
-            worked_seconds = 0.0
-            entry_time = None
-
-            for rec in day_records:
-                time_str = rec.record_datetime.strftime("%H:%M")
-                suffix = "(E)" if rec.record_type == RecordType.ENTRY else "(S)"
-                punches.append(f"{time_str} {suffix}")
-
-                if is_maintainer:
-                    detailed_punches.append(PunchDetail(
-                        id=rec.id,
-                        time=rec.record_datetime.strftime("%H:%M:%S"),
-                        record_type=rec.record_type.value,
-                        ip_address=rec.ip_address,
-                        device_name=rec.device_name,
-                        platform=rec.platform,
-                        is_manual=rec.is_manual,
-                        is_time_verified=rec.is_time_verified,
-                        biometric_id=rec.biometric_id,
-                        original_timestamp=rec.original_timestamp,
-                        edited_by=rec.edited_by,
-                        edit_justification=rec.edit_justification.value if rec.edit_justification else None,
-                        edit_reason=rec.edit_reason
-                    ))
-
-                if rec.record_type == RecordType.ENTRY:
-                    entries.append(time_str)
-                    entry_time = rec.record_datetime
-                elif rec.record_type == RecordType.EXIT:
-                    exits.append(time_str)
-                    if entry_time:
-                        delta = rec.record_datetime - entry_time
-                        seconds = delta.total_seconds()
-                        if seconds <= 86400:
-                            worked_seconds += seconds
-                        entry_time = None
-
-            waiver_credit = 0.0
-            if is_excused:
-                if adjustment_day.amount_hours and adjustment_day.amount_hours > 0:
-                    waiver_credit = adjustment_day.amount_hours * 3600
-                else:
-                    if expected_seconds > 0 and worked_seconds < expected_seconds:
-                        waiver_credit = expected_seconds - worked_seconds
-                worked_seconds += waiver_credit
-
-            if worked_seconds > 0:
-                days_worked_count += 1
-
-            if worked_seconds == 0 and expected_seconds > 0 and not is_weekend and not is_holiday and not is_excused and not is_future:
-                absences_count += 1
-
-            day_worked_hours = worked_seconds / 3600.0
-            day_expected_hours = expected_seconds / 3600.0
-
-            day_balance = 0.0
-            if has_schedule:
-                day_balance = day_worked_hours - day_expected_hours
-
-            day_extra = day_balance if day_balance > 0 else 0.0
-            day_missing = abs(day_balance) if day_balance < 0 else 0.0
-
-            total_worked_seconds += worked_seconds
-            total_expected_seconds += expected_seconds
-
-            total_extra_hours += day_extra
-            total_missing_hours += day_missing
-
-            status = "Normal"
-            if is_future:
-                status = ""
-            elif is_waiver:
-                formatted_waiver = self._format_duration(waiver_credit)
-                status = f"Abonado ({formatted_waiver})"
-            elif is_certificate:
-                formatted_waiver = self._format_duration(waiver_credit)
-                status = f"Atestado ({formatted_waiver})"
-            elif is_holiday:
-                status = "Feriado"
-            elif is_weekend:
-                if worked_seconds > 0:
-                    status = "Normal"
-                else:
-                    status = "Fim de Semana"
-            elif worked_seconds == 0 and expected_seconds > 0:
-                status = "Falta"
-            elif not has_schedule and worked_seconds == 0:
-                status = "-"
-
-            worked_minutes_int = int(round(worked_seconds / 60))
-
-            daily_details.append(DailyReportItem(
-                date=current,
-                day_name=self._get_day_name(current),
-                is_holiday=is_holiday,
-                is_weekend=is_weekend,
-                status=status,
-                entries=entries,
-                exits=exits,
-                punches=punches,
-                detailed_punches=detailed_punches if is_maintainer else None,
-
-                adjustment_id=adj_id,
-
-                worked_hours=round(day_worked_hours, 2),
-                expected_hours=round(day_expected_hours, 2),
-                balance_hours=round(day_balance, 2),
-                extra_hours=round(day_extra, 2),
-                missing_hours=round(day_missing, 2),
-
-                worked_minutes=worked_minutes_int,
-                worked_time=self._format_duration(worked_seconds),
-                expected_time=self._format_duration(expected_seconds)
-            ))
-
-            current += timedelta(days=1)
-
-        summary = UserPayrollSummary(
-            user_id=user.id,
-            user_name=user.name,
-            total_worked_time=self._format_duration(total_worked_seconds),
-            total_expected_time=self._format_duration(total_expected_seconds),
-
-            total_worked_minutes=int(round(total_worked_seconds / 60)),
-            total_expected_minutes=int(round(total_expected_seconds / 60)),
-
-            days_worked=days_worked_count,
-            absences=absences_count,
-
-            total_worked_hours=round(total_worked_seconds / 3600.0, 2),
-            total_expected_hours=round(total_expected_seconds / 3600.0, 2),
-            total_extra_hours=round(total_extra_hours, 2),
-            total_missing_hours=round(total_missing_hours, 2),
-            final_balance=round(total_extra_hours - total_missing_hours, 2)
-        )
-
-        return AdvancedUserReportResponse(summary=summary, daily_details=daily_details)
+        return self.get_user_reports(db, [user], month, year, current_user)[0]
 
     def get_monthly_summary(self, db: Session, month: int, year: int,
                             employee_ids: Optional[List[int]] = None,
@@ -288,13 +153,18 @@ class ReportService:
         query = self._apply_employee_filters(query, employee_ids)
         users = query.all()
 
-        payroll_data = []
-        for user in users:
-            report = self.get_advanced_user_report(db, user.id, month, year, current_user)
-            if report and report.summary.total_worked_minutes > 0:
-                payroll_data.append(report.summary)
+        payroll_data = [
+            report.summary for report in self.get_user_reports(db, users, month, year, current_user)
+            if report.summary.total_worked_minutes > 0
+        ]
         return MonthlyReportResponse(month=month, year=year, payroll_data=payroll_data)
 
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
     def generate_excel_report(self, db: Session, month: int, year: int, employee_ids: Optional[List[int]] = None,
                               current_user: Optional[User] = None) -> BytesIO:
         query = db.query(User)
@@ -335,11 +205,12 @@ class ReportService:
             cell.alignment = Alignment(horizontal='center')
             cell.border = border
 
-        for user in users:
-            report = self.get_advanced_user_report(db, user.id, month, year, current_user)
-            if not report or report.summary.total_worked_minutes == 0:
-                continue
+        reports = [
+            (user, report) for user, report in zip(users, self.get_user_reports(db, users, month, year, current_user))
+            if report.summary.total_worked_minutes > 0
+        ]
 
+        for user, report in reports:
             sum_data = report.summary
             ws_summary.append([
                 sum_data.user_name,
@@ -362,11 +233,7 @@ class ReportService:
                     pass
             ws_summary.column_dimensions[column].width = max_length + 3
 
-        for user in users:
-            report = self.get_advanced_user_report(db, user.id, month, year, current_user)
-            if not report or report.summary.total_worked_minutes == 0:
-                continue
-
+        for user, report in reports:
             sheet_name = f"{user.id}-{user.name.split()[0]}"[:30]
             ws_det = wb.create_sheet(title=sheet_name)
 
@@ -2,16 +2,22 @@ import logging
 import os
 import sqlite3
 from datetime import datetime
+from time import perf_counter
 from zoneinfo import ZoneInfo
 
 import requests
 from fastapi import UploadFile, HTTPException
 
 from app.core.config import settings
+from app.core.metrics import SYNC_DURATION, SYNC_SIZE, SYNC_RECORDS
 from app.database.session import engine, SessionLocal
 from app.domain.models.routine_log import RoutineLog
 from app.repositories.time_record_repository import time_record_repository
 from app.services.backup_service import backup_service
+from app.services.biometric_routing import biometric_routing
+from app.services.dashboard_service import dashboard_service
+from app.services.holiday_calendar import holiday_calendar
+from app.services.punch_state import punch_state
 
 logger = logging.getLogger(__name__)
 
@@ -37,9 +43,11 @@ class SyncService:
         wal_path = "spe.db-wal"
         shm_path = "spe.db-shm"
 
+        started = perf_counter()
         try:
             with open(temp_path, "wb") as buffer:
                 buffer.write(file.file.read())
+            SYNC_SIZE.labels("receive_database").set(os.path.getsize(temp_path))
 
             if not self._check_sqlite_integrity(temp_path):
                 os.remove(temp_path)
@@ -53,6 +61,12 @@ class SyncService:
             if os.path.exists(shm_path):
                 os.remove(shm_path)
 
+            holiday_calendar.invalidate()
+            biometric_routing.invalidate()
+            punch_state.invalidate()
+            dashboard_service.invalidate()
+
+            SYNC_DURATION.labels("receive_database").observe(perf_counter() - started)
             logger.info('Sincronização - "Receber banco de dados" OK')
         except Exception as e:
             if os.path.exists(temp_path):
@@ -86,11 +100,14 @@ class SyncService:
         finally:
             db_read.close()
 
-        backup_path = backup_service._create_safe_backup("spe.db")
+        backup_path = backup_service._create_safe_backup("spe.db", kind="sync")
         if not backup_path:
             logger.error('Sincronização - "Enviar banco de dados" Error')
             return
 
+        started = perf_counter()
+        SYNC_SIZE.labels("send_database").set(os.path.getsize(backup_path))
+
         db_write = SessionLocal()
         try:
             url = f"{settings.CONSUMER_SERVER_URL.rstrip('/')}{settings.API_V1_STR}/sync/database"
@@ -99,6 +116,7 @@ class SyncService:
                 files = {"file": ("spe.db", f, "application/octet-stream")}
                 response = requests.post(url, headers=headers, files=files, timeout=60)
                 response.raise_for_status()
+            SYNC_DURATION.labels("send_database").observe(perf_counter() - started)
 
             log_entry = RoutineLog(
                 routine_type="REMOTE_SYNC_DATABASE",
@@ -159,12 +177,19 @@ class SyncService:
             db_read.close()
 
         db_write = SessionLocal()
+        started = perf_counter()
         try:
+            synced_ids = []
             for rec in records_data:
                 payload = {"user_id": rec["user_id"], "timestamp": rec["timestamp"]}
                 res = requests.post(f"{settings.CONSUMER_SERVER_URL}/sync", json=payload, timeout=10)
                 if res.status_code == 200:
-                    time_record_repository.mark_as_synced(db_write, rec["id"])
+                    synced_ids.append(rec["id"])
+
+            time_record_repository.mark_as_synced(db_write, synced_ids)
+            SYNC_RECORDS.labels("synced").inc(len(synced_ids))
+            SYNC_RECORDS.labels("failed").inc(len(records_data) - len(synced_ids))
+            SYNC_DURATION.labels("sync_records").observe(perf_counter() - started)
 
             log_entry = RoutineLog(
                 routine_type="SYNC_TIME_RECORDS",
@@ -4,6 +4,7 @@ import sqlite3
 import threading
 import uuid
 from datetime import datetime, timedelta, date, time
+from time import perf_counter
 from typing import Dict, List
 from zoneinfo import ZoneInfo
 
@@ -12,6 +13,8 @@ from sqlalchemy import desc
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.metrics import BACKUP_DURATION, BACKUP_SIZE
+from app.core.request_context import track_external
 from app.database.session import SessionLocal
 from app.domain.models.enums import RecordType
 from app.domain.models.routine_log import RoutineLog
@@ -35,6 +38,7 @@ class TelegramService:
         if not os.path.exists(self.db_path):
             return None
 
+        started = perf_counter()
         try:
             tz = ZoneInfo(settings.TIMEZONE)
             timestamp = datetime.now(tz).strftime('%Y%m%d_%H%M%S')
@@ -49,6 +53,8 @@ class TelegramService:
             dst_conn.close()
             src_conn.close()
 
+            BACKUP_DURATION.labels("telegram").observe(perf_counter() - started)
+            BACKUP_SIZE.labels("telegram").set(os.path.getsize(backup_filename))
             return backup_filename
         except Exception:
             return None
@@ -64,7 +70,8 @@ class TelegramService:
                 "text": text,
                 "parse_mode": "HTML"
             }
-            response = requests.post(url, data=payload, timeout=15)
+            with track_external("telegram"):
+                response = requests.post(url, data=payload, timeout=15)
             is_success = 200 <= response.status_code <= 299
             if not is_success:
                 logger.error(f"Telegram API Error (Text): Status {response.status_code} - {response.text}")
@@ -82,7 +89,8 @@ class TelegramService:
             with open(file_path, "rb") as file:
                 payload = {"chat_id": self.chat_id, "caption": caption}
                 files = {"document": file}
-                response = requests.post(url, data=payload, files=files, timeout=40)
+                with track_external("telegram"):
+                    response = requests.post(url, data=payload, files=files, timeout=40)
             is_success = 200 <= response.status_code <= 299
             if not is_success:
                 logger.error(f"Telegram API Error (Document): Status {response.status_code} - {response.text}")
@@ -1,5 +1,6 @@
-from datetime import datetime
-from typing import Optional
+from contextlib import ExitStack
+from datetime import datetime, date, time, timedelta
+from typing import NamedTuple, Optional, List, Tuple
 from zoneinfo import ZoneInfo
 
 import ntplib
@@ -7,23 +8,52 @@ from fastapi import HTTPException, status, Request
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.request_context import track_external
 from app.core.security import get_client_ip, get_client_device_name
+from app.database.unit_of_work import unit_of_work
 from app.domain.models.enums import RecordType, UserRole
 from app.domain.models.time_record import TimeRecord, ManualAdjustment
 from app.domain.models.user import User
 from app.repositories.time_record_repository import time_record_repository
 from app.repositories.user_repository import user_repository
 from app.schemas.time_record import TimeRecordUpdate, TimeRecordCreateAdmin, TimeRecordDeleteAdmin
+from app.services.anomaly_service import anomaly_service
 from app.services.audit_service import audit_service
+from app.services.dashboard_service import dashboard_service
+from app.services.event_bus import event_bus
+from app.services.hour_bank_service import hour_bank_service
 from app.services.payroll_service import payroll_service
+from app.services.punch_state import punch_state, PunchState, NO_PUNCH
+
+
+class DevicePunch(NamedTuple):
+    sequence: int
+    user_id: int
+    biometric_id: int
+    timestamp: datetime
 
 
 class TimeRecordService:
+    def _refresh_derived(self, db: Session, user_days: List[tuple]):
+        anomaly_service.refresh_user_days(db, user_days)
+        hour_bank_service.refresh_user_days(db, user_days)
+
+    def _publish_punch(self, action: str, record_id: Optional[int], user_id: int, record_type: RecordType,
+                       record_datetime: datetime):
+        event_bus.publish("punch", {
+            "action": action,
+            "id": record_id,
+            "user_id": user_id,
+            "record_type": record_type,
+            "record_datetime": record_datetime
+        })
+
     def _get_trusted_time(self):
         tz = ZoneInfo(settings.TIMEZONE)
         try:
             client = ntplib.NTPClient()
-            response = client.request('pool.ntp.org', version=3, timeout=2)
+            with track_external("ntp"):
+                response = client.request('pool.ntp.org', version=3, timeout=2)
             utc_time = datetime.fromtimestamp(response.tx_time, ZoneInfo("UTC"))
             return utc_time.astimezone(tz), True
         except Exception:
@@ -62,10 +92,16 @@ class TimeRecordService:
         platform = request.headers.get("X-Platform", "desktop").lower()
         payroll_service.validate_period_open(db, current_time.date())
 
-        return time_record_repository.create(
-            db, user_id, RecordType.ENTRY, current_time, ip_address, device_name, platform=platform,
-            is_time_verified=is_verified
-        )
+        with unit_of_work(db):
+            record = time_record_repository.create(
+                db, user_id, RecordType.ENTRY, current_time, ip_address, device_name, platform=platform,
+                is_time_verified=is_verified
+            )
+            self._refresh_derived(db, [(user_id, current_time)])
+        punch_state.invalidate(user_id)
+        dashboard_service.on_punch(user_id, current_time)
+        self._publish_punch("CREATED", record.id, user_id, record.record_type, current_time)
+        return record
 
     def register_exit(self, db: Session, user_id: int, request: Request) -> TimeRecord:
         self._validate_manual_punch_permission(db, user_id, request)
@@ -76,10 +112,16 @@ class TimeRecordService:
         platform = request.headers.get("X-Platform", "desktop").lower()
         payroll_service.validate_period_open(db, current_time.date())
 
-        return time_record_repository.create(
-            db, user_id, RecordType.EXIT, current_time, ip_address, device_name, platform=platform,
-            is_time_verified=is_verified
-        )
+        with unit_of_work(db):
+            record = time_record_repository.create(
+                db, user_id, RecordType.EXIT, current_time, ip_address, device_name, platform=platform,
+                is_time_verified=is_verified
+            )
+            self._refresh_derived(db, [(user_id, current_time)])
+        punch_state.invalidate(user_id)
+        dashboard_service.on_punch(user_id, current_time)
+        self._publish_punch("CREATED", record.id, user_id, record.record_type, current_time)
+        return record
 
     def toggle_record_type(self, db: Session, record_id: int, current_user: User) -> TimeRecord:
         record = time_record_repository.get(db, record_id)
@@ -105,60 +147,107 @@ class TimeRecordService:
             adjusted_by_user_id=current_user.id
         )
 
-        db.add(adjustment)
-        db.add(record)
-        db.commit()
-        db.refresh(record)
-
-        audit_service.log(
-            db,
-            actor_id=current_user.id,
-            target_user_id=record.user_id,
-            action="TOGGLE_RECORD",
-            entity="TIME_RECORD",
-            entity_id=record.id,
-            old_data={"record_type": previous_type.value},
-            new_data={"record_type": new_type.value}
-        )
+        with unit_of_work(db):
+            db.add(adjustment)
+            db.add(record)
+            db.flush()
+
+            audit_service.log(
+                db,
+                actor_id=current_user.id,
+                target_user_id=record.user_id,
+                action="TOGGLE_RECORD",
+                entity="TIME_RECORD",
+                entity_id=record.id,
+                old_data={"record_type": previous_type.value},
+                new_data={"record_type": new_type.value}
+            )
+            self._refresh_derived(db, [(record.user_id, record.record_datetime)])
+        punch_state.invalidate(record.user_id)
+        self._publish_punch("UPDATED", record.id, record.user_id, new_type, record.record_datetime)
         return record
 
     def create_admin_record(self, db: Session, obj_in: TimeRecordCreateAdmin, manager_id: int,
                             ip_address: str, device_name: Optional[str]) -> TimeRecord:
         payroll_service.validate_period_open(db, obj_in.record_datetime.date())
 
-        record = time_record_repository.create(
-            db, user_id=obj_in.user_id, record_type=obj_in.record_type,
-            record_datetime=obj_in.record_datetime, ip_address=ip_address,
-            device_name=device_name if device_name else "",
-            platform="desktop",
-            is_time_verified=True
-        )
-        record.is_manual = True
-        record.edited_by = manager_id
-        record.edit_justification = obj_in.edit_justification
-        record.edit_reason = obj_in.edit_reason
-        db.add(record)
-        db.commit()
-        db.refresh(record)
-
         justification_val = obj_in.edit_justification.value if obj_in.edit_justification else ""
 
-        audit_service.log(
-            db,
-            actor_id=manager_id,
-            target_user_id=obj_in.user_id,
-            action="CREATE_RECORD_ADMIN",
-            entity="TIME_RECORD",
-            entity_id=record.id,
-            new_data={
-                "record_time": str(obj_in.record_datetime),
-                "record_type": obj_in.record_type.value,
-                "justification": justification_val,
-                "reason": obj_in.edit_reason
-            }
-        )
+        with unit_of_work(db):
+            record = time_record_repository.create(
+                db, user_id=obj_in.user_id, record_type=obj_in.record_type,
+                record_datetime=obj_in.record_datetime, ip_address=ip_address,
+                device_name=device_name if device_name else "",
+                platform="desktop",
+                is_time_verified=True,
+                is_manual=True,
+                edited_by=manager_id,
+                edit_justification=obj_in.edit_justification,
+                edit_reason=obj_in.edit_reason
+            )
+
+            audit_service.log(
+                db,
+                actor_id=manager_id,
+                target_user_id=obj_in.user_id,
+                action="CREATE_RECORD_ADMIN",
+                entity="TIME_RECORD",
+                entity_id=record.id,
+                new_data={
+                    "record_time": str(obj_in.record_datetime),
+                    "record_type": obj_in.record_type.value,
+                    "justification": justification_val,
+                    "reason": obj_in.edit_reason
+                }
+            )
+            self._refresh_derived(db, [(obj_in.user_id, obj_in.record_datetime)])
+        punch_state.invalidate(obj_in.user_id)
+        dashboard_service.on_punch(obj_in.user_id, obj_in.record_datetime)
+        self._publish_punch("CREATED", record.id, obj_in.user_id, obj_in.record_type, obj_in.record_datetime)
         return record
 
+    def import_admin_records(self, db: Session, records_in: List[TimeRecordCreateAdmin], manager_id: int,
+                             ip_address: str, device_name: Optional[str]) -> int:
+        periods = {(r.record_datetime.year, r.record_datetime.month) for r in records_in}
+        for year, month in sorted(periods):
+            payroll_service.validate_period_open(db, date(year, month, 1))
+
+        rows = [
+            {
+                "user_id": r.user_id,
+                "record_type": r.record_type,
+                "record_datetime": r.record_datetime,
+                "ip_address": ip_address,
+                "device_name": device_name if device_name else "",
+                "platform": "desktop",
+                "is_time_verified": True,
+                "is_manual": True,
+                "edited_by": manager_id,
+                "edit_justification": r.edit_justification,
+                "edit_reason": r.edit_reason
+            }
+            for r in records_in
+        ]
+        with unit_of_work(db):
+            imported = time_record_repository.copy_import(db, rows)
+
+            audit_service.log(
+                db,
+                actor_id=manager_id,
+                action="IMPORT_RECORDS_ADMIN",
+                entity="TIME_RECORD",
+                new_data={
+                    "count": imported,
+                    "user_ids": sorted({r.user_id for r in records_in})
+                }
+            )
+            self._refresh_derived(db, [(r.user_id, r.record_datetime) for r in records_in])
+        for r in records_in:
+            punch_state.invalidate(r.user_id)
+            dashboard_service.on_punch(r.user_id, r.record_datetime)
+            self._publish_punch("CREATED", None, r.user_id, r.record_type, r.record_datetime)
+        return imported
+
     def update_admin_record(self, db: Session, record_id: int, obj_in: TimeRecordUpdate, manager_id: int) -> TimeRecord:
         record = time_record_repository.get(db, record_id)
         if not record:
@@ -171,36 +260,44 @@ class TimeRecordService:
             record.original_timestamp = record.record_datetime
 
         employee_id = record.user_id
+        previous_datetime = record.record_datetime
 
         old_data = {
             "record_type": record.record_type.value,
             "record_time": str(record.record_datetime)
         }
 
-        updated = time_record_repository.update(db, record, obj_in)
-        updated.is_manual = True
-        updated.edited_by = manager_id
-        db.add(updated)
-        db.commit()
-        db.refresh(updated)
-
-        justification_val = updated.edit_justification.value if updated.edit_justification else ""
-
-        audit_service.log(
-            db,
-            actor_id=manager_id,
-            target_user_id=employee_id,
-            action="UPDATE_RECORD_ADMIN",
-            entity="TIME_RECORD",
-            entity_id=record.id,
-            old_data=old_data,
-            new_data={
-                "record_type": updated.record_type.value,
-                "record_time": str(updated.record_datetime),
-                "justification": justification_val,
-                "reason": updated.edit_reason
-            }
-        )
+        update_data = obj_in.model_dump(exclude_unset=True)
+        update_data["is_manual"] = True
+        update_data["edited_by"] = manager_id
+
+        with unit_of_work(db):
+            updated = time_record_repository.update(db, record, update_data)
+
+            justification_val = updated.edit_justification.value if updated.edit_justification else ""
+
+            audit_service.log(
+                db,
+                actor_id=manager_id,
+                target_user_id=employee_id,
+                action="UPDATE_RECORD_ADMIN",
+                entity="TIME_RECORD",
+                entity_id=record.id,
+                old_data=old_data,
+                new_data={
+                    "record_type": updated.record_type.value,
+                    "record_time": str(updated.record_datetime),
+                    "justification": justification_val,
+                    "reason": updated.edit_reason
+                }
+            )
+            self._refresh_derived(db, [
+                (employee_id, previous_datetime),
+                (employee_id, updated.record_datetime)
+            ])
+        punch_state.invalidate(employee_id)
+        dashboard_service.refresh_presence(db, employee_id)
+        self._publish_punch("UPDATED", record_id, employee_id, updated.record_type, updated.record_datetime)
         return updated
 
     def delete_admin_record(self, db: Session, record_id: int, obj_in: TimeRecordDeleteAdmin, manager_id: int):
@@ -210,6 +307,8 @@ class TimeRecordService:
         payroll_service.validate_period_open(db, record.record_datetime.date())
 
         target_id = record.user_id
+        record_datetime = record.record_datetime
+        old_record_type = record.record_type
         justification_val = obj_in.edit_justification.value if obj_in.edit_justification else ""
 
         old_data = {
@@ -217,56 +316,159 @@ class TimeRecordService:
             "record_time": str(record.record_datetime)
         }
 
-        time_record_repository.delete(db, record_id)
-
-        audit_service.log(
-            db,
-            actor_id=manager_id,
-            target_user_id=target_id,
-            action="DELETE_RECORD_ADMIN",
-            entity="TIME_RECORD",
-            entity_id=record_id,
-            old_data=old_data,
-            new_data={
-                "justification": justification_val,
-                "reason": obj_in.edit_reason
-            }
-        )
+        with unit_of_work(db):
+            time_record_repository.delete(db, record_id)
+
+            audit_service.log(
+                db,
+                actor_id=manager_id,
+                target_user_id=target_id,
+                action="DELETE_RECORD_ADMIN",
+                entity="TIME_RECORD",
+                entity_id=record_id,
+                old_data=old_data,
+                new_data={
+                    "justification": justification_val,
+                    "reason": obj_in.edit_reason
+                }
+            )
+            self._refresh_derived(db, [(target_id, record_datetime)])
+        punch_state.invalidate(target_id)
+        dashboard_service.refresh_presence(db, target_id)
+        self._publish_punch("DELETED", record_id, target_id, old_record_type, record_datetime)
+
+    def _to_local(self, value: datetime) -> datetime:
+        tz = ZoneInfo(settings.TIMEZONE)
+        if value.tzinfo is None:
+            return value.replace(tzinfo=tz)
+        return value.astimezone(tz)
 
-    def create_punch(self, db: Session, user_id: int, timestamp: datetime, ip_address: str,
-                     biometric_id: Optional[int] = None, platform: str = "desktop") -> TimeRecord:
-        last_record = time_record_repository.get_last_by_user(db, user_id)
+    def _load_punch_state(self, db: Session, user_id: int) -> PunchState:
+        state = punch_state.get(user_id)
+        if state is not None:
+            return state
 
-        record_type = RecordType.ENTRY
-        if last_record and last_record.record_type == RecordType.ENTRY:
-            tz = ZoneInfo(settings.TIMEZONE)
+        last_record = time_record_repository.get_last_by_user(db, user_id)
+        if not last_record:
+            return NO_PUNCH
+        return PunchState(last_record.record_type, self._to_local(last_record.record_datetime).date(),
+                          last_record.record_datetime)
 
-            last_time = last_record.record_datetime
-            if last_time.tzinfo is None:
-                last_time = last_time.replace(tzinfo=ZoneInfo("UTC"))
-            last_local_date = last_time.astimezone(tz).date()
+    def create_punch(self, db: Session, user_id: int, timestamp: datetime, ip_address: str,
+                     biometric_id: Optional[int] = None, platform: str = "desktop") -> TimeRecord:
+        device_name = get_client_device_name(ip_address)
+        curr_local_date = self._to_local(timestamp).date()
 
-            curr_time = timestamp
-            if curr_time.tzinfo is None:
-                curr_time = curr_time.replace(tzinfo=ZoneInfo("UTC"))
-            curr_local_date = curr_time.astimezone(tz).date()
+        with punch_state.user_lock(user_id):
+            state = self._load_punch_state(db, user_id)
 
-            if last_local_date == curr_local_date:
+            record_type = RecordType.ENTRY
+            if state.record_type == RecordType.ENTRY and state.local_date == curr_local_date:
                 record_type = RecordType.EXIT
 
-        device_name = get_client_device_name(ip_address)
+            try:
+                with unit_of_work(db):
+                    record = time_record_repository.create(
+                        db,
+                        user_id=user_id,
+                        record_type=record_type,
+                        record_datetime=timestamp,
+                        ip_address=ip_address,
+                        device_name=device_name,
+                        platform=platform,
+                        is_time_verified=True,
+                        biometric_id=biometric_id
+                    )
+                    self._refresh_derived(db, [(user_id, timestamp)])
+            except Exception:
+                punch_state.invalidate(user_id)
+                raise
+            punch_state.set(user_id, PunchState(record_type, curr_local_date, timestamp))
+
+        dashboard_service.on_punch(user_id, timestamp)
+        self._publish_punch("CREATED", record.id, user_id, record_type, timestamp)
+        return record
 
-        return time_record_repository.create(
-            db,
-            user_id=user_id,
-            record_type=record_type,
-            record_datetime=timestamp,
-            ip_address=ip_address,
-            device_name=device_name,
-            platform=platform,
-            is_time_verified=True,
-            biometric_id=biometric_id
-        )
+    def create_device_punches(self, db: Session, device_id: int, punches: List[DevicePunch],
+                              ip_address: str) -> Tuple[List[int], List[int]]:
+        punches = [p._replace(timestamp=self._to_local(p.timestamp)) for p in punches]
+        user_ids = sorted({p.user_id for p in punches})
+        device_name = get_client_device_name(ip_address)
+        window = timedelta(seconds=settings.PUNCH_DEDUP_WINDOW_SECONDS)
+
+        accepted, duplicates, created = [], [], []
+        with ExitStack() as stack:
+            for user_id in user_ids:
+                stack.enter_context(punch_state.user_lock(user_id))
+
+            seen = time_record_repository.get_device_sequences(db, device_id, [p.sequence for p in punches])
+            pending = []
+            for p in punches:
+                if p.sequence in seen:
+                    duplicates.append(p.sequence)
+                    continue
+                seen.add(p.sequence)
+                pending.append(p)
+
+            if not pending:
+                return accepted, duplicates
+
+            user_days = {(p.user_id, p.timestamp.date()) for p in pending}
+            dt_start = datetime.combine(min(day for _, day in user_days), time.min)
+            dt_end = datetime.combine(max(day for _, day in user_days), time.max)
+
+            timelines = {}
+            for p in pending:
+                timelines.setdefault((p.user_id, p.timestamp.date()), []).append((p.timestamp, 1, p.sequence, p))
+
+            try:
+                with unit_of_work(db):
+                    for record in time_record_repository.get_by_users_and_range(db, user_ids, dt_start, dt_end):
+                        local_time = self._to_local(record.record_datetime)
+                        if (record.user_id, local_time.date()) in user_days:
+                            timelines[(record.user_id, local_time.date())].append((local_time, 0, record.id, record))
+
+                    rows = []
+                    for key in sorted(timelines):
+                        previous_type, previous_device_time = None, None
+                        for local_time, is_new, _, item in sorted(timelines[key], key=lambda e: e[:3]):
+                            if not is_new:
+                                is_device_punch = not item.is_manual and item.biometric_id is not None
+                                previous_type = item.record_type
+                                previous_device_time = local_time if is_device_punch else None
+                                continue
+
+                            if previous_device_time is not None and local_time - previous_device_time < window:
+                                duplicates.append(item.sequence)
+                                continue
+
+                            record_type = RecordType.EXIT if previous_type == RecordType.ENTRY else RecordType.ENTRY
+                            rows.append({
+                                "user_id": item.user_id,
+                                "record_type": record_type,
+                                "record_datetime": local_time,
+                                "ip_address": ip_address,
+                                "device_name": device_name,
+                                "platform": "IOT",
+                                "is_time_verified": False,
+                                "biometric_id": item.biometric_id,
+                                "device_id": device_id,
+                                "device_sequence": item.sequence
+                            })
+                            accepted.append(item.sequence)
+                            previous_type, previous_device_time = record_type, local_time
+
+                    record_ids = time_record_repository.bulk_create(db, rows)
+                    created = list(zip(record_ids, rows))
+                    self._refresh_derived(db, list(user_days))
+            finally:
+                for user_id in user_ids:
+                    punch_state.invalidate(user_id)
+
+        for record_id, row in created:
+            dashboard_service.on_punch(row["user_id"], row["record_datetime"])
+            self._publish_punch("CREATED", record_id, row["user_id"], row["record_type"], row["record_datetime"])
+        return accepted, duplicates
 
 
 time_record_service = TimeRecordService()
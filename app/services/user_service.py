@@ -2,11 +2,16 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from app.core.security import get_password_hash
+from app.core.token_revocation import token_revocation
+from app.database.unit_of_work import unit_of_work
 from app.domain.models.biometric import UserBiometric
 from app.domain.models.user import User, WorkSchedule
 from app.repositories.user_repository import user_repository
 from app.schemas.user import UserCreate, UserUpdate
 from app.services.audit_service import audit_service
+from app.services.biometric_routing import biometric_routing
+from app.services.dashboard_service import dashboard_service
+from app.services.hour_bank_service import hour_bank_service
 
 
 class UserService:
@@ -76,19 +81,21 @@ class UserService:
                 )
                 db_user.biometrics.append(db_bio)
 
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-
-        audit_service.log(
-            db, actor_id=current_user_id, target_user_id=db_user.id, action="CREATE",
-            entity="USER", entity_id=db_user.id,
-            new_data={
-                "username": db_user.username,
-                "role": db_user.role,
-                "name": db_user.name
-            }
-        )
+        with unit_of_work(db):
+            db.add(db_user)
+            db.flush()
+
+            audit_service.log(
+                db, actor_id=current_user_id, target_user_id=db_user.id, action="CREATE",
+                entity="USER", entity_id=db_user.id,
+                new_data={
+                    "username": db_user.username,
+                    "role": db_user.role,
+                    "name": db_user.name
+                }
+            )
+        dashboard_service.on_users_changed()
+        biometric_routing.invalidate()
         return db_user
 
     def update_user(self, db: Session, user_id: int, user_in: UserUpdate, current_user_id: int) -> User:
@@ -184,22 +191,28 @@ class UserService:
 
             user.biometrics = new_biometrics_list
 
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+        with unit_of_work(db):
+            db.add(user)
+            db.flush()
 
-        new_data = {
-            "username": user.username,
-            "role": user.role,
-            "name": user.name,
-            "is_active": user.is_active
-        }
+            new_data = {
+                "username": user.username,
+                "role": user.role,
+                "name": user.name,
+                "is_active": user.is_active
+            }
 
-        audit_service.log(
-            db, actor_id=current_user_id, target_user_id=user.id, action="UPDATE",
-            entity="USER", entity_id=user.id,
-            old_data=old_data, new_data=new_data
-        )
+            audit_service.log(
+                db, actor_id=current_user_id, target_user_id=user.id, action="UPDATE",
+                entity="USER", entity_id=user.id,
+                old_data=old_data, new_data=new_data
+            )
+            if schedules_in is not None:
+                hour_bank_service.refresh_schedule_credits(db, [user.id])
+        dashboard_service.on_users_changed()
+        biometric_routing.invalidate()
+        if (user.role, user.is_active) != (old_data["role"], old_data["is_active"]):
+            token_revocation.revoke_user(user.id)
         return user
 
     def disable_user(self, db: Session, user_id: int, current_user_id: int) -> User:
@@ -209,16 +222,19 @@ class UserService:
 
         old_data = {"is_active": user.is_active}
 
-        user.is_active = False
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+        with unit_of_work(db):
+            user.is_active = False
+            db.add(user)
+            db.flush()
 
-        audit_service.log(
-            db, actor_id=current_user_id, target_user_id=user.id, action="DISABLE",
-            entity="USER", entity_id=user.id,
-            old_data=old_data, new_data={"is_active": False}
-        )
+            audit_service.log(
+                db, actor_id=current_user_id, target_user_id=user.id, action="DISABLE",
+                entity="USER", entity_id=user.id,
+                old_data=old_data, new_data={"is_active": False}
+            )
+        dashboard_service.on_users_changed()
+        biometric_routing.invalidate()
+        token_revocation.revoke_user(user.id)
         return user
 
 
@@ -1,60 +1,54 @@
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
+from typing import Dict, List
 from zoneinfo import ZoneInfo
 
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.domain.models.enums import RecordType
-from app.repositories.holiday_repository import holiday_repository
+from app.domain.models.user import User, WorkSchedule
 from app.repositories.time_record_repository import time_record_repository
 from app.repositories.user_repository import user_repository
 from app.schemas.work_hour import WorkHourBalanceResponse
+from app.services.holiday_calendar import holiday_calendar
+from app.services.pairing_kernel import pair_punches, to_columns
 
 
 class WorkHourService:
-    def calculate_balance(self, db: Session, user_id: int, start_date: date, end_date: date) -> WorkHourBalanceResponse:
-        tz = ZoneInfo(settings.TIMEZONE)
-
-        start_dt = datetime.combine(start_date, datetime.min.time(), tzinfo=tz)
-        end_dt = datetime.combine(end_date, datetime.max.time(), tzinfo=tz)
-
-        records = time_record_repository.get_by_range(db, user_id, start_dt, end_dt)
-        user = user_repository.get(db, user_id)
-        holidays = holiday_repository.get_all(db)
-
+    def schedule_hours(self, schedules: List[WorkSchedule]) -> Dict[int, float]:
+        hours = {}
+        for schedule in schedules:
+            hours.setdefault(schedule.day_of_week, schedule.daily_hours)
+        return hours
+
+    def expected_hours(self, schedules: List[WorkSchedule], start_date: date, end_date: date,
+                       holidays: List[date]) -> float:
+        total_days = (end_date - start_date).days + 1
+        if total_days <= 0:
+            return 0.0
+
+        hours_by_weekday = self.schedule_hours(schedules)
+        full_weeks, remainder = divmod(total_days, 7)
+        first_weekday = start_date.weekday()
+
+        expected = 0.0
+        for weekday, daily_hours in hours_by_weekday.items():
+            occurrences = full_weeks + (1 if (weekday - first_weekday) % 7 < remainder else 0)
+            expected += occurrences * daily_hours
+
+        for holiday in holidays:
+            expected -= hours_by_weekday.get(holiday.weekday(), 0.0)
+
+        return expected
+
+    def _build_balance(self, user: User, start_date: date, end_date: date, total_seconds: float,
+                       holidays: List[date]) -> WorkHourBalanceResponse:
         has_schedule = bool(user.schedules)
 
-        total_seconds = 0.0
-        entry_time = None
-
-        for record in records:
-            if record.record_type == RecordType.ENTRY:
-                entry_time = record.record_datetime
-            elif record.record_type == RecordType.EXIT and entry_time:
-                delta = record.record_datetime - entry_time
-                seconds = delta.total_seconds()
-
-                if seconds <= 86400:
-                    total_seconds += seconds
-
-                entry_time = None
-
         total_worked_hours = total_seconds / 3600.0
 
         expected_hours = 0.0
-        current_date = start_date
-
-        while current_date <= end_date:
-            is_holiday = any(h.date == current_date for h in holidays)
-
-            if not is_holiday and has_schedule:
-                weekday = current_date.weekday()
-                schedule = next((s for s in user.schedules if s.day_of_week == weekday), None)
-
-                if schedule:
-                    expected_hours += schedule.daily_hours
-
-            current_date += timedelta(days=1)
+        if has_schedule:
+            expected_hours = self.expected_hours(user.schedules, start_date, end_date, holidays)
 
         if not has_schedule:
             balance = 0.0
@@ -62,7 +56,7 @@ class WorkHourService:
             balance = total_worked_hours - expected_hours
 
         return WorkHourBalanceResponse(
-            user_id=user_id,
+            user_id=user.id,
             start_date=start_date,
             end_date=end_date,
             total_worked_hours=round(total_worked_hours, 2),
@@ -70,5 +64,29 @@ class WorkHourService:
             balance_hours=round(balance, 2)
         )
 
+    def _get_range(self, start_date: date, end_date: date):
+        tz = ZoneInfo(settings.TIMEZONE)
+        start_dt = datetime.combine(start_date, datetime.min.time(), tzinfo=tz)
+        end_dt = datetime.combine(end_date, datetime.max.time(), tzinfo=tz)
+        return start_dt, end_dt
+
+    def calculate_balance(self, db: Session, user_id: int, start_date: date, end_date: date) -> WorkHourBalanceResponse:
+        return self.calculate_balances(db, [user_repository.get(db, user_id)], start_date, end_date)[0]
+
+    def calculate_balances(self, db: Session, users: List[User], start_date: date,
+                           end_date: date) -> List[WorkHourBalanceResponse]:
+        if not users:
+            return []
+
+        start_dt, end_dt = self._get_range(start_date, end_date)
+        rows = time_record_repository.get_punches_by_range(db, start_dt, end_dt, [u.id for u in users])
+        worked_by_user = pair_punches(to_columns(rows), by_day=False, max_pair_seconds=86400).worked_by_user()
+        holidays = holiday_calendar.between(db, start_date, end_date)
+
+        return [
+            self._build_balance(user, start_date, end_date, worked_by_user.get(user.id, 0.0), holidays)
+            for user in users
+        ]
+
 
 work_hour_service = WorkHourService()
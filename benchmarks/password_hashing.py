@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.password_hasher import PasswordHasher
+from app.core.security import get_password_hash, verify_password
+
+
+def run_serial(hashed: str, logins: int) -> float:
+    started = time.perf_counter()
+    for _ in range(logins):
+        verify_password("senha-de-teste", hashed)
+    return time.perf_counter() - started
+
+
+async def run_pool(hashed: str, logins: int, workers: int) -> tuple:
+    settings.PASSWORD_HASH_WORKERS = workers
+    settings.PASSWORD_HASH_QUEUE_SIZE = logins
+    hasher = PasswordHasher()
+
+    started = time.perf_counter()
+    probe_delays = []
+
+    async def probe():
+        while True:
+            tick = time.perf_counter()
+            await asyncio.sleep(0.01)
+            probe_delays.append(time.perf_counter() - tick - 0.01)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.gather(*(hasher.verify("senha-de-teste", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    probe_task.cancel()
+    hasher.shutdown()
+    return elapsed, max(probe_delays, default=0.0), hasher.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a vazão da verificação de senhas por quantidade de threads.")
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=settings.BCRYPT_ROUNDS)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    settings.BCRYPT_ROUNDS = args.rounds
+    hashed = get_password_hash("senha-de-teste")
+
+    serial = run_serial(hashed, args.logins)
+    print(f"custo {args.rounds}, {args.logins} logins")
+    print(f"{'workers':>8} {'seconds':>10} {'logins/s':>10} {'loop lag ms':>12}")
+    print(f"{'serial':>8} {serial:>10.3f} {args.logins / serial:>10.1f} {'-':>12}")
+
+    worker_counts = sorted({1, *[w for w in (2, 4, 8, 16) if w <= args.max_workers], args.max_workers})
+    for workers in worker_counts:
+        elapsed, lag, _ = asyncio.run(run_pool(hashed, args.logins, workers))
+        print(f"{workers:>8} {elapsed:>10.3f} {args.logins / elapsed:>10.1f} {lag * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
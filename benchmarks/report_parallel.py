@@ -0,0 +1,77 @@
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.domain.models.enums import RecordType, AdjustmentType
+from app.services.report_builder import (
+    ReportPeriod, PunchRow, AdjustmentRow, UserReportInput, build_user_reports
+)
+
+
+def make_inputs(users: int, year: int, month: int, seed: int):
+    rng = random.Random(seed)
+    start = date(year, month, 1)
+    inputs = []
+    for user_id in range(1, users + 1):
+        punches = []
+        for offset in range(31):
+            day = start + timedelta(days=offset)
+            if day.month != month or day.weekday() >= 5:
+                continue
+            for hour, record_type in ((8, RecordType.ENTRY), (12, RecordType.EXIT),
+                                      (13, RecordType.ENTRY), (17, RecordType.EXIT)):
+                moment = datetime.combine(day, datetime.min.time()) + timedelta(hours=hour,
+                                                                               minutes=rng.randint(-15, 15))
+                punches.append(PunchRow(len(punches) + 1, moment, record_type, "127.0.0.1", "bench", "desktop",
+                                        False, True, None, None, None, None, None))
+        adjustments = (AdjustmentRow(user_id, start + timedelta(days=rng.randint(0, 27)), AdjustmentType.WAIVER, 4.0),)
+        inputs.append(UserReportInput(user_id, f"Colaborador {user_id}", tuple((d, 8.0) for d in range(5)),
+                                      tuple(punches), adjustments))
+    return inputs
+
+
+def run(inputs, period, workers: int) -> float:
+    started = time.perf_counter()
+    if workers <= 1:
+        build_user_reports(inputs, period)
+        return time.perf_counter() - started
+
+    chunk_size = -(-len(inputs) // (workers * 4))
+    chunks = [inputs[i:i + chunk_size] for i in range(0, len(inputs), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        list(pool.map(build_user_reports, [chunks[0][:1]] * workers, repeat(period, workers)))
+        started = time.perf_counter()
+        for _ in pool.map(build_user_reports, chunks, repeat(period, len(chunks))):
+            pass
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o cálculo de relatórios mensais por quantidade de processos.")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    period = ReportPeriod(date(2026, 3, 1), date(2026, 3, 31), date(2026, 3, 31), frozenset({date(2026, 3, 2)}), True)
+    inputs = make_inputs(args.users, 2026, 3, seed=42)
+
+    worker_counts = sorted({1, *[w for w in (2, 4, 8, 16, 32) if w <= args.max_workers], args.max_workers})
+    baseline = None
+    print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+    for workers in worker_counts:
+        elapsed = min(run(inputs, period, workers) for _ in range(args.repeat))
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>10.3f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()